@@ -0,0 +1,139 @@
+# %%
+"""
+Aquecimento do cache antes de o servidor aceitar conexões.
+
+Carrega todos os datasets registrados em src/data_loader.py (com as mesmas
+projeções de colunas usadas pelas páginas e, nas tabelas de um único
+município, para cada município principal selecionável). As tabelas ficam
+gravadas no cache em disco (Arrow IPC), que o servidor do Streamlit lê por
+memory-map na primeira visita, sem ir ao Supabase. Só o cache em disco
+sobrevive ao fim deste processo: o cache de preparo (src.memory_cache) vive
+na memória de cada processo e é preenchido pelo próprio servidor.
+
+Ao final, imprime um resumo de tempos para acompanhar o custo da carga a frio
+a cada release. Uso (Procfile):
+
+    python aquecer_cache.py; streamlit run app.py ...
+
+Se alguma carga não terminar em AQUECIMENTO_TIMEOUT, o script sai com código 1
+(por os._exit, sem esperar as threads presas na rede). Como o Procfile separa
+os comandos com `;`, o servidor sobe do mesmo jeito; o código de saída serve
+só para sinalizar o aquecimento incompleto no log.
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dotenv import load_dotenv
+
+# --- CARREGAR VARIÁVEIS DE AMBIENTE ANTES DO DATA_LOADER ---
+load_dotenv()
+
+from src.data_loader import (  # noqa: E402
+    DATASETS,
+    DATASETS_POR_PAGINA,
+    ESTATISTICAS_PAGINACAO,
+    MAX_REQUISICOES_SIMULTANEAS,
+    carregar_dataset,
+)
+from src.config import (  # noqa: E402
+    municipio_de_interesse,
+    municipios_principais,
+)
+
+# Tempo máximo de aquecimento: o Heroku derruba o dyno que não abre a porta em
+# 60 segundos, então o servidor precisa subir mesmo que o aquecimento não termine.
+AQUECIMENTO_TIMEOUT = float(os.getenv("AQUECIMENTO_TIMEOUT", "45"))
+
+
+def listar_cargas():
+    """
+    Cargas (dataset, colunas, município principal) distintas consumidas pelas
+    páginas. As tabelas de um único município entram para cada um dos
+    municípios principais selecionáveis, começando pelo padrão.
+    """
+    focos = [municipio_de_interesse] + [
+        m for m in municipios_principais if m != municipio_de_interesse
+    ]
+    cargas = {}
+    for foco in focos:
+        for datasets in DATASETS_POR_PAGINA.values():
+            for nome, colunas in datasets.items():
+                if nome not in DATASETS:
+                    continue
+                if DATASETS[nome].escopo == "municipios" and foco != focos[0]:
+                    continue
+                cargas[(nome, tuple(colunas) if colunas else None, foco)] = None
+    return list(cargas)
+
+
+def carregar_com_tempo(nome, colunas, foco):
+    inicio = time.perf_counter()
+    df = carregar_dataset(nome, colunas, foco)
+    return nome, colunas, foco, len(df), time.perf_counter() - inicio
+
+
+def aquecer_datasets(prazo):
+    """Carrega os datasets em paralelo até o prazo; devolve (tempos, pendentes)."""
+    cargas = listar_cargas()
+    executor = ThreadPoolExecutor(max_workers=MAX_REQUISICOES_SIMULTANEAS)
+    futuros = [executor.submit(carregar_com_tempo, *carga) for carga in cargas]
+    concluidos, pendentes = wait(futuros, timeout=max(prazo - time.time(), 0))
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    tempos = []
+    for futuro in concluidos:
+        try:
+            tempos.append(futuro.result())
+        except Exception as e:
+            print(f"❌ Erro ao aquecer dataset: {e}")
+    return tempos, len(pendentes)
+
+
+def imprimir_resumo(tempos_datasets, pendentes, tempo_datasets):
+    print("\n==================== RESUMO DO AQUECIMENTO ====================")
+    linhas = sum(n for _, _, _, n, _ in tempos_datasets)
+    print(
+        f"Datasets: {len(tempos_datasets)} carregados ({linhas} linhas) "
+        f"em {tempo_datasets:.2f} s"
+    )
+    for nome, colunas, foco, n, segundos in sorted(
+        tempos_datasets, key=lambda t: t[4], reverse=True
+    ):
+        tabela = DATASETS[nome].tabela
+        paginas = ESTATISTICAS_PAGINACAO.get(tabela, {}).get("paginas", "-")
+        projecao = "todas" if colunas is None else ",".join(colunas)
+        if DATASETS[nome].escopo == "municipio":
+            projecao += f"  município: {foco}"
+        print(
+            f"  {segundos:7.2f} s  {nome:<28} {n:>8} linhas  "
+            f"{paginas:>3} pág.  colunas: {projecao}"
+        )
+    if pendentes:
+        print(
+            f"(!) {pendentes} carga(s) não concluída(s) em {AQUECIMENTO_TIMEOUT:.0f} s."
+        )
+
+
+def main():
+    """Aquece o cache de dados e imprime o resumo de tempos."""
+    inicio = time.perf_counter()
+    prazo = time.time() + AQUECIMENTO_TIMEOUT
+
+    tempos_datasets, pendentes = aquecer_datasets(prazo)
+    tempo_datasets = time.perf_counter() - inicio
+
+    imprimir_resumo(tempos_datasets, pendentes, tempo_datasets)
+    print(f"Tempo total de aquecimento: {time.perf_counter() - inicio:.2f} s")
+    return 1 if pendentes else 0
+
+
+if __name__ == "__main__":
+    codigo = main()
+    if codigo:
+        # Com cargas pendentes, sai sem esperar as threads ainda presas na rede,
+        # para não atrasar a subida do servidor.
+        sys.stdout.flush()
+        os._exit(codigo)
+# %%
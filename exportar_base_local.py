@@ -0,0 +1,98 @@
+# %%
+"""
+Exporta as tabelas dados_* do Supabase para uma base local (DuckDB ou Parquet),
+usada pelo dashboard quando BACKEND_DADOS=duckdb ou BACKEND_DADOS=parquet
+(ver src/backends.py).
+
+Uso:
+
+    python exportar_base_local.py parquet   # um <tabela>.parquet em PARQUET_DIRETORIO
+    python exportar_base_local.py duckdb    # tabelas em DUCKDB_CAMINHO
+"""
+
+import os
+import sys
+import time
+from dotenv import load_dotenv
+
+# --- CARREGAR VARIÁVEIS DE AMBIENTE ANTES DO DATA_LOADER ---
+load_dotenv()
+# A exportação sempre lê do Supabase, qualquer que seja o backend configurado
+os.environ["BACKEND_DADOS"] = "supabase"
+
+from src.backends import DUCKDB_CAMINHO, PARQUET_DIRETORIO  # noqa: E402
+from src.data_loader import (  # noqa: E402
+    DATASETS,
+    TABELA_VERSOES,
+    _baixar_tabela_paginada,
+    supabase_client,
+)
+
+
+def listar_tabelas():
+    """Tabelas distintas do registro de datasets, mais o manifesto de versões."""
+    tabelas = dict.fromkeys(spec.tabela for spec in DATASETS.values())
+    tabelas[TABELA_VERSOES] = None
+    return list(tabelas)
+
+
+def exportar_parquet(tabelas, diretorio=PARQUET_DIRETORIO):
+    os.makedirs(diretorio, exist_ok=True)
+    for tabela in tabelas:
+        inicio = time.perf_counter()
+        try:
+            df = _baixar_tabela_paginada(tabela, [], None)
+        except Exception as e:
+            print(f"❌ Erro ao exportar {tabela}: {e}")
+            continue
+        df.to_parquet(os.path.join(diretorio, f"{tabela}.parquet"), index=False)
+        print(f"✅ {tabela}: {len(df)} linhas em {time.perf_counter() - inicio:.2f} s")
+
+
+def exportar_duckdb(tabelas, caminho=DUCKDB_CAMINHO):
+    import duckdb
+
+    os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+    conexao = duckdb.connect(caminho)
+    try:
+        for tabela in tabelas:
+            inicio = time.perf_counter()
+            try:
+                df = _baixar_tabela_paginada(tabela, [], None)
+            except Exception as e:
+                print(f"❌ Erro ao exportar {tabela}: {e}")
+                continue
+            conexao.register("df_exportado", df)
+            conexao.execute(
+                f'CREATE OR REPLACE TABLE "{tabela}" AS SELECT * FROM df_exportado'
+            )
+            conexao.unregister("df_exportado")
+            print(
+                f"✅ {tabela}: {len(df)} linhas em "
+                f"{time.perf_counter() - inicio:.2f} s"
+            )
+    finally:
+        conexao.close()
+
+
+def main():
+    destino = sys.argv[1] if len(sys.argv) > 1 else "parquet"
+    if destino not in ("parquet", "duckdb"):
+        print(f"Destino desconhecido: {destino} (use 'parquet' ou 'duckdb')")
+        return 2
+    if not supabase_client:
+        print("❌ Cliente Supabase não configurado; verifique o arquivo .env.")
+        return 1
+
+    tabelas = listar_tabelas()
+    print(f"Exportando {len(tabelas)} tabelas para {destino}...")
+    if destino == "parquet":
+        exportar_parquet(tabelas)
+    else:
+        exportar_duckdb(tabelas)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+# %%
@@ -0,0 +1,152 @@
+# %%
+"""
+Mede o tempo de importação do dashboard com `python -X importtime`.
+
+O quadro de entrada (app.py: barra lateral e navegação) é importado a cada
+processo novo e não deve trazer as bibliotecas pesadas de gráficos, SQL ou
+estatística, que ficam para as páginas que as usam. Para cada página, mede o
+custo adicional da sua view sobre o quadro de entrada.
+
+Uso:
+
+    python medir_importacao.py               # resumo do quadro e das páginas
+    python medir_importacao.py --detalhes    # mais os pacotes mais pesados
+
+Sai com código 1 se o quadro passar de ORCAMENTO_IMPORTACAO_MS ou importar
+algum dos MODULOS_PESADOS, para pegar regressões antes do deploy.
+"""
+
+import glob
+import os
+import re
+import subprocess
+import sys
+
+ORCAMENTO_IMPORTACAO_MS = float(os.getenv("ORCAMENTO_IMPORTACAO_MS", "1500"))
+REPETICOES = int(os.getenv("REPETICOES_IMPORTACAO", "3"))
+
+# Módulos que o quadro de entrada não pode importar. O núcleo do plotly já
+# vem com o próprio Streamlit; o plotly.express (e o pandas por trás) não.
+MODULOS_PESADOS = (
+    "plotly.express",
+    "duckdb",
+    "statsmodels",
+    "scipy",
+    "matplotlib",
+    "altair",
+    "pydeck",
+    "openpyxl",
+)
+
+_LINHA = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def medir(codigo):
+    """
+    Executa `codigo` num processo novo com -X importtime e devolve a lista de
+    (modulo, self_us, cumulativo_us, nivel), na ordem em que terminaram.
+    """
+    resultado = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    if resultado.returncode != 0:
+        raise RuntimeError(resultado.stderr.strip().splitlines()[-1])
+
+    modulos = []
+    for linha in resultado.stderr.splitlines():
+        casamento = _LINHA.match(linha)
+        if casamento:
+            self_us, cumulativo_us, recuo, modulo = casamento.groups()
+            modulos.append(
+                (modulo, int(self_us), int(cumulativo_us), (len(recuo) - 1) // 2)
+            )
+    return modulos
+
+
+def medir_melhor(codigo):
+    """A medição mais rápida entre REPETICOES (a primeira ainda compila .pyc)."""
+    medicoes = [medir(codigo) for _ in range(max(REPETICOES, 1))]
+    return min(medicoes, key=lambda m: sum(s for _, s, _, _ in m))
+
+
+def modulo_da_view(script):
+    """O módulo src.views.* importado pelo script da página."""
+    with open(script, encoding="utf-8") as arquivo:
+        casamento = re.search(r"^from (src\.views\.\w+) import", arquivo.read(), re.M)
+    return casamento.group(1) if casamento else None
+
+
+def pesados(modulos):
+    """Quais dos MODULOS_PESADOS (ou submódulos deles) aparecem na medição."""
+    return [
+        pesado
+        for pesado in MODULOS_PESADOS
+        if any(m == pesado or m.startswith(pesado + ".") for m, _, _, _ in modulos)
+    ]
+
+
+def mais_pesados(modulos, n=10):
+    """
+    Os `n` módulos importados diretamente pelo alvo medido (app ou a view),
+    com o maior tempo acumulado.
+    """
+    diretos = [(m, c) for m, _, c, nivel in modulos if nivel == 1 and c >= 1000]
+    return sorted(diretos, key=lambda item: item[1], reverse=True)[:n]
+
+
+def main():
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    detalhes = "--detalhes" in sys.argv[1:]
+
+    quadro = medir_melhor("import app")
+    total_quadro = sum(s for _, s, _, _ in quadro) / 1000
+    pesados_quadro = pesados(quadro)
+    print(f"Quadro de entrada (app.py): {total_quadro:,.0f} ms")
+    print(f"  Orçamento: {ORCAMENTO_IMPORTACAO_MS:,.0f} ms")
+    print(f"  Pacotes pesados: {', '.join(pesados_quadro) or 'nenhum'}")
+    if detalhes:
+        for modulo, cumulativo in mais_pesados(quadro):
+            print(f"    {modulo:<40} {cumulativo / 1000:>8,.0f} ms")
+
+    print("\nPáginas (custo adicional sobre o quadro):")
+    for script in sorted(glob.glob("paginas/*.py")):
+        titulo = os.path.splitext(os.path.basename(script))[0]
+        view = modulo_da_view(script)
+        if view is None:
+            continue
+        medicao = medir_melhor(f"import app; import {view}")
+        # As linhas depois da de `app` (nível 0) são as importadas pela view
+        fim_quadro = max(
+            i for i, (m, _, _, nivel) in enumerate(medicao) if m == "app" and not nivel
+        )
+        da_view = medicao[fim_quadro + 1 :]
+        total = sum(s for _, s, _, _ in da_view) / 1000
+        print(
+            f"  {titulo:<20} {total:>8,.0f} ms   "
+            f"{', '.join(pesados(da_view)) or '-'}"
+        )
+        if detalhes:
+            for modulo, cumulativo in mais_pesados(da_view, 5):
+                print(f"    {modulo:<40} {cumulativo / 1000:>8,.0f} ms")
+
+    falhas = []
+    if total_quadro > ORCAMENTO_IMPORTACAO_MS:
+        falhas.append(
+            f"quadro de entrada acima do orçamento ({total_quadro:,.0f} ms > "
+            f"{ORCAMENTO_IMPORTACAO_MS:,.0f} ms)"
+        )
+    if pesados_quadro:
+        falhas.append(f"quadro de entrada importa {', '.join(pesados_quadro)}")
+    for falha in falhas:
+        print(f"❌ {falha}")
+    if not falhas:
+        print("\n✅ Importação dentro do orçamento.")
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+# %%
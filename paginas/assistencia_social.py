@@ -0,0 +1,10 @@
+from src.navegacao import carregar_dados_pagina, municipio_foco
+from src.views.assistencia_social import show_page_assistencia_social
+
+dados, filtrados = carregar_dados_pagina("Assistência Social")
+
+show_page_assistencia_social(
+    df_cad=filtrados["cad"],
+    df_bolsa=filtrados["bolsa_familia"],
+    municipio_interesse=municipio_foco(),
+)
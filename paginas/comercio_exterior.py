@@ -0,0 +1,12 @@
+from src.navegacao import carregar_dados_pagina, municipio_foco, municipios_selecionados
+from src.views.comercio_exterior import show_page_comex
+
+dados, filtrados = carregar_dados_pagina("Comércio Exterior")
+
+show_page_comex(
+    filtrados["comex_ano"],
+    filtrados["comex_mensal"],
+    dados["comex_municipio"],
+    municipios_selecionados(),
+    municipio_foco(),
+)
@@ -0,0 +1,66 @@
+import streamlit as st
+from src.navegacao import carregar_dados_pagina, municipio_foco
+from src.views.dados import show_page_dados
+
+dados, filtrados = carregar_dados_pagina("Dados")
+
+with st.spinner("Carregando os dados para download..."):
+    show_page_dados(
+        # --- Emprego ---
+        df_caged=filtrados["caged"],
+        df_caged_cnae=dados["caged_cnae"],
+        df_caged_faixa_etaria=dados["caged_faixa_etaria"],
+        df_caged_raca_cor=dados["caged_raca_cor"],
+        df_caged_grau_instrucao=dados["caged_grau_instrucao"],
+        df_caged_sexo=dados["caged_sexo"],
+        df_vinculos=filtrados["vinculos"],
+        df_vinculos_cnae=dados["vinculos_cnae"],
+        df_vinculos_faixa_etaria=dados["vinculos_faixa_etaria"],
+        df_vinculos_grau_instrucao=dados["vinculos_grau_instrucao"],
+        df_vinculos_raca_cor=dados["vinculos_raca_cor"],
+        df_vinculos_sexo=dados["vinculos_sexo"],
+        df_renda_mun=filtrados["renda"],
+        df_renda_sexo=dados["renda_sexo"],
+        df_renda_cnae=dados["renda_cnae"],
+        municipio_de_interesse=municipio_foco(),
+        # --- Empresas ---
+        df_cnpj_mun=filtrados["cnpj_total"],
+        df_cnpj_cnae=dados["cnpj_cnae"],
+        df_cnpj_cnae_saldo=dados["cnpj_cnae_saldo"],
+        df_mei_mun=filtrados["mei_total"],
+        df_mei_cnae=dados["mei_cnae"],
+        df_mei_cnae_saldo=dados["mei_cnae_saldo"],
+        df_estabelecimentos_mun=filtrados["estabelecimentos"],
+        df_estabelecimentos_cnae=dados["estabelecimentos_cnae"],
+        df_estabelecimentos_tamanho=dados["estabelecimentos_tamanho"],
+        # --- Comércio Exterior ---
+        df_comex_anual_mun=filtrados["comex_ano"],
+        df_comex_mensal_mun=filtrados["comex_mensal"],
+        df_comex_raw_municipio_foco=dados["comex_municipio"],
+        # --- Segurança ---
+        df_seguranca_mun=filtrados["seguranca"],
+        df_seguranca_taxa_mun=filtrados["seguranca_taxa"],
+        # --- Assistência Social ---
+        df_cad=filtrados["cad"],
+        df_bolsa=filtrados["bolsa_familia"],
+        # --- Educação ---
+        df_educacao_matriculas=filtrados["educacao_matriculas"],
+        df_educacao_rendimento=filtrados["educacao_rendimento"],
+        df_educacao_ideb_municipio=filtrados["educacao_ideb_municipio"],
+        df_educacao_ideb_escolas=filtrados["educacao_ideb_escolas"],
+        # --- Saúde ---
+        df_saude_mensal=filtrados["saude_mensal"],
+        df_saude_vacinas=filtrados["saude_vacinas"],
+        df_saude_despesas=filtrados["saude_despesas"],
+        df_saude_leitos=filtrados["saude_leitos"],
+        df_saude_medicos=filtrados["saude_medicos"],
+        # --- PIB ---
+        df_pib_municipios=filtrados["pib_municipios"],
+        # --- Demografia ---
+        df_populacao_densidade=filtrados["populacao_densidade"],
+        df_populacao_sexo_idade=filtrados["populacao_sexo_idade"],
+        # --- Finanças ---
+        df_financas=filtrados["financas"],
+        df_indicadores_financeiros=filtrados["indicadores_financeiros"],
+        pdf_indicadores=dados["pdf_indicadores"],
+    )
@@ -0,0 +1,10 @@
+from src.navegacao import carregar_dados_pagina, municipio_foco
+from src.views.demografia import show_page_demografia
+
+dados, filtrados = carregar_dados_pagina("Demografia")
+
+show_page_demografia(
+    df_populacao_densidade=filtrados["populacao_densidade"],
+    df_populacao_sexo_idade=filtrados["populacao_sexo_idade"],
+    municipio_interesse=municipio_foco(),
+)
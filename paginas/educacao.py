@@ -0,0 +1,12 @@
+from src.navegacao import carregar_dados_pagina, municipios_selecionados
+from src.views.educacao import show_page_educacao
+
+dados, filtrados = carregar_dados_pagina("Educação")
+
+show_page_educacao(
+    df_matriculas=filtrados["educacao_matriculas"],
+    df_rendimento=filtrados["educacao_rendimento"],
+    df_ideb_municipio=filtrados["educacao_ideb_municipio"],
+    df_ideb_escolas=filtrados["educacao_ideb_escolas"],
+    municipios_selecionados_global=municipios_selecionados(),
+)
@@ -0,0 +1,23 @@
+from src.navegacao import carregar_dados_pagina, municipio_foco
+from src.views.emprego import show_page_emprego
+
+dados, filtrados = carregar_dados_pagina("Emprego")
+
+show_page_emprego(
+    df_caged=filtrados["caged"],
+    df_caged_cnae=dados["caged_cnae"],
+    df_caged_faixa_etaria=dados["caged_faixa_etaria"],
+    df_caged_grau_instrucao=dados["caged_grau_instrucao"],
+    df_caged_raca_cor=dados["caged_raca_cor"],
+    df_caged_sexo=dados["caged_sexo"],
+    municipio_de_interesse=municipio_foco(),
+    df_vinculos=filtrados["vinculos"],
+    df_vinculos_cnae=dados["vinculos_cnae"],
+    df_vinculos_faixa_etaria=dados["vinculos_faixa_etaria"],
+    df_vinculos_grau_instrucao=dados["vinculos_grau_instrucao"],
+    df_vinculos_raca_cor=dados["vinculos_raca_cor"],
+    df_vinculos_sexo=dados["vinculos_sexo"],
+    df_renda_mun=filtrados["renda"],
+    df_renda_cnae=dados["renda_cnae"],
+    df_renda_sexo=dados["renda_sexo"],
+)
@@ -0,0 +1,17 @@
+from src.navegacao import carregar_dados_pagina, municipio_foco
+from src.views.empresas import show_page_empresas_ativas
+
+dados, filtrados = carregar_dados_pagina("Empresas")
+
+show_page_empresas_ativas(
+    df_cnpj=filtrados["cnpj_total"],
+    df_cnpj_cnae=dados["cnpj_cnae"],
+    df_cnpj_cnae_saldo=dados["cnpj_cnae_saldo"],
+    df_mei=filtrados["mei_total"],
+    df_mei_cnae=dados["mei_cnae"],
+    df_mei_cnae_saldo=dados["mei_cnae_saldo"],
+    municipio_de_interesse=municipio_foco(),
+    df_estabelecimentos_cnae=dados["estabelecimentos_cnae"],
+    df_estabelecimentos_mun=filtrados["estabelecimentos"],
+    df_estabelecimentos_tamanho=dados["estabelecimentos_tamanho"],
+)
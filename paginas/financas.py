@@ -0,0 +1,10 @@
+from src.navegacao import carregar_dados_pagina
+from src.views.financas import show_page_financas
+
+dados, filtrados = carregar_dados_pagina("Finanças")
+
+show_page_financas(
+    df_financas=filtrados["financas"],
+    df_indicadores_financeiros=filtrados["indicadores_financeiros"],
+    pdf_indicadores=dados["pdf_indicadores"],
+)
@@ -0,0 +1,23 @@
+from src.navegacao import carregar_dados_pagina, municipio_foco
+from src.views.home import show_page_home
+
+dados, filtrados = carregar_dados_pagina("Início")
+
+show_page_home(
+    df_emprego=filtrados["caged"],
+    df_comex=filtrados["comex_mensal"],
+    df_seguranca=filtrados["seguranca"],
+    df_assistencia_cad=filtrados["cad"],
+    df_assistencia_bolsa=filtrados["bolsa_familia"],
+    df_financas=filtrados["financas"],
+    df_indicadores_financeiros=filtrados["indicadores_financeiros"],
+    df_empresas=filtrados["cnpj_total"],
+    df_educacao_ideb=filtrados["educacao_ideb_municipio"],
+    df_educacao_matriculas=filtrados["educacao_matriculas"],
+    df_vinculos=filtrados["vinculos"],
+    df_pib=filtrados["pib_municipios"],
+    df_saude_mensal=filtrados["saude_mensal"],
+    df_populacao_densidade=filtrados["populacao_densidade"],
+    df_populacao_sexo_idade=filtrados["populacao_sexo_idade"],
+    municipio_interesse=municipio_foco(),
+)
@@ -0,0 +1,6 @@
+from src.navegacao import carregar_dados_pagina
+from src.views.pib import show_page_pib
+
+dados, filtrados = carregar_dados_pagina("PIB")
+
+show_page_pib(df_pib=filtrados["pib_municipios"])
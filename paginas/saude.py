@@ -0,0 +1,12 @@
+from src.navegacao import carregar_dados_pagina
+from src.views.saude import show_page_saude
+
+dados, filtrados = carregar_dados_pagina("Saúde")
+
+show_page_saude(
+    df_saude_mensal=filtrados["saude_mensal"],
+    df_saude_vacinas=filtrados["saude_vacinas"],
+    df_saude_leitos=filtrados["saude_leitos"],
+    df_saude_medicos=filtrados["saude_medicos"],
+    df_saude_despesas=filtrados["saude_despesas"],
+)
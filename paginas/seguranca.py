@@ -0,0 +1,6 @@
+from src.navegacao import carregar_dados_pagina
+from src.views.seguranca import show_page_seguranca
+
+dados, filtrados = carregar_dados_pagina("Segurança")
+
+show_page_seguranca(filtrados["seguranca"], filtrados["seguranca_taxa"])
@@ -0,0 +1,111 @@
+import os
+import threading
+import pandas as pd
+
+# --- BACKENDS LOCAIS DE DADOS ---
+
+# Por padrão os dados vêm do Supabase (BACKEND_DADOS=supabase). Os backends
+# locais leem as mesmas tabelas dados_* de um arquivo DuckDB ou de um diretório
+# Parquet (um arquivo <tabela>.parquet, ou um diretório de dataset, por tabela),
+# para desenvolvimento offline, benchmarks reproduzíveis e instalações sem rede.
+# A base local pode ser gerada com exportar_base_local.py.
+BACKEND_DADOS = os.getenv("BACKEND_DADOS", "supabase").lower()
+DUCKDB_CAMINHO = os.getenv("DUCKDB_CAMINHO", os.path.join("dados", "dashboard.duckdb"))
+PARQUET_DIRETORIO = os.getenv("PARQUET_DIRETORIO", os.path.join("dados", "parquet"))
+
+BACKENDS_LOCAIS = ("duckdb", "parquet")
+
+
+def _identificador(nome):
+    """Cita um nome de tabela ou coluna para SQL (há colunas como nascimentos/1000_hab)."""
+    return '"' + nome.replace('"', '""') + '"'
+
+
+def montar_sql(tabela, filtros, colunas=None):
+    """
+    Traduz a consulta do loader (tabela, filtros no formato (método, coluna,
+    valor) e colunas) para SQL parametrizado.
+    """
+    selecao = ", ".join(map(_identificador, colunas)) if colunas else "*"
+    condicoes, parametros = [], []
+    for metodo, coluna, valor in filtros:
+        if metodo == "in_":
+            valores = list(valor)
+            if not valores:
+                condicoes.append("FALSE")
+                continue
+            marcadores = ", ".join("?" for _ in valores)
+            condicoes.append(f"{_identificador(coluna)} IN ({marcadores})")
+            parametros.extend(valores)
+        elif metodo == "eq":
+            condicoes.append(f"{_identificador(coluna)} = ?")
+            parametros.append(valor)
+        else:
+            raise ValueError(f"Filtro não suportado pelo backend local: {metodo}")
+
+    sql = f"SELECT {selecao} FROM {_identificador(tabela)}"
+    if condicoes:
+        sql += " WHERE " + " AND ".join(condicoes)
+    return sql, parametros
+
+
+class BackendDuckDB:
+    """Lê as tabelas de um arquivo DuckDB, aberto somente para leitura."""
+
+    nome = "duckdb"
+
+    def __init__(self, caminho=DUCKDB_CAMINHO):
+        import duckdb
+
+        self.caminho = caminho
+        self.conexao = duckdb.connect(caminho, read_only=True)
+        self._trava = threading.Lock()
+
+    def ler_tabela(self, tabela, filtros, colunas=None):
+        sql, parametros = montar_sql(tabela, filtros, colunas)
+        # Cada thread usa o seu cursor (conexão duplicada) sobre o mesmo banco
+        with self._trava:
+            cursor = self.conexao.cursor()
+        try:
+            return cursor.execute(sql, parametros).df()
+        finally:
+            cursor.close()
+
+
+class BackendParquet:
+    """Lê as tabelas de um diretório com um Parquet (ou dataset) por tabela."""
+
+    nome = "parquet"
+
+    def __init__(self, diretorio=PARQUET_DIRETORIO):
+        if not os.path.isdir(diretorio):
+            raise FileNotFoundError(f"Diretório Parquet não encontrado: {diretorio}")
+        self.diretorio = diretorio
+
+    def _caminho(self, tabela):
+        arquivo = os.path.join(self.diretorio, f"{tabela}.parquet")
+        return (
+            arquivo if os.path.exists(arquivo) else os.path.join(self.diretorio, tabela)
+        )
+
+    def ler_tabela(self, tabela, filtros, colunas=None):
+        filtros_parquet = [
+            (coluna, "in", list(valor)) if metodo == "in_" else (coluna, "==", valor)
+            for metodo, coluna, valor in filtros
+        ]
+        return pd.read_parquet(
+            self._caminho(tabela),
+            columns=list(colunas) if colunas else None,
+            filters=filtros_parquet or None,
+        )
+
+
+def criar_backend_local(backend=BACKEND_DADOS):
+    """Instancia o backend local configurado; None quando os dados vêm do Supabase."""
+    if backend == "duckdb":
+        return BackendDuckDB()
+    if backend == "parquet":
+        return BackendParquet()
+    if backend != "supabase":
+        raise ValueError(f"BACKEND_DADOS desconhecido: {backend}")
+    return None
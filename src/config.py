@@ -5,6 +5,15 @@ municipios_de_interesse = [
     "São Leopoldo",
     "Gravataí",
 ]
+# Municípios que podem ser escolhidos como principal na barra lateral: os
+# MUNICIPIOS_PRINCIPAIS do update_data.py, para os quais as tabelas de um único
+# município (CNAE, sexo, raça/cor etc.) são publicadas.
+municipios_principais = ("São Leopoldo", "Esteio", "Nova Santa Rita", "Montenegro")
+# Municípios lidos nas tabelas multi-município: os de comparação e todos os
+# principais, de modo que trocar o principal não recarregue essas tabelas
+municipios_carregados = list(
+    dict.fromkeys(municipios_de_interesse + list(municipios_principais))
+)
 anos_de_interesse = tuple(range(2021, 2026))
 
 anos_comex = tuple(range(min(anos_de_interesse) - 1, max(anos_de_interesse) + 1))
@@ -14,6 +23,9 @@ CORES_MUNICIPIOS = {
     "Canoas": "#FF6B6B",  # Coral Suave
     "Novo Hamburgo": "#1DD1A1",  # Verde Menta/Turquesa
     "Gravataí": "#A354FF",  # Roxo Vibrante
+    "Esteio": "#FF9F43",  # Laranja
+    "Nova Santa Rita": "#EE5A9B",  # Rosa
+    "Montenegro": "#FECA57",  # Amarelo
 }
 
 ordem_instrucao = [
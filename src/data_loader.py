@@ -1,9 +1,40 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import requests
+import csv
+import functools
 import io
+import json
 import os
+import threading
+import time
+import uuid
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 from supabase import create_client, Client
+from supabase.lib.client_options import ClientOptions
+from src import disk_cache, instrumentation, profiling
+from src.backends import BACKEND_DADOS, BACKENDS_LOCAIS, criar_backend_local
+from src.hedge import executar_com_hedge
+from src.transport import (
+    TIMEOUT_REQUESTS,
+    configurar_cliente_supabase,
+    sessao_requests,
+    timeout_httpx,
+)
+from src.config import (
+    municipio_de_interesse,
+    municipios_carregados,
+    municipios_principais,
+    anos_de_interesse,
+    anos_comex,
+)
 
 # CONFIGURAÇÃO DA CONEXÃO SUPABASE ---
 SUPABASE_URL = os.getenv("SUPABASE_URL")
@@ -13,16 +44,34 @@ SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 ID_PDF_INDICADORES_FINANCEIROS = "1oyJg_JH5hlVYmXFDwSuKH7p5lqiePefl"
 
 supabase_client: Client = None
+backend_local = None
 
+# Backend local (DuckDB/Parquet, ver src.backends): dispensa o Supabase
+if BACKEND_DADOS in BACKENDS_LOCAIS:
+    try:
+        backend_local = criar_backend_local()
+        print(f"Usando o backend local de dados: {BACKEND_DADOS}.")
+    except Exception as e:
+        print(f"Erro ao abrir o backend local '{BACKEND_DADOS}': {e}")
+        st.error(f"Falha ao abrir a base local de dados ({BACKEND_DADOS}): {e}")
 # Validação das variáveis de ambiente
-if not SUPABASE_URL or not SUPABASE_KEY:
+elif not SUPABASE_URL or not SUPABASE_KEY:
     print("Erro fatal: SUPABASE_URL or SUPABASE_KEY não estão definidas no ambiente.")
     st.error(
         "Erro de Configuração: As variáveis de ambiente SUPABASE_URL ou SUPABASE_KEY não foram encontradas."
     )
 else:
     try:
-        supabase_client = create_client(SUPABASE_URL, SUPABASE_KEY)
+        supabase_client = create_client(
+            SUPABASE_URL,
+            SUPABASE_KEY,
+            options=ClientOptions(postgrest_client_timeout=timeout_httpx()),
+        )
+        # Pool de conexões, keep-alive, HTTP/2 e compressão (src.transport)
+        try:
+            configurar_cliente_supabase(supabase_client)
+        except Exception as e:
+            print(f"Mantendo o transporte HTTP padrão do Supabase: {e}")
         print("Conexão com Supabase estabelecida para o data_loader.")
     except Exception as e:
         print(f"Erro ao conectar ao Supabase no data_loader: {e}")
@@ -35,696 +84,1384 @@ else:
 
 CACHE_TTL = 172800  # 48 horas
 
-
-def construir_url_gdrive_download(file_id):
-    """Constrói o URL de download direto para um arquivo do Google Drive."""
-    return f"https://drive.google.com/uc?export=download&id={file_id}"
-
-
-@st.cache_data(ttl=CACHE_TTL)
-def carregar_pdf_indicadores_financeiros():
-    """Baixa o PDF de indicadores financeiros do Google Drive."""
-    try:
-        url = construir_url_gdrive_download(ID_PDF_INDICADORES_FINANCEIROS)
-        response = requests.get(url)
-        response.raise_for_status()
-        return io.BytesIO(response.content)
-    except requests.exceptions.RequestException as e:
-        st.error(f"Erro ao baixar o PDF de referência: {e}")
-        st.error("Verifique o ID do PDF e se as permissões de partilha estão corretas.")
-        return None
-
-
-# --- FUNÇÕES DE CARREGAMENTO DE DADOS (SUPABASE) ---
-
-
-@st.cache_data(ttl=CACHE_TTL)
-def carregar_dados_indicadores_financeiros(municipios, anos):
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return pd.DataFrame()
-    response = (
-        supabase_client.table("dados_indicadores_financeiros")
-        .select("*")
-        .in_("municipio", list(municipios))
-        .in_("ano", list(anos))
-        .execute()
-    )
-    return pd.DataFrame(response.data)
-
-
-@st.cache_data(ttl=CACHE_TTL)
-def carregar_dados_financas(municipios, anos):
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return pd.DataFrame()
-    response = (
-        supabase_client.table("dados_financas")
-        .select("*")
-        .in_("municipio", list(municipios))
-        .in_("ano", list(anos))
-        .execute()
-    )
-    return pd.DataFrame(response.data)
+# Número máximo de requisições simultâneas ao Supabase ao carregar vários datasets
+MAX_REQUISICOES_SIMULTANEAS = int(os.getenv("MAX_REQUISICOES_SIMULTANEAS", "8"))
 
 
-@st.cache_data(ttl=CACHE_TTL)
-def carregar_dados_populacao_densidade(municipios, anos):
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return pd.DataFrame()
-    response = (
-        supabase_client.table("dados_populacao_densidade")
-        .select("*")
-        .in_("municipio", list(municipios))
-        .in_("ano", list(anos))
-        .execute()
-    )
-    return pd.DataFrame(response.data)
+# Marcado nas threads da revalidação e da pré-carga, que não têm sessão: lá um
+# st.error não teria onde aparecer, então as falhas vão para o log
+_SEGUNDO_PLANO = threading.local()
 
 
-@st.cache_data(ttl=CACHE_TTL)
-def carregar_dados_populacao_sexo_idade(municipios, anos):
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return pd.DataFrame()
-    response = (
-        supabase_client.table("dados_populacao_sexo_idade")
-        .select("*")
-        .in_("municipio", list(municipios))
-        .in_("ano", list(anos))
-        .execute()
-    )
-    return pd.DataFrame(response.data)
+def _em_segundo_plano():
+    """Indica se a carga roda na revalidação ou na pré-carga em segundo plano."""
+    return getattr(_SEGUNDO_PLANO, "ativo", False)
 
 
-@st.cache_data(ttl=CACHE_TTL)
-def carregar_dados_emprego_municipios(municipios, anos):
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return pd.DataFrame()
-    response = (
-        supabase_client.table("dados_emprego_municipios")
-        .select("*")
-        .in_("municipio", list(municipios))
-        .in_("ano", list(anos))
-        .execute()
-    )
-    return pd.DataFrame(response.data)
-
-
-@st.cache_data(ttl=CACHE_TTL)
-def carregar_dados_vinculos_municipios(municipios, anos):
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return pd.DataFrame()
-    response = (
-        supabase_client.table("dados_vinculos_municipios")
-        .select("*")
-        .in_("municipio", list(municipios))
-        .in_("ano", list(anos))
-        .execute()
-    )
-    return pd.DataFrame(response.data)
-
-
-@st.cache_data(ttl=CACHE_TTL)
-def carregar_dados_emprego_cnae(municipio, anos):
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return pd.DataFrame()
-    response = (
-        supabase_client.table("dados_emprego_cnae")
-        .select("*")
-        .eq("municipio", municipio)
-        .in_("ano", list(anos))
-        .execute()
-    )
-    return pd.DataFrame(response.data)
-
-
-@st.cache_data(ttl=CACHE_TTL)
-def carregar_dados_vinculos_cnae(municipio, anos):
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return pd.DataFrame()
-    response = (
-        supabase_client.table("dados_vinculos_cnae")
-        .select("*")
-        .eq("municipio", municipio)
-        .in_("ano", list(anos))
-        .execute()
-    )
-    return pd.DataFrame(response.data)
-
-
-@st.cache_data(ttl=CACHE_TTL)
-def carregar_dados_emprego_grau_instrucao(municipio, anos):
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return pd.DataFrame()
-    response = (
-        supabase_client.table("dados_emprego_grau_instrucao")
-        .select("*")
-        .eq("municipio", municipio)
-        .in_("ano", list(anos))
-        .execute()
-    )
-    return pd.DataFrame(response.data)
-
-
-@st.cache_data(ttl=CACHE_TTL)
-def carregar_dados_vinculos_grau_instrucao(municipio, anos):
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return pd.DataFrame()
-    response = (
-        supabase_client.table("dados_vinculos_grau_instrucao")
-        .select("*")
-        .eq("municipio", municipio)
-        .in_("ano", list(anos))
-        .execute()
-    )
-    return pd.DataFrame(response.data)
-
-
-@st.cache_data(ttl=CACHE_TTL)
-def carregar_dados_emprego_faixa_etaria(municipio, anos):
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return pd.DataFrame()
-    response = (
-        supabase_client.table("dados_emprego_faixa_etaria")
-        .select("*")
-        .eq("municipio", municipio)
-        .in_("ano", list(anos))
-        .execute()
-    )
-    return pd.DataFrame(response.data)
-
-
-@st.cache_data(ttl=CACHE_TTL)
-def carregar_dados_vinculos_faixa_etaria(municipio, anos):
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return pd.DataFrame()
-    response = (
-        supabase_client.table("dados_vinculos_faixa_etaria")
-        .select("*")
-        .eq("municipio", municipio)
-        .in_("ano", list(anos))
-        .execute()
-    )
-    return pd.DataFrame(response.data)
-
-
-@st.cache_data(ttl=CACHE_TTL)
-def carregar_dados_emprego_raca_cor(municipio, anos):
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return pd.DataFrame()
-    response = (
-        supabase_client.table("dados_emprego_raca_cor")
-        .select("*")
-        .eq("municipio", municipio)
-        .in_("ano", list(anos))
-        .execute()
-    )
-    return pd.DataFrame(response.data)
-
-
-@st.cache_data(ttl=CACHE_TTL)
-def carregar_dados_vinculos_raca_cor(municipio, anos):
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return pd.DataFrame()
-    response = (
-        supabase_client.table("dados_vinculos_raca_cor")
-        .select("*")
-        .eq("municipio", municipio)
-        .in_("ano", list(anos))
-        .execute()
-    )
-    return pd.DataFrame(response.data)
-
-
-@st.cache_data(ttl=CACHE_TTL)
-def carregar_dados_emprego_sexo(municipio, anos):
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return pd.DataFrame()
-    response = (
-        supabase_client.table("dados_emprego_sexo")
-        .select("*")
-        .eq("municipio", municipio)
-        .in_("ano", list(anos))
-        .execute()
-    )
-    return pd.DataFrame(response.data)
-
-
-@st.cache_data(ttl=CACHE_TTL)
-def carregar_dados_vinculos_sexo(municipio, anos):
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return pd.DataFrame()
-    response = (
-        supabase_client.table("dados_vinculos_sexo")
-        .select("*")
-        .eq("municipio", municipio)
-        .in_("ano", list(anos))
-        .execute()
-    )
-    return pd.DataFrame(response.data)
-
-
-@st.cache_data(ttl=CACHE_TTL)
-def carregar_dados_estabelecimentos_cnae(municipio, anos):
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return pd.DataFrame()
-    response = (
-        supabase_client.table("dados_estabelecimentos_cnae")
-        .select("*")
-        .eq("municipio", municipio)
-        .in_("ano", list(anos))
-        .execute()
-    )
-    return pd.DataFrame(response.data)
-
-
-@st.cache_data(ttl=CACHE_TTL)
-def carregar_dados_estabelecimentos_tamanho(municipio, anos):
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return pd.DataFrame()
-    response = (
-        supabase_client.table("dados_estabelecimentos_tamanho")
-        .select("*")
-        .eq("municipio", municipio)
-        .in_("ano", list(anos))
-        .execute()
-    )
-    return pd.DataFrame(response.data)
-
-
-@st.cache_data(ttl=CACHE_TTL)
-def carregar_dados_estabelecimentos_municipios(municipios, anos):
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return pd.DataFrame()
-    response = (
-        supabase_client.table("dados_estabelecimentos_municipios")
-        .select("*")
-        .in_("municipio", list(municipios))
-        .in_("ano", list(anos))
-        .execute()
-    )
-    return pd.DataFrame(response.data)
-
-
-@st.cache_data(ttl=CACHE_TTL)
-def carregar_dados_renda_cnae(municipio, anos):
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return pd.DataFrame()
-    response = (
-        supabase_client.table("dados_renda_cnae")
-        .select("*")
-        .eq("municipio", municipio)
-        .in_("ano", list(anos))
-        .execute()
-    )
-    return pd.DataFrame(response.data)
-
-
-@st.cache_data(ttl=CACHE_TTL)
-def carregar_dados_renda_sexo(municipio, anos):
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return pd.DataFrame()
-    response = (
-        supabase_client.table("dados_renda_sexo")
-        .select("*")
-        .eq("municipio", municipio)
-        .in_("ano", list(anos))
-        .execute()
-    )
-    return pd.DataFrame(response.data)
-
-
-@st.cache_data(ttl=CACHE_TTL)
-def carregar_dados_renda_municipios(municipios, anos):
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return pd.DataFrame()
-    response = (
-        supabase_client.table("dados_renda_municipios")
-        .select("*")
-        .in_("municipio", list(municipios))
-        .in_("ano", list(anos))
-        .execute()
-    )
-    return pd.DataFrame(response.data)
-
-
-@st.cache_data(ttl=CACHE_TTL)
-def carregar_dados_comex_anual(municipios, anos):
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return pd.DataFrame()
-    response = (
-        supabase_client.table("dados_comex_anual")
-        .select("*")
-        .in_("municipio", list(municipios))
-        .in_("ano", list(anos))
-        .execute()
-    )
-    return pd.DataFrame(response.data)
-
-
-@st.cache_data(ttl=CACHE_TTL)
-def carregar_dados_comex_mensal(municipios, anos):
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return pd.DataFrame()
-    response = (
-        supabase_client.table("dados_comex_mensal")
-        .select("*")
-        .in_("municipio", list(municipios))
-        .in_("ano", list(anos))
-        .execute()
-    )
-    return pd.DataFrame(response.data)
-
-
-@st.cache_data(ttl=CACHE_TTL)
-def carregar_dados_comex_municipio(municipio, anos):
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return pd.DataFrame()
-    response = (
-        supabase_client.table("dados_comex_municipio")
-        .select("*")
-        .eq("municipio", municipio)
-        .in_("ano", list(anos))
-        .execute()
-    )
-    return pd.DataFrame(response.data)
-
-
-@st.cache_data(ttl=CACHE_TTL)
-def carregar_dados_seguranca(municipios, anos):
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return pd.DataFrame()
-    response = (
-        supabase_client.table("dados_seguranca")
-        .select("*")
-        .in_("municipio", list(municipios))
-        .in_("ano", list(anos))
-        .execute()
-    )
-    return pd.DataFrame(response.data)
-
-
-@st.cache_data(ttl=CACHE_TTL)
-def carregar_dados_seguranca_taxa(municipios, anos):
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return pd.DataFrame()
-    response = (
-        supabase_client.table("dados_seguranca_taxa")
-        .select("*")
-        .in_("municipio", list(municipios))
-        .in_("ano", list(anos))
-        .execute()
-    )
-    return pd.DataFrame(response.data)
-
-
-@st.cache_data(ttl=CACHE_TTL)
-def carregar_dados_CAD(municipios, anos):
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return pd.DataFrame()
-    response = (
-        supabase_client.table("dados_cadastro_unico")
-        .select("*")
-        .in_("municipio", list(municipios))
-        .in_("ano", list(anos))
-        .execute()
-    )
-    return pd.DataFrame(response.data)
-
-
-@st.cache_data(ttl=CACHE_TTL)
-def carregar_dados_bolsa_familia(municipios, anos):
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return pd.DataFrame()
-    response = (
-        supabase_client.table("dados_bolsa_familia")
-        .select("*")
-        .in_("municipio", list(municipios))
-        .in_("ano", list(anos))
-        .execute()
-    )
-    return pd.DataFrame(response.data)
-
-
-@st.cache_data(ttl=CACHE_TTL)
-def carregar_dados_cnpj_total(municipios, anos):
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return pd.DataFrame()
-    response = (
-        supabase_client.table("dados_cnpj_total")
-        .select("*")
-        .in_("municipio", list(municipios))
-        .in_("ano", list(anos))
-        .execute()
-    )
-    return pd.DataFrame(response.data)
-
-
-@st.cache_data(ttl=CACHE_TTL)
-def carregar_dados_cnpj_cnae(municipio, anos):
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return pd.DataFrame()
-    response = (
-        supabase_client.table("dados_cnpj_cnae")
-        .select("*")
-        .eq("municipio", municipio)
-        .in_("ano", list(anos))
-        .execute()
-    )
-    return pd.DataFrame(response.data)
-
-
-@st.cache_data(ttl=CACHE_TTL)
-def carregar_dados_cnpj_cnae_saldo(municipio, anos):
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return pd.DataFrame()
-    response = (
-        supabase_client.table("dados_cnpj_cnae_saldo")
-        .select("*")
-        .eq("municipio", municipio)
-        .in_("ano", list(anos))
-        .execute()
-    )
-    return pd.DataFrame(response.data)
-
-
-@st.cache_data(ttl=CACHE_TTL)
-def carregar_dados_mei_total(municipios, anos):
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return pd.DataFrame()
-    response = (
-        supabase_client.table("dados_mei_total")
-        .select("*")
-        .in_("municipio", list(municipios))
-        .in_("ano", list(anos))
-        .execute()
-    )
-    return pd.DataFrame(response.data)
+def construir_url_gdrive_download(file_id):
+    """Constrói o URL de download direto para um arquivo do Google Drive."""
+    return f"https://drive.google.com/uc?export=download&id={file_id}"
 
 
-@st.cache_data(ttl=CACHE_TTL)
-def carregar_dados_mei_cnae(municipio, anos):
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return pd.DataFrame()
-    response = (
-        supabase_client.table("dados_mei_cnae")
-        .select("*")
-        .eq("municipio", municipio)
-        .in_("ano", list(anos))
-        .execute()
-    )
-    return pd.DataFrame(response.data)
+# O PDF fica em disco e só é baixado quando uma página que o oferece é exibida.
+# A cópia local é revalidada no Google Drive (If-None-Match/If-Modified-Since) no
+# máximo uma vez a cada PDF_REVALIDACAO segundos.
+DIRETORIO_ARQUIVOS = os.getenv("CACHE_ARQUIVOS_DIR", os.path.join(".cache", "arquivos"))
+PDF_REVALIDACAO = int(os.getenv("PDF_REVALIDACAO", str(CACHE_TTL)))
+_TRAVA_PDF = threading.Lock()
 
 
-@st.cache_data(ttl=CACHE_TTL)
-def carregar_dados_mei_cnae_saldo(municipio, anos):
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return pd.DataFrame()
-    response = (
-        supabase_client.table("dados_mei_cnae_saldo")
-        .select("*")
-        .eq("municipio", municipio)
-        .in_("ano", list(anos))
-        .execute()
-    )
-    return pd.DataFrame(response.data)
+def _ler_metadados(caminho):
+    try:
+        with open(caminho, encoding="utf-8") as arquivo:
+            return json.load(arquivo)
+    except (OSError, ValueError):
+        return {}
+
+
+def _baixar_arquivo(url, caminho, cabecalhos):
+    """
+    Baixa `url` para `caminho` (escrita atômica). Devolve os cabeçalhos de
+    validação da resposta, ou None se o servidor respondeu 304 (não modificado).
+    """
+    with sessao_requests().get(
+        url, headers=cabecalhos, timeout=TIMEOUT_REQUESTS, stream=True
+    ) as response:
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        temporario = f"{caminho}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(temporario, "wb") as arquivo:
+                for bloco in response.iter_content(chunk_size=64 * 1024):
+                    arquivo.write(bloco)
+            os.replace(temporario, caminho)
+        finally:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+        return {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
 
 
-@st.cache_data(ttl=CACHE_TTL)
-def carregar_dados_educacao_matriculas(municipios, anos):
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return pd.DataFrame()
-    response = (
-        supabase_client.table("dados_educacao_matriculas")
-        .select("*")
-        .in_("municipio", list(municipios))
-        .in_("ano", list(anos))
-        .execute()
-    )
-    return pd.DataFrame(response.data)
+def carregar_pdf_indicadores_financeiros():
+    """
+    Devolve o caminho local do PDF de indicadores financeiros, baixando-o do
+    Google Drive na primeira vez e revalidando-o quando a verificação expira.
+    Se a revalidação falhar, a cópia em disco continua sendo usada.
+    """
+    caminho = os.path.join(DIRETORIO_ARQUIVOS, "indicadores_financeiros.pdf")
+    caminho_metadados = caminho + ".json"
+    with _TRAVA_PDF:
+        metadados = _ler_metadados(caminho_metadados)
+        existe = os.path.exists(caminho)
+        if existe and time.time() - metadados.get("verificado_em", 0) < PDF_REVALIDACAO:
+            return caminho
+
+        cabecalhos = {}
+        if existe and metadados.get("etag"):
+            cabecalhos["If-None-Match"] = metadados["etag"]
+        if existe and metadados.get("last_modified"):
+            cabecalhos["If-Modified-Since"] = metadados["last_modified"]
+
+        try:
+            url = construir_url_gdrive_download(ID_PDF_INDICADORES_FINANCEIROS)
+            validadores = _baixar_arquivo(url, caminho, cabecalhos)
+            if validadores is not None:
+                metadados = validadores
+            metadados["verificado_em"] = time.time()
+            with open(caminho_metadados, "w", encoding="utf-8") as arquivo:
+                json.dump(metadados, arquivo)
+            return caminho
+        except (requests.exceptions.RequestException, OSError) as e:
+            if existe:
+                print(f"Falha ao revalidar o PDF; usando a cópia em disco: {e}")
+                return caminho
+            st.error(f"Erro ao baixar o PDF de referência: {e}")
+            st.error(
+                "Verifique o ID do PDF e se as permissões de partilha estão corretas."
+            )
+            return None
+
+
+# --- LEITURA PAGINADA (SUPABASE) ---
+
+# O PostgREST limita cada resposta ao seu max-rows (1000 no Supabase). As tabelas
+# são lidas em janelas de TAMANHO_PAGINA linhas, buscadas em paralelo.
+TAMANHO_PAGINA = int(os.getenv("SUPABASE_TAMANHO_PAGINA", "1000"))
+MAX_PAGINAS_SIMULTANEAS = int(os.getenv("MAX_PAGINAS_SIMULTANEAS", "4"))
+
+# Formato das respostas do PostgREST: "csv" é decodificado pelo pyarrow direto em
+# colunas; "json" mantém a lista de dicionários do cliente supabase, que também
+# serve de fallback quando a leitura em CSV falha.
+FORMATO_LEITURA = os.getenv("SUPABASE_FORMATO_LEITURA", "csv")
+
+# Total de linhas e de páginas lidas na última carga de cada tabela
+ESTATISTICAS_PAGINACAO = {}
+
+
+def _montar_consulta(tabela, filtros, colunas=None, count=None):
+    """
+    Monta a consulta PostgREST projetando apenas as colunas pedidas (todas, se None)
+    e aplicando filtros no formato (método, coluna, valor).
+    """
+    consulta = supabase_client.table(tabela).select(*(colunas or ("*",)), count=count)
+    for metodo, coluna, valor in filtros:
+        consulta = getattr(consulta, metodo)(coluna, valor)
+    return consulta
+
+
+def ler_tabela_paginada(
+    tabela, filtros, colunas=None, versao=None, tipos=None, medicao=None
+):
+    """
+    Lê uma tabela do Supabase inteira, sem ser truncada pelo max-rows do PostgREST.
+
+    A primeira página traz a contagem exata de linhas; as demais janelas
+    (offset/limit) são buscadas em paralelo e concatenadas num único DataFrame.
+    As contagens de linhas e páginas ficam registradas em ESTATISTICAS_PAGINACAO.
+
+    Antes de ir à rede, consulta o cache em disco (src.disk_cache), que sobrevive
+    a reinícios do servidor e é compartilhado pelos processos do host. Com uma
+    `versao` (ver versao_tabela), a entrada em disco não expira por idade: só
+    deixa de ser usada quando a versão da tabela muda.
+
+    O resultado baixado é compactado (`tipos`, ver _compactar_tipos) antes de ir
+    para o disco e então relido por memory-map, de modo que o processo que baixou
+    a tabela também use a cópia compartilhada em vez de manter a sua na heap.
+
+    Com um backend local configurado, a tabela é lida direto dele, sem passar
+    pela rede nem pelo cache em disco.
+
+    Se `medicao` (dicionário) for informado, recebe a origem da leitura e, nas
+    leituras pela rede, as medidas da transferência (ver _baixar_janelas).
+    """
+    medicao = {} if medicao is None else medicao
+    if backend_local is not None:
+        medicao["origem"] = "local"
+        return _compactar_tipos(
+            backend_local.ler_tabela(tabela, filtros, colunas), tipos
+        )
 
+    chave = disk_cache.chave_cache(tabela, filtros, colunas, versao)
+    ttl = None if versao else disk_cache.CACHE_DISCO_TTL
+    df = disk_cache.ler(chave, ttl=ttl)
+    if df is not None:
+        medicao["origem"] = "disco"
+        return df
 
-@st.cache_data(ttl=CACHE_TTL)
-def carregar_dados_educacao_rendimento(municipios, anos):
     if not supabase_client:
+        # Em segundo plano, a falha sobe até _revalidar/_pre_carregar, que a
+        # registram no log e mantêm a versão já servida
+        if _em_segundo_plano():
+            raise RuntimeError("Conexão com Supabase não estabelecida.")
         st.error("Conexão com Supabase não estabelecida.")
         return pd.DataFrame()
-    response = (
-        supabase_client.table("dados_educacao_rendimento")
-        .select("*")
-        .in_("municipio", list(municipios))
-        .in_("ano", list(anos))
-        .execute()
-    )
-    return pd.DataFrame(response.data)
 
-
-@st.cache_data(ttl=CACHE_TTL)
-def carregar_dados_educacao_ideb_municipio(municipios):
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return pd.DataFrame()
-    response = (
-        supabase_client.table("dados_educacao_ideb_municipios")
-        .select("*")
-        .in_("municipio", list(municipios))
-        .execute()
+    medicao["origem"] = "rede"
+    df = _compactar_tipos(
+        _baixar_tabela_paginada(tabela, filtros, colunas, medicao, tipos), tipos
     )
-    return pd.DataFrame(response.data)
-
-
-@st.cache_data(ttl=CACHE_TTL)
-def carregar_dados_educacao_ideb_escolas(municipios):
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return pd.DataFrame()
-    response = (
-        supabase_client.table("dados_educacao_ideb_escolas")
-        .select("*")
-        .in_("municipio", list(municipios))
-        .execute()
+    disk_cache.gravar(chave, df)
+    mapeado = disk_cache.ler(chave, ttl=ttl)
+    return mapeado if mapeado is not None else df
+
+
+def _baixar_tabela_paginada(tabela, filtros, colunas, medicao=None, tipos=None):
+    """
+    Baixa a tabela no formato configurado em FORMATO_LEITURA. Se a leitura em
+    CSV falhar (resposta inesperada, erro de parsing, tipos divergentes entre
+    janelas), repete a carga em JSON.
+    """
+    if FORMATO_LEITURA == "csv":
+        try:
+            return _baixar_janelas(
+                tabela,
+                filtros,
+                colunas,
+                _leitor_csv(tipos),
+                functools.partial(_juntar_janelas_csv, tipos=tipos),
+                medicao,
+            )
+        except Exception as e:
+            print(f"Leitura em CSV de {tabela} falhou ({e}); usando JSON.")
+    return _baixar_janelas(
+        tabela, filtros, colunas, _ler_janela_json, _juntar_janelas_json, medicao
     )
-    return pd.DataFrame(response.data)
 
 
-@st.cache_data(ttl=CACHE_TTL)
-def carregar_dados_saude_mensal(municipios, anos):
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return pd.DataFrame()
-    response = (
-        supabase_client.table("dados_saude_mensal")
-        .select("*")
-        .in_("municipio", list(municipios))
-        .in_("ano", list(anos))
-        .execute()
+def _baixar_janelas(tabela, filtros, colunas, ler_janela, juntar_janelas, medicao=None):
+    """
+    Baixa todas as janelas de uma consulta do Supabase e as junta.
+    `ler_janela(consulta)` devolve (janela, total, bytes, segundos de
+    decodificação) e `juntar_janelas(janelas)` devolve o DataFrame final, o que
+    permite trocar o formato de transferência. Os bytes transferidos, o tempo
+    de decodificação (janelas e junção) e o de rede vão para `medicao`.
+
+    Cada janela passa por src.hedge (requisição duplicada acima do limiar de
+    latência da tabela e retentativas com backoff em falhas transitórias).
+    """
+    orcamento = ORCAMENTOS_LATENCIA.get(tabela)
+    inicio_carga = time.perf_counter()
+
+    def _requisicao(inicio, fim, count=None):
+        def _executar():
+            consulta = _montar_consulta(tabela, filtros, colunas, count=count)
+            return ler_janela(consulta.range(inicio, fim))
+
+        return executar_com_hedge(tabela, inicio, _executar, orcamento)
+
+    primeira, total, *medidas = _requisicao(0, TAMANHO_PAGINA - 1, count="exact")
+    lidas = len(primeira)
+    if total is None:
+        total = lidas
+
+    # Se o servidor devolveu menos linhas que o pedido, o max-rows dele é menor
+    # que TAMANHO_PAGINA: usamos o tamanho efetivo para as próximas janelas.
+    tamanho = TAMANHO_PAGINA
+    if 0 < lidas < min(total, TAMANHO_PAGINA):
+        tamanho = lidas
+
+    def _ler_pagina(inicio):
+        return _requisicao(inicio, inicio + tamanho - 1)
+
+    janelas = [primeira]
+    medidas = [medidas]
+    inicios = range(lidas, total, tamanho) if lidas else []
+    if inicios:
+        with ThreadPoolExecutor(
+            max_workers=min(MAX_PAGINAS_SIMULTANEAS, len(inicios))
+        ) as executor:
+            for janela, _, *medida in executor.map(_ler_pagina, inicios):
+                janelas.append(janela)
+                medidas.append(medida)
+
+    ESTATISTICAS_PAGINACAO[tabela] = {"linhas": total, "paginas": len(janelas)}
+    fim_rede = time.perf_counter()
+    df = juntar_janelas(janelas)
+    if medicao is not None:
+        tamanhos = [b for b, _ in medidas if b is not None]
+        medicao.update(
+            paginas=len(janelas),
+            duracao_rede_s=round(fim_rede - inicio_carga, 4),
+            bytes_rede=sum(tamanhos) if tamanhos else None,
+            decodificacao_s=round(
+                sum(d for _, d in medidas) + time.perf_counter() - fim_rede, 4
+            ),
+        )
+    return df
+
+
+def _ler_janela_json(consulta):
+    """
+    Executa a consulta pelo cliente supabase (JSON, lista de dicionários). O
+    cliente não expõe o corpo da resposta, então o volume fica sem medida.
+    """
+    resposta = consulta.execute()
+    inicio = time.perf_counter()
+    janela = pd.DataFrame(resposta.data)
+    return janela, resposta.count, None, time.perf_counter() - inicio
+
+
+def _juntar_janelas_json(janelas):
+    if len(janelas) == 1:
+        return janelas[0]
+    return pd.concat(janelas, ignore_index=True)
+
+
+def _tipos_arrow(tipos=None):
+    """
+    Tipos Arrow declarados para a leitura em CSV a partir do esquema da tabela
+    (TIPOS_COMPACTOS e os `tipos` do TabelaSpec): dimensões como texto, para
+    que códigos como cnae_2_subclasse e cod_sexo não virem números, e colunas
+    de data como inteiros, como no JSON (a compactação vem depois).
+    """
+    declarados = {}
+    for coluna, tipo in {**TIPOS_COMPACTOS, **(tipos or {})}.items():
+        if tipo == "category" or tipo == "string" or tipo == object:
+            declarados[coluna] = pa.string()
+        elif pd.api.types.is_integer_dtype(tipo):
+            declarados[coluna] = pa.int64()
+        else:
+            declarados[coluna] = pa.from_numpy_dtype(np.dtype(tipo))
+    return declarados
+
+
+def _leitor_csv(tipos=None):
+    """
+    Leitor de janelas CSV com os tipos declarados da tabela (_tipos_arrow). As
+    demais colunas são lidas como texto em todas as janelas e só ganham tipo
+    depois da junção (ver _tipar_colunas_texto), com a coluna inteira à vista.
+    """
+    declarados = _tipos_arrow(tipos)
+
+    def _ler(consulta):
+        return _ler_janela_csv(consulta, declarados)
+
+    return _ler
+
+
+def _ler_janela_csv(consulta, tipos_colunas=None):
+    """
+    Executa a consulta pedindo CSV ao PostgREST e a decodifica com o pyarrow
+    direto em colunas, sem passar por objetos Python linha a linha. A consulta
+    montada pelo cliente supabase é reaproveitada (filtros, janela e autenticação);
+    o total vem do cabeçalho Content-Range quando a contagem é pedida.
+    """
+    headers = consulta.headers.copy()
+    headers["Accept"] = "text/csv"
+    resposta = consulta.session.request(
+        consulta.http_method, consulta.path, params=consulta.params, headers=headers
     )
-    return pd.DataFrame(response.data)
-
-
-@st.cache_data(ttl=CACHE_TTL)
-def carregar_dados_saude_despesas(municipios, anos):
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return pd.DataFrame()
-    response = (
-        supabase_client.table("dados_saude_despesas")
-        .select("*")
-        .in_("municipio", list(municipios))
-        .in_("ano", list(anos))
-        .execute()
+    resposta.raise_for_status()
+    inicio = time.perf_counter()
+    janela = _csv_para_arrow(resposta.content, tipos_colunas)
+    return (
+        janela,
+        _total_content_range(resposta.headers.get("content-range")),
+        len(resposta.content),
+        time.perf_counter() - inicio,
     )
-    return pd.DataFrame(response.data)
 
 
-@st.cache_data(ttl=CACHE_TTL)
-def carregar_dados_saude_leitos(municipios, anos):
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return pd.DataFrame()
-    response = (
-        supabase_client.table("dados_saude_leitos")
-        .select("*")
-        .in_("municipio", list(municipios))
-        .in_("ano", list(anos))
-        .execute()
+def _csv_para_arrow(conteudo, tipos_colunas=None):
+    """
+    Converte o corpo CSV em uma tabela Arrow com os tipos de `tipos_colunas`
+    (padrão: os do esquema, ver _tipos_arrow) e as demais colunas como texto.
+    Textos vazios continuam vazios, como no JSON.
+    """
+    if not conteudo.strip():
+        return pa.table({})
+    declarados = _tipos_arrow() if tipos_colunas is None else tipos_colunas
+    primeira_linha = conteudo.split(b"\n", 1)[0].rstrip(b"\r")
+    cabecalho = next(csv.reader([primeira_linha.decode("utf-8")]))
+    opcoes = pa_csv.ConvertOptions(
+        column_types={c: declarados.get(c, pa.string()) for c in cabecalho},
+        strings_can_be_null=False,
     )
-    return pd.DataFrame(response.data)
+    return pa_csv.read_csv(io.BytesIO(conteudo), convert_options=opcoes)
 
 
-@st.cache_data(ttl=CACHE_TTL)
-def carregar_dados_saude_medicos(municipios, anos):
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return pd.DataFrame()
-    response = (
-        supabase_client.table("dados_saude_medicos")
-        .select("*")
-        .in_("municipio", list(municipios))
-        .in_("ano", list(anos))
-        .execute()
+def _total_content_range(content_range):
+    """Extrai o total de um cabeçalho Content-Range ("0-999/5321"), se houver."""
+    if not content_range or "/" not in content_range:
+        return None
+    total = content_range.rsplit("/", 1)[1]
+    return int(total) if total.isdigit() else None
+
+
+# Códigos com zeros à esquerda (ex.: os montados com LPAD no update_data.py)
+# são texto no banco e no JSON; não podem virar números
+_ZEROS_A_ESQUERDA = r"^[-+]?0[0-9]"
+
+
+def _tipar_coluna_texto(coluna):
+    """
+    Dá a uma coluna lida como texto o tipo que o JSON daria: inteiro, decimal
+    (inteiros e decimais misturados viram decimal) ou booleano, com os vazios
+    como nulos; ou texto, se houver zeros à esquerda ou valores não numéricos.
+    """
+    valores = pc.if_else(pc.equal(coluna, ""), pa.scalar(None, pa.string()), coluna)
+    if valores.null_count == len(valores):
+        return coluna
+    if pc.any(pc.match_substring_regex(valores, _ZEROS_A_ESQUERDA)).as_py():
+        return coluna
+    for tipo in (pa.int64(), pa.float64(), pa.bool_()):
+        try:
+            return pc.cast(valores, tipo)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            continue
+    return coluna
+
+
+def _tipar_colunas_texto(tabela, declarados):
+    """Aplica _tipar_coluna_texto às colunas sem tipo declarado."""
+    for i, nome in enumerate(tabela.column_names):
+        if nome not in declarados and pa.types.is_string(tabela.schema.field(i).type):
+            tabela = tabela.set_column(i, nome, _tipar_coluna_texto(tabela.column(i)))
+    return tabela
+
+
+def _juntar_janelas_csv(janelas, tipos=None):
+    """
+    Junta as janelas em Arrow, dá tipo às colunas não declaradas e converte
+    para pandas uma única vez, já com as dimensões textuais como category.
+    Como todas as janelas têm os mesmos tipos, não há promoção na junção.
+    """
+    tabela = pa.concat_tables(janelas, promote_options="default")
+    tabela = _tipar_colunas_texto(tabela, _tipos_arrow(tipos))
+    categorias = [c for c in tabela.column_names if c in COLUNAS_CATEGORICAS]
+    return tabela.to_pandas(categories=categorias)
+
+
+# --- VERSÕES DOS DADOS ---
+
+# O update_data.py publica, a cada carga bem-sucedida, o checksum de cada tabela
+# em dados_versions. A versão entra na chave do st.cache_data e do cache em disco:
+# só as tabelas cuja versão mudou são baixadas de novo.
+TABELA_VERSOES = "dados_versions"
+VERSOES_TTL = int(os.getenv("VERSOES_TTL", "300"))  # 5 minutos
+
+
+@st.cache_data(ttl=VERSOES_TTL, show_spinner=False)
+def carregar_versoes_dados():
+    """Lê o manifesto de versões (tabela -> versão); vazio se indisponível."""
+    try:
+        if backend_local is not None:
+            linhas = backend_local.ler_tabela(
+                TABELA_VERSOES, [], ("tabela", "versao")
+            ).to_dict(orient="records")
+        elif supabase_client:
+            linhas = (
+                supabase_client.table(TABELA_VERSOES)
+                .select("tabela", "versao")
+                .execute()
+                .data
+            )
+        else:
+            return {}
+        return {linha["tabela"]: linha["versao"] for linha in linhas}
+    except Exception as e:
+        print(f"Manifesto de versões indisponível ({e}); usando janela de tempo.")
+        return {}
+
+
+def versao_tabela(tabela):
+    """
+    Versão publicada da tabela. Sem manifesto, cai numa janela de tempo de
+    CACHE_TTL, reproduzindo a expiração antiga.
+    """
+    versao = carregar_versoes_dados().get(tabela)
+    if versao:
+        return versao
+    return f"janela-{int(time.time() // CACHE_TTL)}"
+
+
+# --- REGISTRO DECLARATIVO DE TABELAS ---
+
+
+@dataclass(frozen=True)
+class TabelaSpec:
+    """
+    Especificação de um dataset servido pelo Supabase.
+
+    - tabela: nome da tabela no Supabase.
+    - escopo: "municipios" filtra pelos municipios_carregados (e depois pelo
+      multiselect global); "municipio" filtra apenas o município principal.
+    - anos: anos filtrados na coluna "ano" (None = sem filtro de ano).
+    - paginas: páginas que consomem o dataset e as colunas que cada uma lê
+      (None = todas). A página "Dados" recebe todos os datasets completos.
+    - tipos: dtypes específicos da tabela, com precedência sobre TIPOS_COMPACTOS.
+    - orcamento_latencia: segundos de espera por uma janela antes de disparar a
+      requisição duplicada, até haver amostras para usar o p95 (ver src.hedge).
+    """
+
+    tabela: str
+    escopo: str
+    anos: tuple = None
+    paginas: dict = field(default_factory=dict)
+    tipos: dict = field(default_factory=dict)
+    orcamento_latencia: float = None
+
+
+# Projeções usadas pelo resumo de "Últimos dados" da página inicial
+COLUNAS_DATA_MENSAL = ("municipio", "ano", "mes")
+COLUNAS_DATA_ANUAL = ("municipio", "ano")
+
+# As páginas ficam com None quando leem todas as colunas da tabela, inclusive as
+# montadas em tempo de execução (f"taxa_{indicador}" em Segurança e
+# f"{indicador}_{nivel}" nas taxas de rendimento da Educação).
+DATASETS = {
+    # --- Emprego ---
+    "caged": TabelaSpec(
+        "dados_emprego_municipios",
+        "municipios",
+        anos_de_interesse,
+        paginas={"Início": COLUNAS_DATA_MENSAL, "Emprego": None},
+    ),
+    "caged_cnae": TabelaSpec(
+        "dados_emprego_cnae",
+        "municipio",
+        anos_de_interesse,
+        {
+            "Emprego": (
+                "ano",
+                "mes",
+                "municipio",
+                "subclasse",
+                "grupo",
+                "grupo_ibge",
+                "saldo_movimentacao",
+            )
+        },
+        orcamento_latencia=4.0,
+    ),
+    "caged_faixa_etaria": TabelaSpec(
+        "dados_emprego_faixa_etaria", "municipio", anos_de_interesse, {"Emprego": None}
+    ),
+    "caged_grau_instrucao": TabelaSpec(
+        "dados_emprego_grau_instrucao",
+        "municipio",
+        anos_de_interesse,
+        {"Emprego": None},
+    ),
+    "caged_raca_cor": TabelaSpec(
+        "dados_emprego_raca_cor", "municipio", anos_de_interesse, {"Emprego": None}
+    ),
+    "caged_sexo": TabelaSpec(
+        "dados_emprego_sexo",
+        "municipio",
+        anos_de_interesse,
+        {"Emprego": ("ano", "mes", "municipio", "sexo", "saldo_movimentacao")},
+    ),
+    "vinculos": TabelaSpec(
+        "dados_vinculos_municipios",
+        "municipios",
+        anos_de_interesse,
+        paginas={"Início": COLUNAS_DATA_ANUAL, "Emprego": None},
+    ),
+    "vinculos_cnae": TabelaSpec(
+        "dados_vinculos_cnae",
+        "municipio",
+        anos_de_interesse,
+        {
+            "Emprego": (
+                "ano",
+                "municipio",
+                "subclasse",
+                "grupo",
+                "grupo_ibge",
+                "vinculos_ativos",
+            )
+        },
+    ),
+    "vinculos_faixa_etaria": TabelaSpec(
+        "dados_vinculos_faixa_etaria", "municipio", anos_de_interesse, {"Emprego": None}
+    ),
+    "vinculos_grau_instrucao": TabelaSpec(
+        "dados_vinculos_grau_instrucao",
+        "municipio",
+        anos_de_interesse,
+        {"Emprego": None},
+    ),
+    "vinculos_raca_cor": TabelaSpec(
+        "dados_vinculos_raca_cor", "municipio", anos_de_interesse, {"Emprego": None}
+    ),
+    "vinculos_sexo": TabelaSpec(
+        "dados_vinculos_sexo",
+        "municipio",
+        anos_de_interesse,
+        {"Emprego": ("ano", "municipio", "sexo", "vinculos_ativos")},
+    ),
+    "renda": TabelaSpec(
+        "dados_renda_municipios", "municipios", anos_de_interesse, {"Emprego": None}
+    ),
+    "renda_cnae": TabelaSpec(
+        "dados_renda_cnae", "municipio", anos_de_interesse, {"Emprego": None}
+    ),
+    "renda_sexo": TabelaSpec(
+        "dados_renda_sexo",
+        "municipio",
+        anos_de_interesse,
+        {
+            "Emprego": (
+                "ano",
+                "municipio",
+                "sexo",
+                "remuneracao_media_dezembro",
+                "valor_remuneracao_media_dezembro_sm",
+            )
+        },
+    ),
+    # --- Empresas ---
+    "cnpj_total": TabelaSpec(
+        "dados_cnpj_total",
+        "municipios",
+        anos_de_interesse,
+        paginas={"Início": COLUNAS_DATA_MENSAL, "Empresas": None},
+    ),
+    "cnpj_cnae": TabelaSpec(
+        "dados_cnpj_cnae", "municipio", anos_de_interesse, {"Empresas": None}
+    ),
+    "cnpj_cnae_saldo": TabelaSpec(
+        "dados_cnpj_cnae_saldo",
+        "municipio",
+        anos_de_interesse,
+        {
+            "Empresas": (
+                "ano",
+                "mes",
+                "municipio",
+                "grupo",
+                "grupo_ibge",
+                "empresas_ativas",
+                "saldo_empresas",
+            )
+        },
+    ),
+    "mei_total": TabelaSpec(
+        "dados_mei_total", "municipios", anos_de_interesse, {"Empresas": None}
+    ),
+    "mei_cnae": TabelaSpec(
+        "dados_mei_cnae", "municipio", anos_de_interesse, {"Empresas": None}
+    ),
+    "mei_cnae_saldo": TabelaSpec(
+        "dados_mei_cnae_saldo",
+        "municipio",
+        anos_de_interesse,
+        {
+            "Empresas": (
+                "ano",
+                "mes",
+                "municipio",
+                "grupo",
+                "grupo_ibge",
+                "empresas_ativas",
+                "saldo_empresas",
+            )
+        },
+    ),
+    "estabelecimentos": TabelaSpec(
+        "dados_estabelecimentos_municipios",
+        "municipios",
+        anos_de_interesse,
+        {"Empresas": None},
+    ),
+    "estabelecimentos_cnae": TabelaSpec(
+        "dados_estabelecimentos_cnae",
+        "municipio",
+        anos_de_interesse,
+        {
+            "Empresas": (
+                "ano",
+                "municipio",
+                "subclasse",
+                "grupo",
+                "grupo_ibge",
+                "qntd_estabelecimentos",
+            )
+        },
+    ),
+    "estabelecimentos_tamanho": TabelaSpec(
+        "dados_estabelecimentos_tamanho",
+        "municipio",
+        anos_de_interesse,
+        {"Empresas": None},
+    ),
+    # --- Comércio Exterior ---
+    "comex_ano": TabelaSpec(
+        "dados_comex_anual",
+        "municipios",
+        anos_comex,
+        {
+            "Comércio Exterior": (
+                "ano",
+                "municipio",
+                "total_exp_anual",
+                "perc_var_ano_anterior",
+            )
+        },
+    ),
+    "comex_mensal": TabelaSpec(
+        "dados_comex_mensal",
+        "municipios",
+        anos_comex,
+        paginas={
+            "Início": COLUNAS_DATA_MENSAL,
+            "Comércio Exterior": (
+                "ano",
+                "mes",
+                "municipio",
+                "total_exp_mensal",
+                "perc_var_mes_ano_anterior",
+                "total_exp_acumulado",
+                "perc_var_acum_ano_anterior",
+            ),
+        },
+    ),
+    "comex_municipio": TabelaSpec(
+        "dados_comex_municipio",
+        "municipio",
+        anos_comex,
+        {"Comércio Exterior": None},
+        orcamento_latencia=4.0,
+    ),
+    # --- Segurança ---
+    "seguranca": TabelaSpec(
+        "dados_seguranca",
+        "municipios",
+        anos_de_interesse,
+        paginas={"Início": COLUNAS_DATA_MENSAL, "Segurança": None},
+    ),
+    "seguranca_taxa": TabelaSpec(
+        "dados_seguranca_taxa", "municipios", anos_de_interesse, {"Segurança": None}
+    ),
+    # --- Assistência Social ---
+    "cad": TabelaSpec(
+        "dados_cadastro_unico",
+        "municipios",
+        anos_de_interesse,
+        paginas={"Início": COLUNAS_DATA_MENSAL, "Assistência Social": None},
+    ),
+    "bolsa_familia": TabelaSpec(
+        "dados_bolsa_familia",
+        "municipios",
+        anos_de_interesse,
+        paginas={"Início": COLUNAS_DATA_MENSAL, "Assistência Social": None},
+    ),
+    # --- Educação ---
+    "educacao_matriculas": TabelaSpec(
+        "dados_educacao_matriculas",
+        "municipios",
+        anos_de_interesse,
+        paginas={"Início": COLUNAS_DATA_ANUAL, "Educação": None},
+    ),
+    "educacao_rendimento": TabelaSpec(
+        "dados_educacao_rendimento", "municipios", anos_de_interesse, {"Educação": None}
+    ),
+    "educacao_ideb_municipio": TabelaSpec(
+        "dados_educacao_ideb_municipios",
+        "municipios",
+        paginas={"Início": COLUNAS_DATA_ANUAL, "Educação": None},
+    ),
+    "educacao_ideb_escolas": TabelaSpec(
+        "dados_educacao_ideb_escolas", "municipios", paginas={"Educação": None}
+    ),
+    # --- Saúde ---
+    "saude_mensal": TabelaSpec(
+        "dados_saude_mensal",
+        "municipios",
+        anos_de_interesse,
+        paginas={
+            "Início": COLUNAS_DATA_MENSAL,
+            "Saúde": (
+                "ano",
+                "mes",
+                "municipio",
+                "internacoes_icsab",
+                "internacoes_totais",
+                "prop_icsab",
+                "nascimentos",
+                "nascimentos/1000_hab",
+                "prop_nasc_adolesc",
+                "prop_nasc_baixo_peso",
+                "prop_consultas_pre_natal",
+                "obitos",
+                "taxa_obitos_infantis",
+                "coef_neonatal",
+                "obitos_causa_definida",
+                "obitos_causa_nao_definida",
+                "prop_obitos_causas_definidas",
+                "notificacoes_acidentes_trab",
+                "taxa_acidentes_trab",
+            ),
+        },
+    ),
+    "saude_vacinas": TabelaSpec(
+        "dados_saude_vacinas", "municipios", anos_de_interesse, {"Saúde": None}
+    ),
+    "saude_despesas": TabelaSpec(
+        "dados_saude_despesas", "municipios", anos_de_interesse, {"Saúde": None}
+    ),
+    "saude_leitos": TabelaSpec(
+        "dados_saude_leitos", "municipios", anos_de_interesse, {"Saúde": None}
+    ),
+    "saude_medicos": TabelaSpec(
+        "dados_saude_medicos", "municipios", anos_de_interesse, {"Saúde": None}
+    ),
+    # --- PIB e Demografia ---
+    "pib_municipios": TabelaSpec(
+        "dados_pib_municipios",
+        "municipios",
+        paginas={
+            "Início": COLUNAS_DATA_ANUAL,
+            "PIB": (
+                "ano",
+                "municipio",
+                "pib_milhoes",
+                "tx_cresc_pib_mil",
+                "valor_adicionado_bruto_adm_milhoes",
+                "tx_cresc_adm_mil",
+                "valor_adicionado_bruto_agropecuaria_milhoes",
+                "tx_cresc_agro_mil",
+                "valor_adicionado_bruto_industria_milhoes",
+                "tx_cresc_industria_mil",
+                "valor_adicionado_bruto_servicos_milhoes",
+                "tx_cresc_servicos_mil",
+                "pib_per_capita",
+                "tx_cresc_pib_per_capita",
+                "percentual_pib_rs",
+                "posicao_pib_geral",
+                "posicao_pib_agropecuaria",
+                "posicao_pib_industria",
+                "posicao_pib_servico",
+                "posicao_pib_adm_publica",
+            ),
+        },
+    ),
+    "populacao_densidade": TabelaSpec(
+        "dados_populacao_densidade",
+        "municipios",
+        anos_de_interesse,
+        paginas={
+            "Início": COLUNAS_DATA_ANUAL,
+            "Demografia": ("ano", "municipio", "pop_estimada", "densidade_demografica"),
+        },
+    ),
+    "populacao_sexo_idade": TabelaSpec(
+        "dados_populacao_sexo_idade",
+        "municipios",
+        anos_de_interesse,
+        paginas={"Início": COLUNAS_DATA_ANUAL, "Demografia": None},
+    ),
+    # --- Finanças ---
+    "financas": TabelaSpec(
+        "dados_financas",
+        "municipios",
+        anos_de_interesse,
+        paginas={
+            "Início": ("municipio", "ano", "bimestre"),
+            "Finanças": (
+                "ano",
+                "bimestre",
+                "municipio",
+                "coluna",
+                "cod_conta",
+                "valor",
+            ),
+        },
+        orcamento_latencia=4.0,
+    ),
+    "indicadores_financeiros": TabelaSpec(
+        "dados_indicadores_financeiros",
+        "municipios",
+        anos_de_interesse,
+        paginas={"Início": COLUNAS_DATA_ANUAL, "Finanças": None},
+    ),
+}
+
+# Orçamento de latência por tabela do Supabase, consultado por _baixar_janelas
+ORCAMENTOS_LATENCIA = {
+    spec.tabela: spec.orcamento_latencia
+    for spec in DATASETS.values()
+    if spec.orcamento_latencia is not None
+}
+
+# Recursos que não são tabelas do Supabase, com as páginas que os consomem
+RECURSOS = {
+    "pdf_indicadores": (carregar_pdf_indicadores_financeiros, ("Finanças", "Dados")),
+}
+
+
+def _montar_datasets_por_pagina():
+    """Deriva, a partir do registro, os datasets (e colunas) que cada página consome."""
+    paginas = {}
+    for nome, spec in DATASETS.items():
+        for pagina, colunas in spec.paginas.items():
+            paginas.setdefault(pagina, {})[nome] = colunas
+    paginas["Dados"] = dict.fromkeys(DATASETS)
+    for nome, (_, paginas_recurso) in RECURSOS.items():
+        for pagina in paginas_recurso:
+            paginas.setdefault(pagina, {})[nome] = None
+    return paginas
+
+
+DATASETS_POR_PAGINA = _montar_datasets_por_pagina()
+
+
+# --- ESQUEMA DE TIPOS COMPACTOS ---
+
+# Os nomes de coluna são padronizados em update_data.py, então um único esquema
+# vale para todas as tabelas: dimensões textuais repetidas viram category e as
+# colunas de data viram inteiros pequenos. Cada DataFrame fica em memória por
+# processo e é hasheado pelo st.cache_data a cada chamada das views, de modo que
+# tipos menores reduzem tanto a memória quanto o tempo de hash.
+COLUNAS_CATEGORICAS = (
+    "municipio",
+    "pais",
+    "produto",
+    "grupo",
+    "grupo_ibge",
+    "subclasse",
+    "cnae_2_subclasse",
+    "tamanho_estabelecimento",
+    "sexo",
+    "cod_sexo",
+    "faixa_etaria",
+    "grau_instrucao",
+    "raca_cor",
+    "escola",
+    "dependencia",
+    "indicador",
+    "categoria",
+    "coluna",
+    "cod_conta",
+    "conta",
+)
+
+TIPOS_COMPACTOS = {
+    **dict.fromkeys(COLUNAS_CATEGORICAS, "category"),
+    "ano": "int16",
+    "mes": "int8",
+    "bimestre": "int8",
+}
+
+# Contagens int64 são reduzidas para int32 apenas com folga para somas e
+# diferenças feitas nas views; valores float não são alterados (precisão).
+LIMITE_INT32_SEGURO = 2**30
+
+
+def _compactar_tipos(df, tipos=None):
+    """
+    Converte as colunas do DataFrame para os dtypes compactos do esquema.
+    Colunas inteiras com nulos (que chegam como float) são mantidas como estão,
+    e colunas já no dtype final não são copiadas.
+    """
+    if df.empty:
+        return df
+
+    esquema = {**TIPOS_COMPACTOS, **(tipos or {})}
+    conversoes = {}
+    for coluna in df.columns:
+        serie = df[coluna]
+        tipo = esquema.get(coluna)
+        if tipo == "category":
+            if serie.dtype == object:
+                conversoes[coluna] = tipo
+        elif tipo is not None:
+            if serie.dtype == tipo:
+                continue
+            if pd.api.types.is_numeric_dtype(serie) and serie.notna().all():
+                conversoes[coluna] = tipo
+        elif pd.api.types.is_integer_dtype(serie) and serie.dtype.itemsize > 4:
+            if serie.abs().max() < LIMITE_INT32_SEGURO:
+                conversoes[coluna] = "int32"
+    return df.astype(conversoes) if conversoes else df
+
+
+# --- MOTOR GENÉRICO DE CARREGAMENTO ---
+
+
+def _ler_tabela(nome, municipios, anos=None, colunas=None, versao=None):
+    """
+    Carrega um dataset do registro filtrando por município(s) e, se houver, por ano.
+    `municipios` é a lista de municípios (escopo "municipios") ou o nome do
+    município de interesse (escopo "municipio").
+    """
+    spec = DATASETS[nome]
+    if spec.escopo == "municipios":
+        filtros = [("in_", "municipio", list(municipios))]
+    else:
+        filtros = [("eq", "municipio", municipios)]
+    if anos is not None:
+        filtros.append(("in_", "ano", list(anos)))
+
+    medicao = {"dataset": nome, "tabela": spec.tabela}
+    inicio = time.perf_counter()
+    df = ler_tabela_paginada(spec.tabela, filtros, colunas, versao, spec.tipos, medicao)
+    medicao.update(
+        colunas=len(df.columns),
+        duracao_s=round(time.perf_counter() - inicio, 4),
+        linhas=len(df),
+        bytes_memoria=int(df.memory_usage(index=True, deep=True).sum()),
     )
-    return pd.DataFrame(response.data)
+    instrumentation.registrar_carga(medicao)
+    return df
 
 
 @st.cache_data(ttl=CACHE_TTL)
-def carregar_dados_saude_vacinas(municipios, anos):
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return pd.DataFrame()
-    response = (
-        supabase_client.table("dados_saude_vacinas")
-        .select("*")
-        .in_("municipio", list(municipios))
-        .in_("ano", list(anos))
-        .execute()
+def carregar_tabela(nome, municipios, anos=None, colunas=None, versao=None):
+    """
+    Versão de _ler_tabela com st.cache_data, usada quando a revalidação em
+    segundo plano está desligada. `versao` faz parte da chave do cache: quando
+    a versão publicada muda, a tabela é recarregada. Como o st.cache_data guarda
+    cópias serializadas, este modo não compartilha memória entre processos.
+    """
+    return _ler_tabela(nome, municipios, anos, colunas, versao)
+
+
+# --- REVALIDAÇÃO EM SEGUNDO PLANO (STALE-WHILE-REVALIDATE) ---
+
+# Com CACHE_SWR ativo, as tabelas ficam num armazenamento do processo em vez do
+# st.cache_data. Quando a versão de uma tabela muda (nova carga do update_data ou
+# fim da janela de tempo), a versão atual continua sendo servida enquanto uma
+# thread busca a nova e a substitui de uma só vez. Só a primeira carga bloqueia.
+CACHE_SWR_ATIVO = os.getenv("CACHE_SWR", "1") != "0"
+MAX_REVALIDACOES_SIMULTANEAS = int(os.getenv("MAX_REVALIDACOES_SIMULTANEAS", "2"))
+
+
+@dataclass(frozen=True)
+class EntradaCache:
+    """
+    Dataset servido pelo armazenamento, com a versão e o horário da carga.
+    `particoes` (município -> posições das linhas) é preenchido sob demanda
+    pelo filtro global.
+    """
+
+    dados: pd.DataFrame
+    versao: str
+    atualizado_em: float
+    particoes: dict = field(default_factory=dict, repr=False, compare=False)
+    # Protege `particoes`, usado por várias sessões ao mesmo tempo
+    trava: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
     )
-    return pd.DataFrame(response.data)
 
 
-@st.cache_data(ttl=CACHE_TTL)
-def carregar_dados_pib_municipios(municipios):
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return pd.DataFrame()
-    response = (
-        supabase_client.table("dados_pib_municipios")
-        .select("*")
-        .in_("municipio", list(municipios))
-        .execute()
-    )
-    return pd.DataFrame(response.data)
+_ENTRADAS = {}
+_EM_REVALIDACAO = set()
+_TRAVA_ENTRADAS = threading.Lock()
+_TRAVAS_CARGA = {}
+_EXECUTOR_REVALIDACAO = ThreadPoolExecutor(
+    max_workers=MAX_REVALIDACOES_SIMULTANEAS, thread_name_prefix="revalidacao"
+)
+
+
+def _trava_carga(chave):
+    with _TRAVA_ENTRADAS:
+        return _TRAVAS_CARGA.setdefault(chave, threading.Lock())
+
+
+def _carregar_entrada(chave, versao):
+    """
+    Carrega a tabela e troca a entrada do armazenamento. Uma carga que volta
+    vazia não substitui dados já servidos (ex.: falha de rede na revalidação).
+    """
+    with _trava_carga(chave):
+        atual = _ENTRADAS.get(chave)
+        if atual is not None and atual.versao == versao:
+            return atual
+        df = _ler_tabela(*chave, versao)
+        if df.empty and atual is not None and not atual.dados.empty:
+            print(f"Revalidação de {chave[0]} voltou vazia; mantendo a versão atual.")
+            return atual
+        entrada = EntradaCache(df, versao, time.time())
+        with _TRAVA_ENTRADAS:
+            _ENTRADAS[chave] = entrada
+        return entrada
+
+
+def _revalidar(chave, versao):
+    _SEGUNDO_PLANO.ativo = True
+    try:
+        _carregar_entrada(chave, versao)
+    except Exception as e:
+        print(f"Erro ao revalidar {chave[0]} em segundo plano: {e}")
+    finally:
+        _SEGUNDO_PLANO.ativo = False
+        with _TRAVA_ENTRADAS:
+            _EM_REVALIDACAO.discard(chave)
+
+
+def _agendar_revalidacao(chave, versao):
+    """Dispara a revalidação da chave, no máximo uma por vez para cada chave."""
+    with _TRAVA_ENTRADAS:
+        if chave in _EM_REVALIDACAO:
+            return
+        _EM_REVALIDACAO.add(chave)
+    _EXECUTOR_REVALIDACAO.submit(_revalidar, chave, versao)
+
+
+def _servir_com_revalidacao(chave, versao):
+    """
+    Devolve a entrada do armazenamento, mesmo que de uma versão anterior, e agenda
+    a revalidação se a versão mudou. Quem a recebe deve usar esta entrada (e não
+    reler o armazenamento), pois a revalidação pode trocá-la a qualquer momento.
+    """
+    entrada = _ENTRADAS.get(chave)
+    if entrada is None:
+        entrada = _carregar_entrada(chave, versao)
+    elif entrada.versao != versao:
+        _agendar_revalidacao(chave, versao)
+    _marcar_servida(chave)
+    return entrada
+
+
+def ultimas_atualizacoes():
+    """Horário (epoch) da última carga de cada dataset no armazenamento."""
+    with _TRAVA_ENTRADAS:
+        entradas = list(_ENTRADAS.items())
+    atualizacoes = {}
+    for (nome, *_), entrada in entradas:
+        atualizacoes[nome] = max(atualizacoes.get(nome, 0), entrada.atualizado_em)
+    return atualizacoes
+
+
+def _chave_dataset(nome, colunas=None, municipio_foco=None):
+    """
+    Chave do dataset no cache: nome, municípios, anos e projeção de colunas. As
+    tabelas de um único município são lidas para `municipio_foco` (o município
+    principal escolhido; padrão municipio_de_interesse).
+    """
+    spec = DATASETS[nome]
+    if spec.escopo == "municipios":
+        municipios = tuple(municipios_carregados)
+    else:
+        municipios = municipio_foco or municipio_de_interesse
+    return (nome, municipios, spec.anos, tuple(colunas) if colunas else None)
+
+
+def tamanhos_datasets():
+    """
+    Tamanho em memória de cada dataset do armazenamento (ver src.views.admin),
+    somando o índice de partições do filtro global. Colunas lidas do cache em
+    disco por memory-map entram no total, embora fiquem no cache de páginas do
+    sistema, compartilhadas entre processos.
+    """
+    with _TRAVA_ENTRADAS:
+        entradas = list(_ENTRADAS.items())
+    linhas = []
+    for (nome, _, _, colunas), entrada in entradas:
+        with entrada.trava:
+            bytes_indice = sum(p.nbytes for p in entrada.particoes.values())
+        linhas.append(
+            {
+                "dataset": nome,
+                "colunas": "todas" if colunas is None else ",".join(colunas),
+                "linhas": len(entrada.dados),
+                "bytes": int(entrada.dados.memory_usage(index=True, deep=True).sum())
+                + bytes_indice,
+                "versao": entrada.versao,
+            }
+        )
+    return pd.DataFrame(
+        linhas, columns=["dataset", "colunas", "linhas", "bytes", "versao"]
+    ).sort_values("bytes", ascending=False)
+
+
+def _carregar_dataset_e_entrada(nome, colunas=None, municipio_foco=None):
+    """
+    Como carregar_dataset, devolvendo também a entrada do armazenamento de onde
+    os dados vieram (None para recursos e com CACHE_SWR desligado).
+    """
+    if nome in RECURSOS:
+        return RECURSOS[nome][0](), None
+
+    instrumentation.registrar_acesso(nome)
+    chave = _chave_dataset(nome, colunas, municipio_foco)
+    versao = versao_tabela(DATASETS[nome].tabela)
+    if CACHE_SWR_ATIVO:
+        entrada = _servir_com_revalidacao(chave, versao)
+        # Cópia rasa, para que alterações feitas pelas views não cheguem às
+        # outras sessões
+        return entrada.dados.copy(deep=False), entrada
+    return carregar_tabela(*chave, versao), None
+
+
+def carregar_dataset(nome, colunas=None, municipio_foco=None):
+    """
+    Carrega um dataset (ou recurso) pelo nome com os filtros padrão da aplicação,
+    opcionalmente projetando apenas as colunas informadas.
+    """
+    return _carregar_dataset_e_entrada(nome, colunas, municipio_foco)[0]
+
+
+def carregar_datasets(nomes, municipio_foco=None):
+    """
+    Carrega os datasets informados em paralelo, devolvendo um dicionário nome -> dados.
+    `nomes` pode ser uma lista de nomes ou um dicionário nome -> colunas, como os
+    de DATASETS_POR_PAGINA.
+
+    As requisições são disparadas num pool de threads limitado por
+    MAX_REQUISICOES_SIMULTANEAS, de modo que o tempo de uma carga a frio fique
+    próximo ao da tabela mais lenta, e não à soma de todas. Cada dataset continua
+    passando pelo próprio cache, então o comportamento do cache não muda.
+    """
+    carregados = _carregar_datasets_e_entradas(nomes, municipio_foco)
+    return {nome: df for nome, (df, _) in carregados.items()}
+
+
+def _carregar_datasets_e_entradas(nomes, municipio_foco=None):
+    """carregar_datasets devolvendo nome -> (dados, entrada do armazenamento)."""
+    projecoes = nomes if isinstance(nomes, dict) else dict.fromkeys(nomes)
+    nomes = list(projecoes)
+    if len(nomes) <= 1 or MAX_REQUISICOES_SIMULTANEAS <= 1:
+        return {
+            nome: _carregar_dataset_e_entrada(nome, projecoes[nome], municipio_foco)
+            for nome in nomes
+        }
+
+    # Propaga o contexto da sessão para as threads, permitindo que st.cache_data
+    # e st.error funcionem normalmente dentro delas.
+    ctx = get_script_run_ctx()
+
+    def _carregar_com_contexto(nome):
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return _carregar_dataset_e_entrada(nome, projecoes[nome], municipio_foco)
+
+    max_workers = min(MAX_REQUISICOES_SIMULTANEAS, len(nomes))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        resultados = executor.map(_carregar_com_contexto, nomes)
+        return dict(zip(nomes, resultados))
+
+
+def filtrar_datasets_por_municipio(dados, municipios_selecionados):
+    """
+    Aplica o filtro global de municípios aos datasets multi-município.
+    Datasets do município de interesse (e o PDF) são devolvidos sem alteração.
+    """
+    filtrados = {}
+    for nome, df in dados.items():
+        spec = DATASETS.get(nome)
+        if spec and spec.escopo == "municipios" and "municipio" in df.columns:
+            df = df[df["municipio"].isin(municipios_selecionados)]
+            # Remove os municípios fora da seleção das categorias, para que não
+            # apareçam em legendas e seletores montados a partir da coluna
+            if isinstance(df["municipio"].dtype, pd.CategoricalDtype):
+                df = df.assign(municipio=df["municipio"].cat.remove_unused_categories())
+            filtrados[nome] = df
+        else:
+            filtrados[nome] = df
+    return filtrados
+
+
+# --- FILTRO GLOBAL DE MUNICÍPIOS COM ÍNDICE DE PARTIÇÕES ---
+
+
+def _indice_municipios(entrada):
+    """
+    Posições das linhas de cada município, calculadas uma vez por entrada.
+    Chamada com entrada.trava adquirida.
+    """
+    if not entrada.particoes:
+        entrada.particoes.update(
+            entrada.dados.groupby("municipio", observed=True, sort=False).indices
+        )
+    return entrada.particoes
+
+
+def _selecionar_municipios(entrada, municipios_selecionados):
+    """
+    Aplica o filtro de municípios a uma entrada do armazenamento: junta as
+    partições selecionadas numa única leitura por posição. Só o índice fica
+    guardado na entrada; o subconjunto é montado a cada chamada, para que a
+    memória não cresça com as combinações de municípios escolhidas.
+    """
+    df = entrada.dados
+    if df.empty or "municipio" not in df.columns:
+        return df.copy(deep=False)
+
+    with entrada.trava:
+        indice = _indice_municipios(entrada)
+        posicoes = [indice[m] for m in set(municipios_selecionados) if m in indice]
+    posicoes = np.sort(np.concatenate(posicoes or [np.array([], np.intp)]))
+    subconjunto = df.take(posicoes)
+    if isinstance(df["municipio"].dtype, pd.CategoricalDtype):
+        subconjunto = subconjunto.assign(
+            municipio=subconjunto["municipio"].cat.remove_unused_categories()
+        )
+    return subconjunto
+
+
+def carregar_datasets_por_municipio(
+    nomes, municipios_selecionados, municipio_foco=None
+):
+    """
+    Carrega os datasets como carregar_datasets e devolve (dados, filtrados): os
+    datasets completos e os mesmos com o filtro global de municípios aplicado.
+
+    Com o armazenamento em memória (CACHE_SWR), o filtro usa o índice de
+    partições de cada entrada, então mudar a seleção não recalcula máscaras
+    sobre todas as tabelas a cada interação. Sem ele, recai em
+    filtrar_datasets_por_municipio.
+    """
+    with profiling.fase("carregamento"):
+        carregados = _carregar_datasets_e_entradas(nomes, municipio_foco)
+    dados = {nome: df for nome, (df, _) in carregados.items()}
+    if not CACHE_SWR_ATIVO:
+        with profiling.fase("filtro_municipios"):
+            filtrados = filtrar_datasets_por_municipio(dados, municipios_selecionados)
+        return dados, filtrados
+
+    # O filtro usa a mesma entrada que serviu `dados`, mesmo que uma revalidação
+    # já a tenha trocado no armazenamento
+    filtrados = {}
+    with profiling.fase("filtro_municipios"):
+        for nome, (df, entrada) in carregados.items():
+            spec = DATASETS.get(nome)
+            if entrada is not None and spec.escopo == "municipios":
+                filtrados[nome] = _selecionar_municipios(
+                    entrada, municipios_selecionados
+                )
+            else:
+                filtrados[nome] = filtrar_datasets_por_municipio(
+                    {nome: df}, municipios_selecionados
+                )[nome]
+    return dados, filtrados
+
+
+# --- PRÉ-CARGA DOS OUTROS MUNICÍPIOS PRINCIPAIS ---
+
+# O município principal é escolhido na barra lateral (ver src/navegacao.py) e
+# as tabelas de um único município têm uma entrada por município no
+# armazenamento. Ao abrir uma página, as dela são pré-carregadas em segundo
+# plano para os demais municípios principais (as próximas escolhas prováveis),
+# de modo que trocar o principal não espere a rede. As tabelas multi-município
+# já trazem todos os principais (municipios_carregados) e são compartilhadas.
+#
+# A pré-carga tem executor próprio, para não atrasar as revalidações, e no
+# máximo MAX_ENTRADAS_PRE_CARGA entradas pré-carregadas ainda não usadas: além
+# disso, as mais antigas saem do armazenamento. Uma entrada servida a uma
+# sessão deixa de contar e passa a ser tratada como as demais.
+PRE_CARGA_FOCOS_ATIVA = os.getenv("PRE_CARGA_FOCOS", "1") != "0"
+MAX_PRE_CARGAS_SIMULTANEAS = int(os.getenv("MAX_PRE_CARGAS_SIMULTANEAS", "2"))
+MAX_ENTRADAS_PRE_CARGA = int(os.getenv("MAX_ENTRADAS_PRE_CARGA", "48"))
+_EM_PRE_CARGA = set()
+_PRE_CARREGADAS = OrderedDict()
+_EXECUTOR_PRE_CARGA = ThreadPoolExecutor(
+    max_workers=MAX_PRE_CARGAS_SIMULTANEAS, thread_name_prefix="pre_carga"
+)
+
+
+def _marcar_servida(chave):
+    """Tira a chave da contagem da pré-carga ao ser servida a uma sessão."""
+    with _TRAVA_ENTRADAS:
+        _PRE_CARREGADAS.pop(chave, None)
+
+
+def _pre_carregar(chave, versao):
+    _SEGUNDO_PLANO.ativo = True
+    try:
+        with _TRAVA_ENTRADAS:
+            ja_carregada = chave in _ENTRADAS
+        _carregar_entrada(chave, versao)
+        with _TRAVA_ENTRADAS:
+            if ja_carregada or chave not in _ENTRADAS:
+                return
+            _PRE_CARREGADAS[chave] = None
+            while len(_PRE_CARREGADAS) > MAX_ENTRADAS_PRE_CARGA:
+                antiga, _ = _PRE_CARREGADAS.popitem(last=False)
+                _ENTRADAS.pop(antiga, None)
+    except Exception as e:
+        print(f"Erro ao pré-carregar {chave[0]} ({chave[1]}): {e}")
+    finally:
+        _SEGUNDO_PLANO.ativo = False
+        with _TRAVA_ENTRADAS:
+            _EM_PRE_CARGA.discard(chave)
+
+
+def pre_carregar_focos(nomes, municipio_foco=None):
+    """
+    Agenda, no executor da pré-carga, a carga dos datasets de `nomes` para os
+    municípios principais diferentes de `municipio_foco` que ainda não estão no
+    armazenamento. Só vale com o armazenamento em memória (CACHE_SWR).
+    """
+    if not (CACHE_SWR_ATIVO and PRE_CARGA_FOCOS_ATIVA and MAX_ENTRADAS_PRE_CARGA > 0):
+        return
+    foco = municipio_foco or municipio_de_interesse
+    projecoes = nomes if isinstance(nomes, dict) else dict.fromkeys(nomes)
+    for outro in municipios_principais:
+        if outro == foco:
+            continue
+        for nome, colunas in projecoes.items():
+            spec = DATASETS.get(nome)
+            if spec is None or spec.escopo != "municipio":
+                continue
+            chave = _chave_dataset(nome, colunas, outro)
+            with _TRAVA_ENTRADAS:
+                if chave in _ENTRADAS or chave in _EM_PRE_CARGA:
+                    continue
+                _EM_PRE_CARGA.add(chave)
+            _EXECUTOR_PRE_CARGA.submit(_pre_carregar, chave, versao_tabela(spec.tabela))
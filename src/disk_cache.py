@@ -0,0 +1,150 @@
+import hashlib
+import json
+import os
+import time
+import uuid
+
+import pyarrow as pa
+
+# --- CONFIGURAÇÃO DO CACHE EM DISCO ---
+
+# Segunda camada de cache, abaixo do armazenamento em memória: cada tabela
+# carregada do Supabase é gravada uma única vez num arquivo Arrow IPC (Feather v2,
+# sem compressão) e reaproveitada após reinícios e deploys. Os arquivos são lidos
+# por memory-map, então vários processos do Streamlit no mesmo host compartilham
+# uma única cópia física dos dados (o cache de páginas do sistema operacional).
+CACHE_DISCO_ATIVO = os.getenv("CACHE_DISCO", "1") != "0"
+DIRETORIO_CACHE_DISCO = os.getenv("CACHE_DISCO_DIR", os.path.join(".cache", "dados"))
+CACHE_DISCO_TTL = int(os.getenv("CACHE_DISCO_TTL", "172800"))  # 48 horas
+CACHE_DISCO_MAX_MB = int(os.getenv("CACHE_DISCO_MAX_MB", "512"))
+
+# Versão global: altere (ou defina VERSAO_DADOS) para invalidar todo o cache.
+# A versão de cada tabela (publicada em dados_versions) entra separadamente.
+VERSAO_DADOS = os.getenv("VERSAO_DADOS", "1")
+
+EXTENSAO = ".arrow"
+
+
+def chave_cache(tabela, filtros, colunas=None, versao=None):
+    """
+    Gera a chave do arquivo a partir da tabela, dos filtros, das colunas, da
+    versão da tabela e da versão global VERSAO_DADOS.
+    """
+    conteudo = json.dumps(
+        [tabela, filtros, colunas, versao, VERSAO_DADOS],
+        default=list,
+        ensure_ascii=False,
+    )
+    resumo = hashlib.sha256(conteudo.encode("utf-8")).hexdigest()[:32]
+    return f"{tabela}-{resumo}"
+
+
+def _caminho(chave):
+    return os.path.join(DIRETORIO_CACHE_DISCO, chave + EXTENSAO)
+
+
+def ler(chave, ttl=CACHE_DISCO_TTL):
+    """
+    Lê um DataFrame do cache em disco; devolve None se ausente, expirado ou ilegível.
+    Com ttl=None (entradas versionadas) a idade não é verificada e a leitura
+    renova a data de modificação, para que remover_excedentes só descarte
+    entradas que deixaram de ser usadas.
+    """
+    if not CACHE_DISCO_ATIVO:
+        return None
+
+    caminho = _caminho(chave)
+    try:
+        modificado = os.path.getmtime(caminho)
+    except OSError:
+        return None
+
+    agora = time.time()
+    if ttl is not None and agora - modificado > ttl:
+        _remover(caminho)
+        return None
+
+    try:
+        df = _ler_mapeado(caminho)
+        # Marca o último acesso (usado na remoção LRU) sem alterar a idade do arquivo
+        os.utime(caminho, (agora, agora if ttl is None else modificado))
+        return df
+    except Exception as e:
+        print(f"Cache em disco ilegível ({chave}): {e}")
+        _remover(caminho)
+        return None
+
+
+def gravar(chave, df):
+    """Grava um DataFrame no cache em disco de forma atômica e aplica o limite de tamanho."""
+    if not CACHE_DISCO_ATIVO or df is None or df.empty:
+        return
+
+    caminho = _caminho(chave)
+    temporario = f"{caminho}.{uuid.uuid4().hex}.tmp"
+    try:
+        os.makedirs(DIRETORIO_CACHE_DISCO, exist_ok=True)
+        tabela = pa.Table.from_pandas(df, preserve_index=False)
+        with pa.OSFile(temporario, "wb") as arquivo:
+            with pa.ipc.new_file(arquivo, tabela.schema) as escritor:
+                escritor.write_table(tabela)
+        # A substituição atômica evita que outro processo leia um arquivo parcial;
+        # quem já mapeou a versão anterior continua lendo-a até soltá-la.
+        os.replace(temporario, caminho)
+    except Exception as e:
+        print(f"Falha ao gravar cache em disco ({chave}): {e}")
+        _remover(temporario)
+        return
+
+    remover_excedentes()
+
+
+def _ler_mapeado(caminho):
+    """
+    Lê o arquivo por memory-map. Colunas numéricas sem nulos viram arrays NumPy
+    apontando direto para o mapeamento (somente leitura), sem cópia na heap.
+    """
+    with pa.memory_map(caminho, "r") as origem:
+        tabela = pa.ipc.open_file(origem).read_all()
+    return tabela.to_pandas(split_blocks=True)
+
+
+def remover_excedentes(max_mb=CACHE_DISCO_MAX_MB, ttl=CACHE_DISCO_TTL):
+    """
+    Remove arquivos expirados e, se o diretório ainda passar de max_mb,
+    os menos acessados recentemente até voltar ao limite.
+    """
+    try:
+        nomes = os.listdir(DIRETORIO_CACHE_DISCO)
+    except OSError:
+        return
+
+    agora = time.time()
+    arquivos = []
+    for nome in nomes:
+        if not nome.endswith(EXTENSAO):
+            continue
+        caminho = os.path.join(DIRETORIO_CACHE_DISCO, nome)
+        try:
+            info = os.stat(caminho)
+        except OSError:
+            continue
+        if ttl is not None and agora - info.st_mtime > ttl:
+            _remover(caminho)
+            continue
+        arquivos.append((info.st_atime, info.st_size, caminho))
+
+    limite = max_mb * 1024 * 1024
+    total = sum(tamanho for _, tamanho, _ in arquivos)
+    for _, tamanho, caminho in sorted(arquivos):
+        if total <= limite:
+            break
+        _remover(caminho)
+        total -= tamanho
+
+
+def _remover(caminho):
+    try:
+        os.remove(caminho)
+    except OSError:
+        pass
@@ -0,0 +1,177 @@
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import httpx
+from postgrest.exceptions import APIError
+
+# --- REQUISIÇÕES COM HEDGE E RETENTATIVAS ---
+
+# Cada janela lida do Supabase roda como uma tentativa principal. Se ela passar
+# do limiar de latência da tabela (o p95 observado, o orçamento declarado no
+# registro ou HEDGE_ATRASO_PADRAO), uma requisição duplicada é disparada e vale
+# a primeira resposta. Falhas transitórias (rede, timeout, 429/5xx) são repetidas
+# com backoff exponencial. Todas as tentativas ficam em REGISTRO_TENTATIVAS.
+#
+# O limiar conta a partir do início da execução da principal, não de quando foi
+# enfileirada: com várias páginas e janelas em paralelo, uma principal parada
+# na fila não é lenta, e duplicá-la só aumentaria a fila. As duplicadas rodam
+# num pool próprio (HEDGE_MAX_DUPLICADAS), para não esperar atrás das principais.
+HEDGE_ATIVO = os.getenv("HEDGE", "1") != "0"
+HEDGE_ATRASO_PADRAO = float(os.getenv("HEDGE_ATRASO_PADRAO", "2.0"))
+HEDGE_ATRASO_MINIMO = float(os.getenv("HEDGE_ATRASO_MINIMO", "0.5"))
+HEDGE_AMOSTRAS_MINIMAS = 20
+MAX_TENTATIVAS = int(os.getenv("MAX_TENTATIVAS", "3"))
+BACKOFF_BASE = float(os.getenv("BACKOFF_BASE", "0.5"))
+BACKOFF_MAXIMO = 8.0
+STATUS_TRANSITORIOS = {408, 425, 429, 500, 502, 503, 504}
+# Códigos de erro do PostgREST que ele responde com 503 (sem conexão com o banco
+# ou cache de schema indisponível) e o statement timeout do Postgres (500)
+CODIGOS_POSTGREST_TRANSITORIOS = {"PGRST000", "PGRST001", "PGRST002", "57014"}
+
+# Latências recentes (em segundos) das respostas vencedoras de cada tabela
+LATENCIAS = {}
+# Todas as tentativas: tabela, janela, rodada, tipo, duração e resultado
+REGISTRO_TENTATIVAS = deque(maxlen=2000)
+
+_trava = threading.Lock()
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("HEDGE_MAX_THREADS", "32")),
+    thread_name_prefix="requisicao",
+)
+_executor_duplicadas = ThreadPoolExecutor(
+    max_workers=int(os.getenv("HEDGE_MAX_DUPLICADAS", "8")),
+    thread_name_prefix="requisicao_duplicada",
+)
+
+
+def erro_transitorio(erro):
+    """Indica se vale repetir a requisição (falha de rede, timeout, 429 ou 5xx)."""
+    if isinstance(erro, httpx.HTTPStatusError):
+        return erro.response.status_code in STATUS_TRANSITORIOS
+    if isinstance(erro, APIError):
+        # Sem corpo JSON na resposta, o postgrest põe o status HTTP em `code`
+        codigo = str(erro.code)
+        if codigo.isdigit():
+            return int(codigo) in STATUS_TRANSITORIOS
+        return codigo in CODIGOS_POSTGREST_TRANSITORIOS
+    return isinstance(erro, (httpx.TransportError, ConnectionError, TimeoutError))
+
+
+def percentil_latencia(tabela, percentil=0.95):
+    """Percentil das latências recentes da tabela; None sem amostras suficientes."""
+    with _trava:
+        amostras = sorted(LATENCIAS.get(tabela, ()))
+    if len(amostras) < HEDGE_AMOSTRAS_MINIMAS:
+        return None
+    return amostras[min(int(len(amostras) * percentil), len(amostras) - 1)]
+
+
+def atraso_hedge(tabela, orcamento=None):
+    """Tempo de espera pela tentativa principal antes de disparar a duplicada."""
+    p95 = percentil_latencia(tabela)
+    if p95 is not None:
+        return max(p95, HEDGE_ATRASO_MINIMO)
+    return orcamento if orcamento is not None else HEDGE_ATRASO_PADRAO
+
+
+def _registrar(tabela, janela, rodada, tipo, duracao, resultado):
+    REGISTRO_TENTATIVAS.append(
+        {
+            "tabela": tabela,
+            "janela": janela,
+            "rodada": rodada,
+            "tipo": tipo,
+            "duracao": round(duracao, 4),
+            "resultado": resultado,
+            "horario": time.time(),
+        }
+    )
+
+
+def _tentativa(funcao, iniciada=None):
+    """Executa `funcao`; `iniciada` (lista vazia) recebe o horário de início."""
+    inicio = time.perf_counter()
+    if iniciada is not None:
+        iniciada.append(inicio)
+    try:
+        return funcao(), None, time.perf_counter() - inicio
+    except Exception as e:
+        return None, e, time.perf_counter() - inicio
+
+
+def executar_com_hedge(tabela, janela, funcao, orcamento=None):
+    """
+    Executa `funcao` (uma requisição completa, sem argumentos) com hedge e
+    retentativas. `janela` identifica a requisição no registro (ex.: o offset);
+    `orcamento` é o limiar de latência declarado para a tabela, em segundos.
+    """
+    if not HEDGE_ATIVO:
+        return funcao()
+
+    ultimo_erro = None
+    for rodada in range(1, MAX_TENTATIVAS + 1):
+        if rodada > 1:
+            espera = min(BACKOFF_BASE * 2 ** (rodada - 2), BACKOFF_MAXIMO)
+            time.sleep(espera * random.uniform(0.5, 1.0))
+
+        iniciada = []
+        tipos = {_executor.submit(_tentativa, funcao, iniciada): "principal"}
+        pendentes = set(tipos)
+        hedge_disparado = False
+        limite = atraso_hedge(tabela, orcamento)
+
+        while pendentes:
+            if hedge_disparado:
+                timeout = None
+            elif iniciada:
+                timeout = max(limite - (time.perf_counter() - iniciada[0]), 0)
+            else:
+                # Principal ainda na fila: espera ela começar, sem duplicar
+                timeout = min(limite, 0.05)
+            prontos, pendentes = wait(pendentes, timeout, return_when=FIRST_COMPLETED)
+            if not prontos:
+                if not iniciada or time.perf_counter() - iniciada[0] < limite:
+                    continue
+                # A principal passou do limiar desde que começou: dispara a duplicada
+                hedge = _executor_duplicadas.submit(_tentativa, funcao)
+                tipos[hedge] = "hedge"
+                pendentes.add(hedge)
+                hedge_disparado = True
+                continue
+
+            # Se a principal e a duplicada terminarem juntas, o sucesso tem prioridade
+            for futuro in sorted(prontos, key=lambda f: f.result()[1] is not None):
+                resultado, erro, duracao = futuro.result()
+                if erro is None:
+                    _registrar(tabela, janela, rodada, tipos[futuro], duracao, "ok")
+                    with _trava:
+                        LATENCIAS.setdefault(tabela, deque(maxlen=200)).append(duracao)
+                    for perdedor in pendentes:
+                        perdedor.add_done_callback(
+                            lambda f, tipo=tipos[perdedor]: _registrar_descartada(
+                                tabela, janela, rodada, tipo, f
+                            )
+                        )
+                    return resultado
+                _registrar(
+                    tabela, janela, rodada, tipos[futuro], duracao, f"erro: {erro}"
+                )
+                ultimo_erro = erro
+                if not erro_transitorio(erro):
+                    raise erro
+
+        print(
+            f"Falha transitória em {tabela} (janela {janela}, rodada {rodada}): "
+            f"{ultimo_erro}"
+        )
+
+    raise ultimo_erro
+
+
+def _registrar_descartada(tabela, janela, rodada, tipo, futuro):
+    _, erro, duracao = futuro.result()
+    resultado = "descartada" if erro is None else f"descartada (erro: {erro})"
+    _registrar(tabela, janela, rodada, tipo, duracao, resultado)
@@ -0,0 +1,95 @@
+import json
+import os
+import threading
+import time
+from collections import Counter, deque
+import pandas as pd
+
+# --- INSTRUMENTAÇÃO DO CARREGAMENTO DE DADOS ---
+
+# Cada carga de tabela feita pelo data_loader (isto é, cada falha do cache em
+# memória) gera um evento com a origem (disco, rede ou base local), os tempos,
+# o volume transferido, as linhas e o tamanho do DataFrame resultante. Os eventos
+# são impressos como uma linha JSON (LOG_CARGAS), opcionalmente gravados num
+# arquivo JSONL (LOG_CARGAS_ARQUIVO) e ficam disponíveis para o painel de
+# diagnóstico. Os acessos contam todas as chamadas, inclusive acertos de cache.
+LOG_CARGAS_ATIVO = os.getenv("LOG_CARGAS", "1") != "0"
+LOG_CARGAS_ARQUIVO = os.getenv("LOG_CARGAS_ARQUIVO")
+
+EVENTOS_CARGA = deque(maxlen=2000)
+ACESSOS = Counter()
+
+_trava = threading.Lock()
+
+
+def registrar_acesso(dataset):
+    """Conta um pedido do dataset, atendido ou não pelo cache em memória."""
+    with _trava:
+        ACESSOS[dataset] += 1
+
+
+def registrar_carga(medicao):
+    """Registra uma carga (dicionário de medidas) e a emite no log estruturado."""
+    evento = {"evento": "carga", "horario": round(time.time(), 3), **medicao}
+    with _trava:
+        EVENTOS_CARGA.append(evento)
+    if not (LOG_CARGAS_ATIVO or LOG_CARGAS_ARQUIVO):
+        return
+
+    linha = json.dumps(evento, ensure_ascii=False, default=str)
+    if LOG_CARGAS_ATIVO:
+        # Sob a trava, para que as linhas de threads diferentes não se misturem
+        with _trava:
+            print(linha, flush=True)
+    if LOG_CARGAS_ARQUIVO:
+        try:
+            with _trava, open(LOG_CARGAS_ARQUIVO, "a", encoding="utf-8") as arquivo:
+                arquivo.write(linha + "\n")
+        except OSError as e:
+            print(f"Falha ao gravar o log de cargas: {e}")
+
+
+def eventos_recentes(n=200):
+    """As `n` cargas mais recentes, da mais nova para a mais antiga."""
+    with _trava:
+        eventos = list(EVENTOS_CARGA)[-n:]
+    return pd.DataFrame(eventos[::-1])
+
+
+def resumo_por_dataset():
+    """
+    Agrega as cargas por dataset: acessos, cargas e taxa de acerto do cache em
+    memória, cargas por origem, tempos médio e máximo, volume transferido,
+    tempo de decodificação, linhas e tamanho em memória da última carga.
+    """
+    with _trava:
+        eventos = pd.DataFrame(list(EVENTOS_CARGA))
+        acessos = pd.Series(dict(ACESSOS), name="acessos", dtype="int64")
+
+    if eventos.empty:
+        return acessos.rename_axis("dataset").reset_index()
+
+    for coluna in ("bytes_rede", "decodificacao_s"):
+        if coluna not in eventos.columns:
+            eventos[coluna] = None
+    agrupado = eventos.groupby("dataset")
+    resumo = pd.DataFrame(
+        {
+            "cargas": agrupado.size(),
+            "disco": agrupado["origem"].agg(lambda o: (o == "disco").sum()),
+            "rede": agrupado["origem"].agg(lambda o: (o == "rede").sum()),
+            "duracao_media_s": agrupado["duracao_s"].mean().round(3),
+            "duracao_max_s": agrupado["duracao_s"].max().round(3),
+            "bytes_rede": agrupado["bytes_rede"].sum(min_count=1),
+            "decodificacao_s": agrupado["decodificacao_s"].sum(min_count=1).round(3),
+            "linhas": agrupado["linhas"].last(),
+            "bytes_memoria": agrupado["bytes_memoria"].last(),
+        }
+    )
+    resumo = resumo.join(acessos, how="outer")
+    resumo["taxa_acerto"] = (1 - resumo["cargas"] / resumo["acessos"]).round(3)
+    return (
+        resumo.rename_axis("dataset")
+        .reset_index()
+        .sort_values("duracao_max_s", ascending=False)
+    )
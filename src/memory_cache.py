@@ -0,0 +1,282 @@
+import copy
+import datetime
+import decimal
+import functools
+import hashlib
+import os
+import pickle
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+from src import profiling
+
+# --- CACHE DE PREPARO COM ORÇAMENTO DE MEMÓRIA ---
+
+# As funções de preparo das páginas (pivôs, tabelas formatadas, figuras) são
+# chamadas com as seleções de cada usuário, então o número de combinações em
+# cache cresce sem limite com o tráfego. Este cache substitui o st.cache_data
+# nessas funções: todas as entradas dividem um único orçamento em bytes
+# (CACHE_MEMORIA_MAX_MB) e, ao estourá-lo, as menos usadas recentemente são
+# descartadas, qualquer que seja a função de origem.
+#
+# Os datasets carregados (armazenamento do data_loader, com CACHE_SWR) ficam
+# fora deste orçamento: são limitados pelo registro de tabelas e pelos
+# municípios principais, não pelo tráfego (o filtro global guarda só o índice
+# de posições por município, não os subconjuntos de cada seleção), e aparecem
+# à parte no painel de memória (data_loader.tamanhos_datasets).
+CACHE_MEMORIA_MAX_MB = int(os.getenv("CACHE_MEMORIA_MAX_MB", "256"))
+
+
+@dataclass
+class EntradaMemoria:
+    valor: object
+    funcao: str
+    tamanho: int
+    criado_em: float
+    acessos: int = 0
+
+
+@dataclass
+class EstatisticasFuncao:
+    acertos: int = 0
+    falhas: int = 0
+    descartes: int = 0
+    sem_cache: int = 0
+
+
+class ArgumentoNaoHasheavel(TypeError):
+    """Argumento sem representação estável para a chave do cache."""
+
+
+# Tipos cujo repr identifica o valor por completo
+_TIPOS_REPR = (
+    type(None),
+    bool,
+    int,
+    float,
+    complex,
+    str,
+    bytes,
+    decimal.Decimal,
+    datetime.date,
+    datetime.time,
+    datetime.timedelta,
+    np.generic,
+    pd.Timestamp,
+    pd.Timedelta,
+    pd.Period,
+)
+
+
+_ENTRADAS = OrderedDict()
+_ESTATISTICAS = {}
+_trava = threading.Lock()
+_total_bytes = 0
+
+
+def _atualizar_resumo(resumo, valor):
+    """
+    Acumula no hash o conteúdo de um argumento (DataFrames, Series, Index e
+    arrays do numpy pelo conteúdo). Levanta ArgumentoNaoHasheavel para tipos
+    sem representação estável, cujo repr pode coincidir para valores diferentes.
+    """
+    if isinstance(valor, (pd.DataFrame, pd.Series)):
+        if isinstance(valor, pd.DataFrame):
+            resumo.update(repr(list(valor.columns)).encode())
+            resumo.update(repr(list(valor.dtypes)).encode())
+        else:
+            resumo.update(repr((valor.name, valor.dtype)).encode())
+        try:
+            hashes = pd.util.hash_pandas_object(valor, index=True).values
+            resumo.update(hashes.tobytes())
+        except TypeError:
+            # Células não hasheáveis pelo pandas (ex.: listas)
+            resumo.update(pickle.dumps(valor, protocol=pickle.HIGHEST_PROTOCOL))
+    elif isinstance(valor, pd.Index):
+        resumo.update(repr((type(valor).__name__, valor.name, valor.dtype)).encode())
+        try:
+            resumo.update(pd.util.hash_pandas_object(valor).values.tobytes())
+        except TypeError as e:
+            raise ArgumentoNaoHasheavel(type(valor).__name__) from e
+    elif isinstance(valor, np.ndarray):
+        resumo.update(repr((valor.dtype, valor.shape)).encode())
+        if valor.dtype.hasobject:
+            try:
+                resumo.update(pd.util.hash_array(valor.ravel()).tobytes())
+            except TypeError as e:
+                raise ArgumentoNaoHasheavel("ndarray") from e
+        else:
+            resumo.update(np.ascontiguousarray(valor).tobytes())
+    elif isinstance(valor, (list, tuple)):
+        resumo.update(f"{type(valor).__name__}{len(valor)}".encode())
+        for item in valor:
+            _atualizar_resumo(resumo, item)
+    elif isinstance(valor, (set, frozenset)):
+        # A ordem de iteração de um conjunto não é estável: ordena os resumos
+        resumo.update(f"{type(valor).__name__}{len(valor)}".encode())
+        for digest in sorted(_resumo_item(item) for item in valor):
+            resumo.update(digest)
+    elif isinstance(valor, dict):
+        resumo.update(f"dict{len(valor)}".encode())
+        for chave, item in valor.items():
+            _atualizar_resumo(resumo, chave)
+            _atualizar_resumo(resumo, item)
+    elif isinstance(valor, _TIPOS_REPR):
+        resumo.update(f"{type(valor).__name__}:{valor!r}".encode())
+    else:
+        raise ArgumentoNaoHasheavel(type(valor).__name__)
+    resumo.update(b"|")
+
+
+def _resumo_item(valor):
+    resumo = hashlib.sha256()
+    _atualizar_resumo(resumo, valor)
+    return resumo.digest()
+
+
+def tamanho_em_bytes(valor):
+    """Tamanho aproximado do valor em memória (DataFrames com memory_usage)."""
+    if isinstance(valor, pd.DataFrame):
+        return int(valor.memory_usage(index=True, deep=True).sum())
+    if isinstance(valor, pd.Series):
+        return int(valor.memory_usage(index=True, deep=True))
+    if isinstance(valor, (bytes, bytearray, str)):
+        return len(valor)
+    if isinstance(valor, (list, tuple)):
+        return sum(tamanho_em_bytes(item) for item in valor)
+    try:
+        return len(pickle.dumps(valor, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(valor)
+
+
+def _copia(valor):
+    """
+    Cópia entregue a cada chamada, para que alterações feitas por uma sessão não
+    cheguem às outras (os resultados de preparo são pequenos, a cópia é barata).
+    """
+    if isinstance(valor, (pd.DataFrame, pd.Series)):
+        return valor.copy()
+    if isinstance(valor, tuple):
+        return tuple(_copia(item) for item in valor)
+    if valor is None or isinstance(valor, (bytes, str, int, float, bool)):
+        return valor
+    return copy.deepcopy(valor)
+
+
+def _armazenar(chave, entrada, max_bytes):
+    global _total_bytes
+    with _trava:
+        anterior = _ENTRADAS.pop(chave, None)
+        if anterior is not None:
+            _total_bytes -= anterior.tamanho
+        _ENTRADAS[chave] = entrada
+        _total_bytes += entrada.tamanho
+        while _total_bytes > max_bytes and _ENTRADAS:
+            _, descartada = _ENTRADAS.popitem(last=False)
+            _total_bytes -= descartada.tamanho
+            _ESTATISTICAS[descartada.funcao].descartes += 1
+
+
+def cache_memoria(funcao):
+    """Decorador: guarda o resultado de `funcao` no cache com orçamento de memória."""
+    nome = f"{funcao.__module__}.{funcao.__qualname__}"
+    _ESTATISTICAS.setdefault(nome, EstatisticasFuncao())
+
+    @functools.wraps(funcao)
+    def envoltorio(*args, **kwargs):
+        inicio = time.perf_counter()
+        resumo = hashlib.sha256(nome.encode())
+        try:
+            _atualizar_resumo(resumo, args)
+            _atualizar_resumo(resumo, sorted(kwargs.items()))
+        except ArgumentoNaoHasheavel:
+            # Sem chave confiável, executa sem cache em vez de arriscar devolver
+            # o resultado de outros argumentos
+            with _trava:
+                _ESTATISTICAS[nome].sem_cache += 1
+            return funcao(*args, **kwargs)
+        chave = resumo.hexdigest()
+
+        with _trava:
+            entrada = _ENTRADAS.get(chave)
+            if entrada is not None:
+                _ENTRADAS.move_to_end(chave)
+                entrada.acessos += 1
+                _ESTATISTICAS[nome].acertos += 1
+            else:
+                _ESTATISTICAS[nome].falhas += 1
+        if entrada is not None:
+            valor = _copia(entrada.valor)
+            profiling.registrar_cache(nome, True, time.perf_counter() - inicio)
+            return valor
+
+        valor = funcao(*args, **kwargs)
+        max_bytes = CACHE_MEMORIA_MAX_MB * 1024 * 1024
+        tamanho = tamanho_em_bytes(valor)
+        if tamanho <= max_bytes:
+            _armazenar(
+                chave, EntradaMemoria(valor, nome, tamanho, time.time()), max_bytes
+            )
+        valor = _copia(valor)
+        profiling.registrar_cache(nome, False, time.perf_counter() - inicio)
+        return valor
+
+    return envoltorio
+
+
+def limpar():
+    """Esvazia o cache de preparo (as estatísticas são mantidas)."""
+    global _total_bytes
+    with _trava:
+        _ENTRADAS.clear()
+        _total_bytes = 0
+
+
+def resumo_por_funcao():
+    """DataFrame com entradas, bytes e acertos/falhas/descartes de cada função."""
+    with _trava:
+        entradas = list(_ENTRADAS.values())
+        estatisticas = {nome: vars(e).copy() for nome, e in _ESTATISTICAS.items()}
+
+    linhas = {
+        nome: {"entradas": 0, "bytes": 0, **e} for nome, e in estatisticas.items()
+    }
+    for entrada in entradas:
+        linhas[entrada.funcao]["entradas"] += 1
+        linhas[entrada.funcao]["bytes"] += entrada.tamanho
+    return (
+        pd.DataFrame.from_dict(linhas, orient="index")
+        .rename_axis("funcao")
+        .reset_index()
+        .sort_values("bytes", ascending=False)
+    )
+
+
+def maiores_entradas(n=20):
+    """As `n` maiores entradas do cache, com a função de origem e os acessos."""
+    with _trava:
+        entradas = list(_ENTRADAS.values())
+    entradas.sort(key=lambda e: e.tamanho, reverse=True)
+    return pd.DataFrame(
+        [
+            {
+                "funcao": e.funcao,
+                "bytes": e.tamanho,
+                "acessos": e.acessos,
+                "idade_s": round(time.time() - e.criado_em),
+            }
+            for e in entradas[:n]
+        ],
+        columns=["funcao", "bytes", "acessos", "idade_s"],
+    )
+
+
+def uso_total():
+    """(bytes em uso, orçamento em bytes, número de entradas)."""
+    with _trava:
+        return _total_bytes, CACHE_MEMORIA_MAX_MB * 1024 * 1024, len(_ENTRADAS)
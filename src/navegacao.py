@@ -0,0 +1,91 @@
+import streamlit as st
+from datetime import datetime
+from src.config import municipio_de_interesse, municipios_de_interesse
+
+# --- NAVEGAÇÃO ENTRE PÁGINAS ---
+
+# O app.py é o ponto de entrada: monta a barra lateral (filtros globais e menu) e
+# executa apenas o script da página atual (pasta paginas/), que carrega os
+# próprios dados e importa a própria view. Cada página é registrada aqui com o
+# título exibido no menu, o script e o ícone.
+PAGINAS = {
+    "Início": ("paginas/inicio.py", "house-door-fill"),
+    "Emprego": ("paginas/emprego.py", "briefcase-fill"),
+    "Empresas": ("paginas/empresas.py", "building-fill"),
+    "Comércio Exterior": ("paginas/comercio_exterior.py", "globe2"),
+    "Segurança": ("paginas/seguranca.py", "shield-shaded"),
+    "Assistência Social": ("paginas/assistencia_social.py", "people-fill"),
+    "Educação": ("paginas/educacao.py", "mortarboard-fill"),
+    "Saúde": ("paginas/saude.py", "heart-pulse-fill"),
+    "PIB": ("paginas/pib.py", "graph-up"),
+    "Demografia": ("paginas/demografia.py", "person-lines-fill"),
+    "Finanças": ("paginas/financas.py", "piggy-bank-fill"),
+    "Dados": ("paginas/dados.py", "download"),
+}
+
+# Chaves do seletor do município principal e do multiselect de comparação
+# (barra lateral) e do pedido de troca de página feito pelo menu ou pelos
+# botões da página inicial
+CHAVE_MUNICIPIO_FOCO = "municipio_foco"
+CHAVE_MUNICIPIOS_COMPARADOS = "municipios_comparados"
+CHAVE_PAGINA_DESTINO = "pagina_destino"
+
+
+def ir_para_pagina(titulo):
+    """Pede a troca para a página `titulo`, feita pelo app.py na próxima execução."""
+    st.session_state[CHAVE_PAGINA_DESTINO] = titulo
+
+
+def municipio_foco():
+    """O município principal escolhido na barra lateral."""
+    return st.session_state.get(CHAVE_MUNICIPIO_FOCO, municipio_de_interesse)
+
+
+def municipios_comparaveis(foco):
+    """Municípios oferecidos para comparação com o principal `foco`."""
+    return [m for m in municipios_de_interesse if m != foco]
+
+
+def municipios_selecionados():
+    """O município principal seguido dos escolhidos para comparação."""
+    foco = municipio_foco()
+    comparados = st.session_state.get(CHAVE_MUNICIPIOS_COMPARADOS)
+    if comparados is None:
+        comparados = municipios_comparaveis(foco)
+    return [foco] + [m for m in comparados if m != foco]
+
+
+def carregar_dados_pagina(
+    titulo, mensagem="Carregando os dados da página... Por favor, aguarde."
+):
+    """
+    Carrega os datasets da página `titulo` (DATASETS_POR_PAGINA) para o
+    município principal e devolve (dados, filtrados), com o filtro global de
+    municípios aplicado na camada de dados. Agenda a pré-carga dos mesmos
+    datasets para os outros municípios principais e mostra na barra lateral o
+    horário da carga mais antiga entre eles.
+    """
+    # O data_loader (supabase, pyarrow, cache em disco) só é importado ao abrir
+    # a primeira página, fora do quadro de entrada (ver medir_importacao.py)
+    from src.data_loader import (
+        DATASETS_POR_PAGINA,
+        carregar_datasets_por_municipio,
+        pre_carregar_focos,
+        ultimas_atualizacoes,
+    )
+
+    foco = municipio_foco()
+    with st.spinner(mensagem):
+        dados, filtrados = carregar_datasets_por_municipio(
+            DATASETS_POR_PAGINA[titulo], municipios_selecionados(), foco
+        )
+    pre_carregar_focos(DATASETS_POR_PAGINA[titulo], foco)
+
+    atualizacoes = ultimas_atualizacoes()
+    horarios = [atualizacoes[n] for n in dados if n in atualizacoes]
+    if horarios:
+        st.sidebar.caption(
+            "Dados atualizados em "
+            f"{datetime.fromtimestamp(min(horarios)).strftime('%d/%m/%Y %H:%M')}"
+        )
+    return dados, filtrados
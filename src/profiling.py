@@ -0,0 +1,159 @@
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+# --- PERFIL DAS EXECUÇÕES DO SCRIPT (OPT-IN) ---
+
+# Com o perfil ligado (PERFIL=1 no ambiente, ou ?perfil=1 na URL), cada
+# execução do app.main mede o tempo das fases (carga dos datasets, filtro
+# global de municípios, preparo nas funções com cache_memoria, construção das
+# figuras do Plotly e envio dos gráficos ao navegador), de cada seção display_*
+# e o tamanho de cada gráfico emitido. O resultado vai para a barra lateral e
+# para o log estruturado (uma linha JSON, como as cargas da instrumentação).
+# Desligado, as medições não fazem nada além de checar se há perfil ativo.
+PERFIL_ATIVO = os.getenv("PERFIL", "0") == "1"
+PERFIL_ARQUIVO = os.getenv("PERFIL_ARQUIVO")
+
+
+@dataclass
+class PerfilExecucao:
+    pagina: str
+    inicio: float = field(default_factory=time.perf_counter)
+    total_s: float = 0.0
+    fases: dict = field(default_factory=dict)
+    secoes: list = field(default_factory=list)
+    caches: dict = field(default_factory=dict)
+    graficos: list = field(default_factory=list)
+    pilha_secoes: list = field(default_factory=list)
+
+
+# Um perfil por thread: cada sessão do Streamlit executa o script na própria
+_local = threading.local()
+_trava = threading.Lock()
+
+
+def perfil_atual():
+    """O perfil da execução em andamento nesta thread, ou None."""
+    return getattr(_local, "perfil", None)
+
+
+def iniciar(pagina):
+    """Abre o perfil de uma execução do script."""
+    _local.perfil = PerfilExecucao(pagina)
+    return _local.perfil
+
+
+def finalizar():
+    """Fecha o perfil em andamento, emite a linha JSON e o devolve."""
+    perfil = perfil_atual()
+    if perfil is None:
+        return None
+    _local.perfil = None
+    perfil.total_s = time.perf_counter() - perfil.inicio
+
+    evento = {
+        "evento": "perfil",
+        "horario": round(time.time(), 3),
+        "pagina": perfil.pagina,
+        "total_s": round(perfil.total_s, 4),
+        "fases": {nome: round(s, 4) for nome, s in perfil.fases.items()},
+        "secoes": perfil.secoes,
+        "caches": perfil.caches,
+        "graficos": perfil.graficos,
+    }
+    linha = json.dumps(evento, ensure_ascii=False, default=str)
+    with _trava:
+        print(linha, flush=True)
+    if PERFIL_ARQUIVO:
+        try:
+            with _trava, open(PERFIL_ARQUIVO, "a", encoding="utf-8") as arquivo:
+                arquivo.write(linha + "\n")
+        except OSError as e:
+            print(f"Falha ao gravar o log de perfil: {e}")
+    return perfil
+
+
+@contextmanager
+def fase(nome):
+    """Acumula no perfil em andamento o tempo gasto no bloco, na fase `nome`."""
+    perfil = perfil_atual()
+    if perfil is None:
+        yield
+        return
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        perfil.fases[nome] = perfil.fases.get(nome, 0.0) + (
+            time.perf_counter() - inicio
+        )
+
+
+def medir_fase(nome):
+    """Decorador: acumula o tempo das chamadas de uma função na fase `nome`."""
+
+    def decorador(funcao):
+        @functools.wraps(funcao)
+        def envoltorio(*args, **kwargs):
+            with fase(nome):
+                return funcao(*args, **kwargs)
+
+        return envoltorio
+
+    return decorador
+
+
+def medir_secao(funcao):
+    """Decorador: mede o tempo de uma seção display_* da página."""
+
+    @functools.wraps(funcao)
+    def envoltorio(*args, **kwargs):
+        perfil = perfil_atual()
+        if perfil is None:
+            return funcao(*args, **kwargs)
+        perfil.pilha_secoes.append(funcao.__name__)
+        inicio = time.perf_counter()
+        try:
+            return funcao(*args, **kwargs)
+        finally:
+            perfil.pilha_secoes.pop()
+            perfil.secoes.append(
+                {
+                    "secao": funcao.__name__,
+                    "modulo": funcao.__module__.rsplit(".", 1)[-1],
+                    "duracao_s": round(time.perf_counter() - inicio, 4),
+                }
+            )
+
+    return envoltorio
+
+
+def registrar_cache(funcao, acerto, duracao):
+    """Conta um acerto ou falha do cache de preparo na execução em andamento."""
+    perfil = perfil_atual()
+    if perfil is None:
+        return
+    contagem = perfil.caches.setdefault(
+        funcao, {"acertos": 0, "falhas": 0, "duracao_s": 0.0}
+    )
+    contagem["acertos" if acerto else "falhas"] += 1
+    contagem["duracao_s"] = round(contagem["duracao_s"] + duracao, 4)
+    perfil.fases["preparo"] = perfil.fases.get("preparo", 0.0) + duracao
+
+
+def registrar_grafico(tamanho, duracao):
+    """Registra um gráfico enviado ao navegador: bytes do JSON e tempo de envio."""
+    perfil = perfil_atual()
+    if perfil is None:
+        return
+    perfil.graficos.append(
+        {
+            "secao": perfil.pilha_secoes[-1] if perfil.pilha_secoes else None,
+            "bytes": tamanho,
+            "duracao_s": round(duracao, 4),
+        }
+    )
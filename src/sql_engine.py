@@ -0,0 +1,148 @@
+import importlib.util
+import os
+import threading
+import pandas as pd
+
+# --- MOTOR SQL (DUCKDB) PARA AGREGAÇÕES DAS PÁGINAS ---
+
+# As agregações das páginas (somas por ano/mês e município, tabelas do comex)
+# rodam no DuckDB em memória: o DataFrame carregado é registrado como view sem
+# cópia e a consulta é executada de forma vetorizada, sem os DataFrames
+# intermediários do pandas (assign de datas, groupby + cumsum). Só o resultado
+# agregado, pequeno, volta para o pandas para ser pivotado.
+MOTOR_SQL_ATIVO = os.getenv("MOTOR_SQL", "1") != "0"
+
+# O duckdb só é importado na primeira consulta, para não pesar no início do app
+DUCKDB_DISPONIVEL = importlib.util.find_spec("duckdb") is not None
+
+_conexao = None
+_trava = threading.Lock()
+
+
+def motor_sql_disponivel():
+    """Indica se as agregações devem ser feitas no DuckDB."""
+    return MOTOR_SQL_ATIVO and DUCKDB_DISPONIVEL
+
+
+def _identificador(nome):
+    return '"' + nome.replace('"', '""') + '"'
+
+
+def _cursor():
+    """Cursor próprio da thread sobre uma conexão DuckDB em memória compartilhada."""
+    global _conexao
+    with _trava:
+        if _conexao is None:
+            import duckdb
+
+            _conexao = duckdb.connect(":memory:")
+        return _conexao.cursor()
+
+
+def consultar(df, sql, parametros=None):
+    """Executa `sql` com o DataFrame registrado (sem cópia) como a view `dados`."""
+    cursor = _cursor()
+    try:
+        cursor.register("dados", df)
+        return cursor.execute(sql, parametros or []).df()
+    finally:
+        cursor.close()
+
+
+def somar_pivotado(
+    df, valores, indice="ano", colunas="municipio", ate_ano=None, ate_mes=None, escala=1
+):
+    """
+    Soma `valores` por `indice` ("ano", ou "date" para o mês a partir de ano/mes)
+    e `colunas`, devolvendo o DataFrame pivotado (colunas nas colunas, zeros onde
+    não há dado). `ate_ano`/`ate_mes` limitam as linhas (ano <= / mes <=) e
+    `escala` divide os valores antes da soma.
+    """
+    expressao_indice = (
+        "make_date(CAST(ano AS INTEGER), CAST(mes AS INTEGER), 1)"
+        if indice == "date"
+        else _identificador(indice)
+    )
+    condicoes, parametros = [], []
+    if ate_ano is not None:
+        condicoes.append("ano <= ?")
+        parametros.append(int(ate_ano))
+    if ate_mes is not None:
+        condicoes.append("mes <= ?")
+        parametros.append(int(ate_mes))
+
+    valor = _identificador(valores)
+    if escala != 1:
+        valor = f"{valor} / {float(escala)}"
+    # Soma inteira fica inteira, como no pivot_table do pandas; com escala, os
+    # valores já foram divididos e a soma é decimal
+    tipo_soma = (
+        "BIGINT"
+        if escala == 1 and pd.api.types.is_integer_dtype(df[valores])
+        else "DOUBLE"
+    )
+
+    # A coluna do pivô volta com o tipo original (categoria, texto ou número),
+    # para que os rótulos das colunas sejam os mesmos do pivot_table
+    sql = (
+        f"SELECT {expressao_indice} AS indice, "
+        f"{_identificador(colunas)} AS coluna, "
+        f"CAST(COALESCE(SUM({valor}), 0) AS {tipo_soma}) AS valor FROM dados"
+    )
+    if condicoes:
+        sql += " WHERE " + " AND ".join(condicoes)
+    sql += " GROUP BY ALL"
+
+    agregado = consultar(df, sql, parametros)
+    if indice == "date":
+        agregado["indice"] = pd.to_datetime(agregado["indice"]).astype("datetime64[ns]")
+    pivotado = (
+        agregado.pivot(index="indice", columns="coluna", values="valor")
+        .fillna(0)
+        .astype(agregado["valor"].dtype)
+        .sort_index()
+    )
+    pivotado.index.name = indice
+    # O DuckDB devolve as categorias como ENUM ordenado; volta ao dtype de origem
+    pivotado.columns = pivotado.columns.astype(df[colunas].dtype)
+    pivotado.columns.name = colunas
+    return pivotado
+
+
+def agregar_tabela_comex(df, colunas_agg, anos_selecionados):
+    """
+    Agrega o comex por ano, mês e `colunas_agg`, com os acumulados no ano e as
+    variações em relação ao ano anterior (ver utils.criar_tabela_comex).
+    """
+    chaves = ", ".join(_identificador(c) for c in colunas_agg)
+    sql = f"""
+        WITH agregado AS (
+            SELECT ano, mes, {chaves},
+                COALESCE(SUM(valor_exp_mensal), 0) AS valor_exp_mensal,
+                COALESCE(SUM(valor_exp_mensal_ano_anterior), 0)
+                    AS valor_exp_mensal_ano_anterior
+            FROM dados
+            WHERE list_contains(?, CAST(ano AS INTEGER))
+            GROUP BY ALL
+        ),
+        acumulado AS (
+            SELECT *,
+                SUM(valor_exp_mensal) OVER janela AS valor_acumulado_ano,
+                SUM(valor_exp_mensal_ano_anterior) OVER janela
+                    AS valor_acumulado_ano_anterior
+            FROM agregado
+            WINDOW janela AS (
+                PARTITION BY ano, {chaves} ORDER BY mes
+                ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW
+            )
+        )
+        SELECT ano, mes, {chaves}, valor_exp_mensal,
+            (valor_exp_mensal / NULLIF(valor_exp_mensal_ano_anterior, 0) - 1) * 100
+                AS yoy_mensal,
+            valor_acumulado_ano,
+            (valor_acumulado_ano / NULLIF(valor_acumulado_ano_anterior, 0) - 1) * 100
+                AS yoy_acumulado
+        FROM acumulado
+        ORDER BY ano DESC, mes DESC, valor_exp_mensal DESC, {chaves}
+    """
+    return consultar(df, sql, [[int(ano) for ano in anos_selecionados]])
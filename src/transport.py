@@ -0,0 +1,91 @@
+import os
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# --- CONFIGURAÇÃO DA CAMADA DE TRANSPORTE HTTP ---
+
+# Sessões compartilhadas por todo o processo: conexões reaproveitadas (keep-alive)
+# evitam um novo handshake TLS a cada página buscada, e respostas comprimidas
+# reduzem o volume transferido nas cargas a frio.
+TIMEOUT_CONEXAO = float(os.getenv("HTTP_TIMEOUT_CONEXAO", "5"))
+TIMEOUT_LEITURA = float(os.getenv("HTTP_TIMEOUT_LEITURA", "30"))
+MAX_CONEXOES = int(os.getenv("HTTP_MAX_CONEXOES", "32"))
+KEEPALIVE_EXPIRACAO = float(os.getenv("HTTP_KEEPALIVE_EXPIRACAO", "60"))
+HTTP2_ATIVO = os.getenv("HTTP2", "1") != "0"
+
+try:
+    import brotli  # noqa: F401
+
+    ACCEPT_ENCODING = "br, gzip, deflate"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_DISPONIVEL = True
+except ImportError:
+    HTTP2_DISPONIVEL = False
+
+# Timeout no formato do requests: (conexão, leitura)
+TIMEOUT_REQUESTS = (TIMEOUT_CONEXAO, TIMEOUT_LEITURA)
+
+_sessao_requests = None
+
+
+def timeout_httpx():
+    """Timeouts explícitos para clientes httpx (Supabase/PostgREST)."""
+    return httpx.Timeout(TIMEOUT_LEITURA, connect=TIMEOUT_CONEXAO, pool=TIMEOUT_CONEXAO)
+
+
+def criar_cliente_httpx(base_url="", headers=None):
+    """
+    Cria um cliente httpx com pool de conexões, keep-alive, HTTP/2 (se o pacote
+    h2 estiver instalado) e compressão gzip/br das respostas.
+    """
+    cabecalhos = httpx.Headers(headers)
+    cabecalhos["Accept-Encoding"] = ACCEPT_ENCODING
+    return httpx.Client(
+        base_url=base_url,
+        headers=cabecalhos,
+        timeout=timeout_httpx(),
+        limits=httpx.Limits(
+            max_connections=MAX_CONEXOES,
+            max_keepalive_connections=MAX_CONEXOES,
+            keepalive_expiry=KEEPALIVE_EXPIRACAO,
+        ),
+        http2=HTTP2_ATIVO and HTTP2_DISPONIVEL,
+        follow_redirects=True,
+    )
+
+
+def configurar_cliente_supabase(cliente):
+    """
+    Troca a sessão HTTP do PostgREST do cliente supabase pela sessão ajustada,
+    mantendo a URL base e os cabeçalhos de autenticação definidos pelo cliente.
+    """
+    sessao_atual = cliente.postgrest.session
+    cliente.postgrest.session = criar_cliente_httpx(
+        str(sessao_atual.base_url), sessao_atual.headers
+    )
+    sessao_atual.close()
+    return cliente
+
+
+def sessao_requests():
+    """Sessão requests compartilhada, com pool de conexões e retentativas de conexão."""
+    global _sessao_requests
+    if _sessao_requests is None:
+        sessao = requests.Session()
+        adaptador = HTTPAdapter(
+            pool_connections=MAX_CONEXOES,
+            pool_maxsize=MAX_CONEXOES,
+            max_retries=Retry(connect=2, backoff_factor=0.5),
+        )
+        sessao.mount("https://", adaptador)
+        sessao.mount("http://", adaptador)
+        sessao.headers["Accept-Encoding"] = ACCEPT_ENCODING
+        _sessao_requests = sessao
+    return _sessao_requests
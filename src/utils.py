@@ -1,8 +1,11 @@
-import plotly.express as px
 import streamlit as st
 import pandas as pd
 import numpy as np
 import io
+import time
+
+from src import profiling, sql_engine
+from src.memory_cache import cache_memoria
 
 
 # --- DICIONÁRIOS E CONSTANTES ---
@@ -140,7 +143,7 @@ def filtrar_municipio_ult_mes_ano(df, municipio):
     ]
 
 
-@st.cache_data
+@cache_memoria
 def calcular_yoy(df, municipio, ultimo_mes, ultimo_ano, coluna, round):
     """
     Calcula a variação ano-a-ano (YoY) para um indicador específico,
@@ -170,6 +173,7 @@ def calcular_yoy(df, municipio, ultimo_mes, ultimo_ano, coluna, round):
     return None
 
 
+@profiling.medir_fase("figuras")
 def criar_grafico_barras(
     df,
     titulo,
@@ -183,6 +187,9 @@ def criar_grafico_barras(
     """
     Cria um gráfico de barras customizado e reutilizável com Plotly Express.
     """
+    # Importado no primeiro gráfico: o Plotly é pesado e nem toda página o usa
+    import plotly.express as px
+
     if isinstance(df.columns, pd.MultiIndex):
         df.columns = [" - ".join(map(str, col)).strip() for col in df.columns.values]
 
@@ -251,6 +258,7 @@ def criar_grafico_barras(
     return fig
 
 
+@profiling.medir_fase("figuras")
 def criar_grafico_linhas(
     df,
     titulo,
@@ -264,6 +272,8 @@ def criar_grafico_linhas(
     """
     Cria um gráfico de linhas customizado e reutilizável com Plotly Express.
     """
+    import plotly.express as px
+
     if isinstance(df.columns, pd.MultiIndex):
         df.columns = [" - ".join(map(str, col)).strip() for col in df.columns.values]
 
@@ -338,7 +348,23 @@ def criar_grafico_linhas(
     return fig
 
 
-@st.cache_data
+def exibir_grafico(fig, **kwargs):
+    """
+    Envia a figura ao navegador com st.plotly_chart. Com o perfil ativo, mede o
+    tempo do envio (serialização incluída) e o tamanho do JSON da figura.
+    """
+    if profiling.perfil_atual() is None:
+        return st.plotly_chart(fig, **kwargs)
+
+    with profiling.fase("envio_graficos"):
+        inicio = time.perf_counter()
+        resultado = st.plotly_chart(fig, **kwargs)
+        duracao = time.perf_counter() - inicio
+    profiling.registrar_grafico(len(fig.to_json()), duracao)
+    return resultado
+
+
+@cache_memoria
 def criar_tabela_formatada(df, index_col, ult_ano, ult_mes):
     """Cria uma tabela formatada para exibição no Streamlit."""
     df_filtrado = df[df["mes"] <= ult_mes]
@@ -348,6 +374,7 @@ def criar_tabela_formatada(df, index_col, ult_ano, ult_mes):
         values="saldo_movimentacao",
         aggfunc="sum",
         fill_value=0,
+        observed=True,
     ).sort_values(by=ult_ano, ascending=False)
 
     df_pivot.columns = (
@@ -360,7 +387,7 @@ def criar_tabela_formatada(df, index_col, ult_ano, ult_mes):
     return df_pivot
 
 
-@st.cache_data
+@cache_memoria
 def criar_tabela_formatada_mes(df, index_col, ult_ano, ult_mes):
     """Cria uma tabela formatada para exibição no Streamlit."""
     df_filtrado = df[df["mes"] == ult_mes]
@@ -370,6 +397,7 @@ def criar_tabela_formatada_mes(df, index_col, ult_ano, ult_mes):
         values="saldo_movimentacao",
         aggfunc="sum",
         fill_value=0,
+        observed=True,
     ).sort_values(by=ult_ano, ascending=False)
 
     df_pivot.columns = (
@@ -380,7 +408,7 @@ def criar_tabela_formatada_mes(df, index_col, ult_ano, ult_mes):
     return df_pivot
 
 
-@st.cache_data
+@cache_memoria
 def criar_tabela_formatada_ano(df, index_col):
     """Cria uma tabela formatada para exibição no Streamlit."""
     ult_ano = checar_ult_ano_completo(df)
@@ -391,6 +419,7 @@ def criar_tabela_formatada_ano(df, index_col):
         values="saldo_movimentacao",
         aggfunc="sum",
         fill_value=0,
+        observed=True,
     ).sort_values(by=ult_ano, ascending=False)
 
     df_pivot.index.name = index_col.replace("_", " ").title()
@@ -405,7 +434,7 @@ def destacar_percentuais(val):
     return f"color: {color}"
 
 
-@st.cache_data
+@cache_memoria
 def criar_tabela_comex(df, colunas_agg, colunas_finais, anos_selecionados):
     """
     Cria uma tabela de dados de comércio exterior, agrupando por uma ou mais colunas.
@@ -416,24 +445,6 @@ def criar_tabela_comex(df, colunas_agg, colunas_finais, anos_selecionados):
         colunas_finais (list): Lista de nomes para as colunas agrupadas no resultado final (ex: ["País", "Produto"]).
         anos_selecionados (list): Lista de anos para filtrar no .query().
     """
-
-    df_sorted = df.sort_values(by=["ano", "mes"])
-
-    df_agregado = df_sorted.groupby(["ano", "mes"] + colunas_agg, as_index=False).agg(
-        {
-            "valor_exp_mensal": "sum",
-            "valor_exp_mensal_ano_anterior": "sum",
-        }
-    )
-
-    grouping_cols = ["ano"] + colunas_agg
-    df_agregado["valor_acumulado_ano"] = df_agregado.groupby(grouping_cols)[
-        "valor_exp_mensal"
-    ].cumsum()
-    df_agregado["valor_acumulado_ano_anterior"] = df_agregado.groupby(grouping_cols)[
-        "valor_exp_mensal_ano_anterior"
-    ].cumsum()
-
     colunas_resultado = (
         ["Ano", "Mês"]
         + colunas_finais
@@ -445,6 +456,33 @@ def criar_tabela_comex(df, colunas_agg, colunas_finais, anos_selecionados):
         ]
     )
 
+    if sql_engine.motor_sql_disponivel():
+        try:
+            return sql_engine.agregar_tabela_comex(
+                df, colunas_agg, anos_selecionados
+            ).set_axis(colunas_resultado, axis=1)
+        except Exception as e:
+            print(f"Erro no motor SQL (tabela do comex), usando pandas: {e}")
+
+    df_sorted = df.sort_values(by=["ano", "mes"])
+
+    df_agregado = df_sorted.groupby(
+        ["ano", "mes"] + colunas_agg, as_index=False, observed=True
+    ).agg(
+        {
+            "valor_exp_mensal": "sum",
+            "valor_exp_mensal_ano_anterior": "sum",
+        }
+    )
+
+    grouping_cols = ["ano"] + colunas_agg
+    df_agregado["valor_acumulado_ano"] = df_agregado.groupby(
+        grouping_cols, observed=True
+    )["valor_exp_mensal"].cumsum()
+    df_agregado["valor_acumulado_ano_anterior"] = df_agregado.groupby(
+        grouping_cols, observed=True
+    )["valor_exp_mensal_ano_anterior"].cumsum()
+
     colunas_originais = (
         ["ano", "mes"]
         + colunas_agg
@@ -503,20 +541,60 @@ def criar_formatador_final(tipo, formatador_base):
         return formatador_base
 
 
-@st.cache_data
+@cache_memoria
 def preparar_dados_graficos_anuais(df_filtrado, coluna_agregacao, coluna_valores):
-    df = df_filtrado.pivot_table(
-        index="ano",
-        columns=coluna_agregacao,
-        values=coluna_valores,
+    return pivotar_soma(df_filtrado, coluna_valores, colunas=coluna_agregacao)
+
+
+def pivotar_soma(
+    df, valores, indice="ano", colunas="municipio", ate_ano=None, ate_mes=None, escala=1
+):
+    """
+    Soma uma coluna por ano (ou por mês, com indice="date") e município (ou outra
+    coluna), no formato pivotado usado pelos gráficos. Usa o motor SQL (DuckDB)
+    quando disponível e o pivot_table do pandas caso contrário.
+
+    Args:
+        df (pd.DataFrame): DataFrame com as colunas 'ano' e 'mes'.
+        valores (str): Coluna a ser somada.
+        indice (str): "ano" ou "date" (primeiro dia do mês, a partir de ano/mes).
+        colunas (str): Coluna que vira as colunas do resultado.
+        ate_ano (int): Se informado, considera apenas ano <= ate_ano.
+        ate_mes (int): Se informado, considera apenas mes <= ate_mes.
+        escala (float): Divisor aplicado aos valores (ex: 1_000_000 para milhões).
+    """
+    if sql_engine.motor_sql_disponivel():
+        try:
+            return sql_engine.somar_pivotado(
+                df, valores, indice, colunas, ate_ano, ate_mes, escala
+            )
+        except Exception as e:
+            print(f"Erro no motor SQL ({valores}), usando pandas: {e}")
+
+    if ate_ano is not None:
+        df = df[df["ano"] <= ate_ano]
+    if ate_mes is not None:
+        df = df[df["mes"] <= ate_mes]
+    if indice == "date":
+        df = df.assign(
+            date=lambda x: pd.to_datetime(
+                x["ano"].astype(str) + "-" + x["mes"].astype(str).str.zfill(2) + "-01"
+            )
+        )
+    if escala != 1:
+        df = df.assign(**{valores: df[valores] / escala})
+    return df.pivot_table(
+        index=indice,
+        columns=colunas,
+        values=valores,
         aggfunc="sum",
         fill_value=0,
+        observed=True,
     ).sort_index()
-    return df
 
 
 # ... (outras funções do seu utils.py) ...
-@st.cache_data
+@cache_memoria
 def to_excel(df: pd.DataFrame) -> bytes:
     """
     Converte um DataFrame do Pandas para um arquivo Excel em memória (bytes).
@@ -0,0 +1,104 @@
+import pandas as pd
+import streamlit as st
+from src import instrumentation, memory_cache
+from src.utils import titulo_centralizado
+
+
+def _em_mb(df):
+    """Troca a coluna de bytes por MB, para exibição."""
+    megabytes = (df["bytes"].astype(float) / 1024 / 1024).round(2)
+    return df.assign(MB=megabytes).drop(columns="bytes")
+
+
+def show_painel_memoria(df_datasets):
+    """
+    Painel administrativo do uso de memória: o cache de preparo (por função e
+    maiores entradas, com o orçamento) e os datasets do armazenamento.
+    """
+    titulo_centralizado("Uso de Memória dos Caches", 3)
+
+    usado, orcamento, entradas = memory_cache.uso_total()
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Cache de preparo (MB)", f"{usado / 1024 / 1024:,.1f}", border=True)
+    col2.metric("Orçamento (MB)", f"{orcamento / 1024 / 1024:,.0f}", border=True)
+    col3.metric("Entradas", entradas, border=True)
+    st.progress(min(usado / orcamento, 1.0) if orcamento else 0.0)
+
+    st.markdown("**Cache de preparo por função**")
+    st.dataframe(
+        _em_mb(memory_cache.resumo_por_funcao()), hide_index=True, width="stretch"
+    )
+
+    st.markdown("**Maiores entradas**")
+    st.dataframe(
+        _em_mb(memory_cache.maiores_entradas()), hide_index=True, width="stretch"
+    )
+
+    st.markdown("**Datasets carregados**")
+    st.caption(
+        "Inclui colunas lidas do cache em disco por memory-map, que ficam no cache "
+        "de páginas do sistema e são compartilhadas entre os processos."
+    )
+    st.dataframe(_em_mb(df_datasets), hide_index=True, width="stretch")
+
+    if st.button("Esvaziar cache de preparo", key="admin_limpar_cache_memoria"):
+        memory_cache.limpar()
+        st.rerun()
+
+
+def show_painel_cargas():
+    """
+    Painel de diagnóstico das cargas de dados: por dataset (acessos, taxa de
+    acerto do cache em memória, origem, tempos, volume e tamanho) e as cargas
+    mais recentes, para escolher os alvos de otimização.
+    """
+    titulo_centralizado("Diagnóstico das Cargas de Dados", 3)
+
+    resumo = instrumentation.resumo_por_dataset()
+    if resumo.empty:
+        st.info("Nenhum dataset foi carregado por este processo ainda.")
+        return
+
+    st.markdown("**Por dataset** (ordenado pela carga mais lenta)")
+    st.dataframe(resumo, hide_index=True, width="stretch")
+
+    st.markdown("**Cargas recentes**")
+    st.dataframe(instrumentation.eventos_recentes(), hide_index=True, width="stretch")
+
+
+def show_painel_perfil(perfil):
+    """
+    Perfil da última execução na barra lateral (opt-in, ver src/profiling.py):
+    tempo por fase e por seção, acertos/falhas do cache de preparo e o tamanho
+    de cada gráfico enviado ao navegador.
+    """
+    with st.sidebar.expander("Perfil da execução", expanded=True):
+        col1, col2 = st.columns(2)
+        col1.metric("Execução (s)", f"{perfil.total_s:.3f}")
+        col2.metric(
+            "Gráficos (KB)", f"{sum(g['bytes'] for g in perfil.graficos) / 1024:,.0f}"
+        )
+
+        st.markdown("**Fases**")
+        fases = pd.DataFrame(
+            {"fase": list(perfil.fases), "duracao_s": list(perfil.fases.values())}
+        )
+        st.dataframe(
+            fases.sort_values("duracao_s", ascending=False).round(4), hide_index=True
+        )
+
+        if perfil.secoes:
+            st.markdown("**Seções**")
+            st.dataframe(pd.DataFrame(perfil.secoes), hide_index=True)
+
+        if perfil.caches:
+            st.markdown("**Cache de preparo**")
+            caches = pd.DataFrame.from_dict(perfil.caches, orient="index")
+            caches.index = caches.index.str.removeprefix("src.")
+            st.dataframe(caches.rename_axis("funcao").reset_index(), hide_index=True)
+
+        if perfil.graficos:
+            st.markdown("**Gráficos**")
+            graficos = pd.DataFrame(perfil.graficos)
+            graficos["KB"] = (graficos.pop("bytes") / 1024).round(1)
+            st.dataframe(graficos, hide_index=True)
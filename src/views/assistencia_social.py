@@ -5,10 +5,17 @@ import pandas as pd
 # IMPORTAÇÕES DE FUNÇÕES E DADOS
 # ==============================================================================
 
-from src.utils import MESES_DIC, criar_grafico_barras, titulo_centralizado, calcular_yoy
+from src import profiling
+from src.memory_cache import cache_memoria
+from src.utils import (
+    MESES_DIC,
+    criar_grafico_barras,
+    titulo_centralizado,
+    calcular_yoy,
+    exibir_grafico,
+)
 
 from src.config import (
-    municipio_de_interesse,
     CORES_MUNICIPIOS,
 )
 
@@ -17,6 +24,7 @@ from src.config import (
 # ==============================================================================
 
 
+@profiling.medir_secao
 def display_assistencia_kpi_cards(df_cad, df_bolsa, municipio_interesse):
     """Exibe os cards de KPI de Assistencia Social para um município específico."""
     titulo_centralizado(f"Indicadores de {municipio_interesse}", 3)
@@ -36,7 +44,7 @@ def display_assistencia_kpi_cards(df_cad, df_bolsa, municipio_interesse):
 
         num_cad_yoy = calcular_yoy(
             df=df_cad_mun,
-            municipio=municipio_de_interesse,
+            municipio=municipio_interesse,
             ultimo_ano=ult_ano_cad,
             ultimo_mes=ult_mes_cad,
             coluna="total_familias",
@@ -50,7 +58,7 @@ def display_assistencia_kpi_cards(df_cad, df_bolsa, municipio_interesse):
 
         num_bolsa_yoy = calcular_yoy(
             df=df_bolsa_mun,
-            municipio=municipio_de_interesse,
+            municipio=municipio_interesse,
             ultimo_ano=ult_ano_bolsa,
             ultimo_mes=ult_mes_bolsa,
             coluna="qtd_beneficiados",
@@ -74,7 +82,7 @@ def display_assistencia_kpi_cards(df_cad, df_bolsa, municipio_interesse):
         )
 
 
-@st.cache_data
+@cache_memoria
 def preparar_dados_graficos_assistencia_social(df, coluna_selecionada):
     """Prepara os DataFrames pivotados para as abas da página de assistencia_social."""
     df_graf = pd.DataFrame()
@@ -91,6 +99,7 @@ def preparar_dados_graficos_assistencia_social(df, coluna_selecionada):
             values=coluna_selecionada,
             aggfunc="sum",
             fill_value=0,
+            observed=True,
         )
         .sort_index()
     )
@@ -98,6 +107,8 @@ def preparar_dados_graficos_assistencia_social(df, coluna_selecionada):
     return df_graf
 
 
+@st.fragment
+@profiling.medir_secao
 def display_assistencia(
     df, titulo_expander, key_prefix, dicionario_indicadores, label_y, markdown_final
 ):
@@ -150,7 +161,7 @@ def display_assistencia(
             color_map=CORES_MUNICIPIOS,
             hover_label_format=",.0f",
         )
-        st.plotly_chart(fig, use_container_width=False)
+        exibir_grafico(fig, use_container_width=False)
         st.markdown(f"###### {markdown_final}")
 
 
@@ -171,7 +182,7 @@ def show_page_assistencia_social(df_cad, df_bolsa, municipio_interesse):
     }
 
     display_assistencia_kpi_cards(
-        df_cad=df_cad, df_bolsa=df_bolsa, municipio_interesse=municipio_de_interesse
+        df_cad=df_cad, df_bolsa=df_bolsa, municipio_interesse=municipio_interesse
     )
     titulo_centralizado("Clique nos menus abaixo para explorar os dados", 5)
 
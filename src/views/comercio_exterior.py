@@ -5,7 +5,10 @@ import pandas as pd
 # IMPORTAÇÕES DE FUNÇÕES E DADOS
 # ==============================================================================
 
+from src import profiling
+from src.memory_cache import cache_memoria
 from src.utils import (
+    exibir_grafico,
     MESES_DIC,
     checar_ult_ano_completo,
     filtrar_municipio_ult_mes_ano,
@@ -13,10 +16,10 @@ from src.utils import (
     destacar_percentuais,
     criar_tabela_comex,
     titulo_centralizado,
+    pivotar_soma,
 )
 
 from src.config import (
-    municipio_de_interesse,
     anos_de_interesse,
     CORES_MUNICIPIOS,
 )
@@ -26,10 +29,11 @@ from src.config import (
 # ==============================================================================
 
 
+@profiling.medir_secao
 def display_comex_kpi_cards(df_ano, df_mes, municipio_interesse):
     """Exibe os cards de KPI de Comércio Exterior para um município específico."""
 
-    titulo_centralizado(f"Exportações de {municipio_de_interesse} (Milhões de US$)", 3)
+    titulo_centralizado(f"Exportações de {municipio_interesse} (Milhões de US$)", 3)
     with st.container(border=False):
         # Ultimo mês disponível
         ult_ano = df_mes["ano"].max()
@@ -89,7 +93,7 @@ def display_comex_kpi_cards(df_ano, df_mes, municipio_interesse):
         )
 
 
-@st.cache_data
+@cache_memoria
 def prepara_dados_graficos_comex(df_filtrado, anos_de_interesse):
     """
     Recebe um DataFrame de comex filtrado e retorna todos os DataFrames pivotados
@@ -109,74 +113,29 @@ def prepara_dados_graficos_comex(df_filtrado, anos_de_interesse):
         ult_mes_comex = df_filtrado[df_filtrado["ano"] == ult_ano_comex]["mes"].max()
 
         # Histórico Mensal - Valor
-        df_comex_hist = (
-            df_filtrado.assign(
-                date=lambda x: pd.to_datetime(
-                    x["ano"].astype(str)
-                    + "-"
-                    + x["mes"].astype(str).str.zfill(2)
-                    + "-01"
-                ),
-                exp_milhoes=lambda x: x["total_exp_mensal"] / 1_000_000,
-            )
-            .pivot_table(
-                index="date",
-                columns="municipio",
-                values="exp_milhoes",
-                aggfunc="sum",
-                fill_value=0,
-            )
-            .sort_index()
-            .apply(lambda x: x.round(2))
-        )
+        df_comex_hist = pivotar_soma(
+            df_filtrado, "total_exp_mensal", indice="date", escala=1_000_000
+        ).round(2)
         # Historico Mensal - Percentual
-        df_comex_hist_perc = (
-            df_filtrado.assign(
-                date=lambda x: pd.to_datetime(
-                    x["ano"].astype(str)
-                    + "-"
-                    + x["mes"].astype(str).str.zfill(2)
-                    + "-01"
-                ),
-            )
-            .pivot_table(
-                index="date",
-                columns="municipio",
-                values="perc_var_mes_ano_anterior",
-                aggfunc="sum",
-                fill_value=0,
-            )
-            .sort_index()
-            .apply(lambda x: x.round(2))
-        )
+        df_comex_hist_perc = pivotar_soma(
+            df_filtrado, "perc_var_mes_ano_anterior", indice="date"
+        ).round(2)
 
         # Acumulado no Ano
-        df_comex_acum = (
-            df_filtrado[df_filtrado["mes"] <= ult_mes_comex]
-            .assign(exp_milhoes=lambda x: x["total_exp_acumulado"] / 1_000_000)
-            .pivot_table(
-                index="ano",
-                columns="municipio",
-                values="exp_milhoes",
-                aggfunc="sum",
-                fill_value=0,
-            )
-            .sort_index()
+        df_comex_acum = pivotar_soma(
+            df_filtrado,
+            "total_exp_acumulado",
+            ate_mes=ult_mes_comex,
+            escala=1_000_000,
         )
 
         # Anual
         ano_completo_comex = checar_ult_ano_completo(df_filtrado)
-        df_comex_ano = (
-            df_filtrado[df_filtrado["ano"] <= ano_completo_comex]
-            .assign(exp_milhoes=lambda x: x["total_exp_mensal"] / 1_000_000)
-            .pivot_table(
-                index="ano",
-                columns="municipio",
-                values="exp_milhoes",
-                aggfunc="sum",
-                fill_value=0,
-            )
-            .sort_index()
+        df_comex_ano = pivotar_soma(
+            df_filtrado,
+            "total_exp_mensal",
+            ate_ano=ano_completo_comex,
+            escala=1_000_000,
         )
 
     return (
@@ -189,6 +148,8 @@ def prepara_dados_graficos_comex(df_filtrado, anos_de_interesse):
     )
 
 
+@st.fragment
+@profiling.medir_secao
 def display_comex_municipios_expander(df_mes):
     """Exibe o expander com análise de exportações para múltiplos municípios."""
     with st.expander("Comércio Exterior por Município", expanded=False):
@@ -274,7 +235,7 @@ def display_comex_municipios_expander(df_mes):
 
             if view_mode == "Valor (Milhões de US$)":
                 titulo_centralizado(f"Exportações em {ANO_SELECIONADO}", 5)
-                st.plotly_chart(fig_hist, width="stretch")
+                exibir_grafico(fig_hist, width="stretch")
 
             elif view_mode == "Variação Anual (%)":
                 if fig_hist_perc:
@@ -283,7 +244,7 @@ def display_comex_municipios_expander(df_mes):
                         5,
                     )
 
-                    st.plotly_chart(fig_hist_perc, use_container_width=True)
+                    exibir_grafico(fig_hist_perc, use_container_width=True)
                 else:
                     st.warning("Nenhum dado disponível para o gráfico.")
 
@@ -307,7 +268,7 @@ def display_comex_municipios_expander(df_mes):
             titulo_centralizado(
                 f"Exportações de Janeiro a {MESES_DIC[ult_mes_comex]}", 5
             )
-            st.plotly_chart(fig_acum, width="stretch")
+            exibir_grafico(fig_acum, width="stretch")
 
         with tab_anual:
             fig_anual = criar_grafico_barras(
@@ -321,10 +282,10 @@ def display_comex_municipios_expander(df_mes):
                 color_map=CORES_MUNICIPIOS,
             )
             titulo_centralizado("Exportações Anuais", 5)
-            st.plotly_chart(fig_anual, width="stretch")
+            exibir_grafico(fig_anual, width="stretch")
 
 
-@st.cache_data
+@cache_memoria
 def preparar_dados_comex_produto_pais(df, anos_selecionados, tipo_agg):
     """
     Função cacheada e genérica para preparar os dados para as abas de Comex.
@@ -351,7 +312,7 @@ def preparar_dados_comex_produto_pais(df, anos_selecionados, tipo_agg):
     return pd.DataFrame()
 
 
-@st.cache_data
+@cache_memoria
 def preparar_grafico_comex(df_filtrado_exibicao):
     """
     Recebe o DataFrame já filtrado pela UI e retorna a figura do gráfico cacheada.
@@ -371,6 +332,7 @@ def preparar_grafico_comex(df_filtrado_exibicao):
             values="Valor Exportado no Mês (US$)",
             aggfunc="sum",
             fill_value=0,
+            observed=True,
         )
         .sort_index()
     )
@@ -392,6 +354,8 @@ def preparar_grafico_comex(df_filtrado_exibicao):
     )
 
 
+@st.fragment
+@profiling.medir_secao
 def display_comex_produto_pais_expander(df, municipio_interesse):
     """Exibe o expander com análise de exportações por Produto e País do Municipio Selecionado."""
     with st.expander(
@@ -492,7 +456,7 @@ def display_comex_produto_pais_expander(df, municipio_interesse):
 
             paises_options = sorted(df_comex_pais_produto["País"].unique().tolist())
             paises_default = (
-                df_comex_pais_produto.groupby(["País"], as_index=False)[
+                df_comex_pais_produto.groupby(["País"], as_index=False, observed=True)[
                     "Valor Exportado no Mês (US$)"
                 ]
                 .sum()
@@ -557,7 +521,7 @@ def display_comex_produto_pais_expander(df, municipio_interesse):
 
             elif view_mode == "Gráfico":
                 if fig_pp:
-                    st.plotly_chart(fig_pp, use_container_width=True)
+                    exibir_grafico(fig_pp, use_container_width=True)
                 else:
                     st.warning("Nenhum dado disponível para o gráfico.")
 
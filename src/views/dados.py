@@ -592,17 +592,14 @@ def show_page_dados(
                 use_container_width=True,
             )
             if pdf_indicadores:
-                try:
-                    pdf_indicadores.seek(0)
-                except Exception:
-                    pass
-                st.download_button(
-                    label="📥 Relatório Metodológico dos Indicadores Fiscais (PDF)",
-                    data=pdf_indicadores,
-                    file_name="relatorio_metodologico_financas.pdf",
-                    mime="application/pdf",
-                    use_container_width=True,
-                )
+                with open(pdf_indicadores, "rb") as arquivo_pdf:
+                    st.download_button(
+                        label="📥 Relatório Metodológico dos Indicadores Fiscais (PDF)",
+                        data=arquivo_pdf,
+                        file_name="relatorio_metodologico_financas.pdf",
+                        mime="application/pdf",
+                        use_container_width=True,
+                    )
             else:
                 st.write("")
 
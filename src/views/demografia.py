@@ -1,14 +1,16 @@
 import pandas as pd
 import streamlit as st
-import plotly.express as px
-from src.config import CORES_MUNICIPIOS, municipio_de_interesse
+from src import profiling
+from src.memory_cache import cache_memoria
+from src.config import CORES_MUNICIPIOS
 from src.utils import (
+    exibir_grafico,
     criar_grafico_barras,
     titulo_centralizado,
 )
 
 
-@st.cache_data
+@cache_memoria
 def preparar_dados_graficos_populacao_densidade(df_filtrado, coluna_selecionada):
     df_anual = df_filtrado.pivot_table(
         index="ano",
@@ -16,12 +18,13 @@ def preparar_dados_graficos_populacao_densidade(df_filtrado, coluna_selecionada)
         values=coluna_selecionada,
         aggfunc="sum",
         fill_value=0,
+        observed=True,
     ).sort_index(ascending=False)
 
     return df_anual
 
 
-@st.cache_data
+@cache_memoria
 def preparar_dados_grafico_sexo_proporcao(df_filtrado_sexo, ano_selecionado):
     """Prepara os dados para o gráfico de proporção por sexo para um ano específico."""
     if df_filtrado_sexo.empty:
@@ -32,11 +35,13 @@ def preparar_dados_grafico_sexo_proporcao(df_filtrado_sexo, ano_selecionado):
         return pd.DataFrame()
 
     df_sexo_agg = (
-        df_ano.groupby(["municipio", "sexo"])["pop_estimada"].sum().reset_index()
+        df_ano.groupby(["municipio", "sexo"], observed=True)["pop_estimada"]
+        .sum()
+        .reset_index()
     )
 
     df_total_pop = (
-        df_sexo_agg.groupby("municipio")["pop_estimada"]
+        df_sexo_agg.groupby("municipio", observed=True)["pop_estimada"]
         .sum()
         .reset_index()
         .rename(columns={"pop_estimada": "pop_total"})
@@ -48,7 +53,11 @@ def preparar_dados_grafico_sexo_proporcao(df_filtrado_sexo, ano_selecionado):
     ) * 100
 
     df_pivot = df_merged.pivot_table(
-        index="municipio", columns="sexo", values="Proporção (%)", fill_value=0
+        index="municipio",
+        columns="sexo",
+        values="Proporção (%)",
+        fill_value=0,
+        observed=True,
     )
 
     if "Feminino" in df_pivot.columns:
@@ -57,7 +66,7 @@ def preparar_dados_grafico_sexo_proporcao(df_filtrado_sexo, ano_selecionado):
     return df_pivot
 
 
-@st.cache_data
+@cache_memoria
 def preparar_dados_grafico_piramide_etaria(
     df_filtrado_sexo, municipio_de_interesse, ano_selecionado
 ):
@@ -81,7 +90,9 @@ def preparar_dados_grafico_piramide_etaria(
 
     # Agrupa por faixa etária E sexo
     df_grouped = (
-        df_ano.groupby(["faixa_etaria", "sexo"])["pop_estimada"].sum().reset_index()
+        df_ano.groupby(["faixa_etaria", "sexo"], observed=True)["pop_estimada"]
+        .sum()
+        .reset_index()
     )
 
     # Calcula a proporção de cada grupo
@@ -93,6 +104,8 @@ def preparar_dados_grafico_piramide_etaria(
     return df_grouped
 
 
+@st.fragment
+@profiling.medir_secao
 def display_populacao_densidade_expander(df_filtrado, df_filtrado_sexo):
     tab_populacao, tab_sexo, tab_densidade = st.tabs(
         ["População Estimada", "Sexo", "Densidade Demográfica"]
@@ -114,7 +127,7 @@ def display_populacao_densidade_expander(df_filtrado, df_filtrado_sexo):
             hover_label_format=",.0f",
             color_map=CORES_MUNICIPIOS,
         )
-        st.plotly_chart(fig, width="stretch")
+        exibir_grafico(fig, width="stretch")
 
     with tab_sexo:
         CORES_SEXO = {"Masculino": "#4C82F7", "Feminino": "#FF6BE1"}
@@ -147,7 +160,7 @@ def display_populacao_densidade_expander(df_filtrado, df_filtrado_sexo):
             hover_label_format=",.1f",
             color_map=CORES_SEXO,
         )
-        st.plotly_chart(fig_sexo, use_container_width=True)
+        exibir_grafico(fig_sexo, use_container_width=True)
 
     with tab_densidade:
         titulo_centralizado("Densidade Demográfica", 5)
@@ -165,9 +178,11 @@ def display_populacao_densidade_expander(df_filtrado, df_filtrado_sexo):
             hover_label_format=",.0f",
             color_map=CORES_MUNICIPIOS,
         )
-        st.plotly_chart(fig, width="stretch")
+        exibir_grafico(fig, width="stretch")
 
 
+@st.fragment
+@profiling.medir_secao
 def display_populacao_piramide_etaria_expander(df_filtrado_sexo, municipio_interesse):
     anos_disponiveis = sorted(
         df_filtrado_sexo[df_filtrado_sexo["municipio"] == municipio_interesse]["ano"]
@@ -220,6 +235,9 @@ def display_populacao_piramide_etaria_expander(df_filtrado_sexo, municipio_inter
     max_val = df_plot["proporcao"].abs().max()
     axis_max = (max_val // 1) + 1
 
+    # Importado só aqui: o Plotly Express é pesado (ver utils.criar_grafico_barras)
+    import plotly.express as px
+
     fig = px.bar(
         df_plot,
         y="faixa_etaria",
@@ -276,10 +294,12 @@ def display_populacao_piramide_etaria_expander(df_filtrado_sexo, municipio_inter
     titulo_centralizado(
         f"Pirâmide Etária de {municipio_interesse} ({ano_selecionado})", 5
     )
-    st.plotly_chart(fig, use_container_width=True)
+    exibir_grafico(fig, use_container_width=True)
 
 
-def show_page_demografia(df_populacao_densidade, df_populacao_sexo_idade):
+def show_page_demografia(
+    df_populacao_densidade, df_populacao_sexo_idade, municipio_interesse
+):
     titulo_centralizado("Dashboard de Demográfia", 1)
     titulo_centralizado("Clique nos menus abaixo para explorar os dados", 5)
     with st.expander("Indicadores demográficos dos Municípios"):
@@ -288,8 +308,8 @@ def show_page_demografia(df_populacao_densidade, df_populacao_sexo_idade):
             df_filtrado_sexo=df_populacao_sexo_idade,
         )
 
-    with st.expander(f"Pirâmide Etária de {municipio_de_interesse}"):
+    with st.expander(f"Pirâmide Etária de {municipio_interesse}"):
         display_populacao_piramide_etaria_expander(
             df_filtrado_sexo=df_populacao_sexo_idade,
-            municipio_interesse=municipio_de_interesse,
+            municipio_interesse=municipio_interesse,
         )
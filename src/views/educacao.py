@@ -1,14 +1,17 @@
 import pandas as pd
 import streamlit as st
 
+from src import profiling
+from src.memory_cache import cache_memoria
 from src.config import CORES_MUNICIPIOS
 from src.utils import (
+    exibir_grafico,
     criar_grafico_barras,
     titulo_centralizado,
 )
 
 
-@st.cache_data
+@cache_memoria
 def preparar_dados_grafico_educacao(
     df_filtrado, coluna_selecionada, dependencia, municipios_selecionados
 ):
@@ -24,7 +27,9 @@ def preparar_dados_grafico_educacao(
             df_processed = total_pre_calculado
         else:
             df_processed = df_filtrado.groupby(
-                ["ano", "municipio"], as_index=False
+                ["ano", "municipio"],
+                as_index=False,
+                observed=True,
             ).agg({coluna_selecionada: "sum"})
     else:
         df_processed = df_filtrado[df_filtrado["dependencia"] == dependencia]
@@ -40,7 +45,7 @@ def preparar_dados_grafico_educacao(
 
     df_completo = pd.merge(
         df_grid, df_processed, on=["ano", "municipio"], how="left"
-    ).fillna(0)
+    ).fillna({coluna_selecionada: 0})
 
     df_graf = df_completo.pivot_table(
         index="ano",
@@ -48,12 +53,13 @@ def preparar_dados_grafico_educacao(
         values=coluna_selecionada,
         aggfunc="sum",
         fill_value=0,
+        observed=True,
     ).sort_index()
 
     return df_graf
 
 
-@st.cache_data
+@cache_memoria
 def preparar_dados_grafico_ideb_municipio(
     df, indicador, categoria, dependencia, municipios_selecionados
 ):
@@ -71,7 +77,7 @@ def preparar_dados_grafico_ideb_municipio(
 
     df_completo = pd.merge(
         df_grid, df_filtrado, on=["ano", "municipio"], how="left"
-    ).fillna(0)
+    ).fillna({"valor": 0})
 
     df_graf = df_completo.pivot_table(
         index="ano",
@@ -79,12 +85,13 @@ def preparar_dados_grafico_ideb_municipio(
         values="valor",
         aggfunc="sum",
         fill_value=0,
+        observed=True,
     ).sort_index()
 
     return df_graf
 
 
-@st.cache_data
+@cache_memoria
 def preparar_dados_tabela_ideb_escolas(df, categoria, dependencia):
     df_filtrado = df[
         (df["dependencia"] == dependencia) & (df["categoria"] == categoria)
@@ -96,12 +103,15 @@ def preparar_dados_tabela_ideb_escolas(df, categoria, dependencia):
             columns="indicador",
             values="valor",
             aggfunc="sum",
+            observed=True,
         ).assign(nota_media=lambda x: (x["nota_mat"] + x["nota_port"]) / 2)
     ).sort_values(by="nota_media", ascending=False)
 
     return df_tab
 
 
+@st.fragment
+@profiling.medir_secao
 def display_educacao(
     df_filtrado,
     municipios_selecionados,
@@ -155,9 +165,11 @@ def display_educacao(
             hover_label_format=f"{hover_label_format}",
             color_map=CORES_MUNICIPIOS,
         )
-        st.plotly_chart(fig, use_container_width=False)
+        exibir_grafico(fig, use_container_width=False)
 
 
+@st.fragment
+@profiling.medir_secao
 def display_taxa_rendimento(
     df_filtrado,
     municipios_selecionados,
@@ -224,9 +236,11 @@ def display_taxa_rendimento(
             hover_label_format=f"{hover_label_format}",
             color_map=CORES_MUNICIPIOS,
         )
-        st.plotly_chart(fig, use_container_width=False)
+        exibir_grafico(fig, use_container_width=False)
 
 
+@st.fragment
+@profiling.medir_secao
 def display_ideb_mun(
     df_filtrado,
     municipios_selecionados,
@@ -295,9 +309,11 @@ def display_ideb_mun(
             hover_label_format=",.1f",
             color_map=CORES_MUNICIPIOS,
         )
-        st.plotly_chart(fig, use_container_width=False)
+        exibir_grafico(fig, use_container_width=False)
 
 
+@st.fragment
+@profiling.medir_secao
 def display_ideb_escolas(
     df_filtrado,
     titulo_expander,
@@ -1,7 +1,10 @@
 import streamlit as st
 import pandas as pd
 
+from src import profiling
+from src.memory_cache import cache_memoria
 from src.utils import (
+    exibir_grafico,
     MESES_DIC,
     checar_ult_ano_completo,
     criar_grafico_barras,
@@ -12,10 +15,10 @@ from src.utils import (
     formatador_pt_br,
     criar_formatador_final,
     preparar_dados_graficos_anuais,
+    pivotar_soma,
 )
 
 from src.config import (
-    municipio_de_interesse,
     CORES_MUNICIPIOS,
     ordem_instrucao,
 )
@@ -25,6 +28,7 @@ from src.config import (
 # ==============================================================================
 
 
+@profiling.medir_secao
 def display_emprego_kpi_cards(df, municipio_interesse):
     """Exibe os cards de KPI de Emprego para um município específico."""
 
@@ -76,7 +80,7 @@ def expander_emprego_callback():
     st.session_state.emprego_expander_state = True
 
 
-@st.cache_data
+@cache_memoria
 def preparar_dados_graficos_emprego(df_filtrado):
     """
     Recebe um DataFrame filtrado e retorna todos os DataFrames pivotados e prontos
@@ -86,59 +90,27 @@ def preparar_dados_graficos_emprego(df_filtrado):
         return pd.DataFrame(), pd.DataFrame(), pd.DataFrame(), None, None
 
     # Histórico Mensal
-    df_hist = (
-        df_filtrado.assign(
-            date=lambda x: pd.to_datetime(
-                x["ano"].astype(str) + "-" + x["mes"].astype(str).str.zfill(2) + "-01"
-            )
-        )
-        .pivot_table(
-            index="date",
-            columns="municipio",
-            values="saldo_movimentacao",
-            aggfunc="sum",
-            fill_value=0,
-        )
-        .sort_index()
-    )
+    df_hist = pivotar_soma(df_filtrado, "saldo_movimentacao", indice="date")
 
     ult_ano = df_filtrado["ano"].max()
     ult_mes = df_filtrado[df_filtrado["ano"] == ult_ano]["mes"].max()
 
     # Acumulado no Ano
-    df_acum = (
-        df_filtrado[df_filtrado["mes"] <= ult_mes]
-        .pivot_table(
-            index="ano",
-            columns="municipio",
-            values="saldo_movimentacao",
-            aggfunc="sum",
-            fill_value=0,
-        )
-        .sort_index()
-    )
+    df_acum = pivotar_soma(df_filtrado, "saldo_movimentacao", ate_mes=ult_mes)
     df_acum.index = (
         "Jan-" + MESES_DIC[ult_mes][:3] + "/" + df_acum.index.astype(str).str.slice(-2)
     )
 
     # Anual
     ano_completo = checar_ult_ano_completo(df_filtrado)
-    df_anual = (
-        df_filtrado[df_filtrado["ano"] <= ano_completo]
-        .pivot_table(
-            index="ano",
-            columns="municipio",
-            values="saldo_movimentacao",
-            aggfunc="sum",
-            fill_value=0,
-        )
-        .sort_index(ascending=False)
-    )
+    df_anual = pivotar_soma(
+        df_filtrado, "saldo_movimentacao", ate_ano=ano_completo
+    ).sort_index(ascending=False)
 
     return df_hist, df_acum, df_anual, ult_ano, ult_mes
 
 
-@st.cache_data
+@cache_memoria
 def preparar_dados_categoria_emprego(df_categoria, index_col, sort_order=None):
     """
     Prepara os DataFrames de Mês, Acumulado e Ano para uma categoria de emprego.
@@ -149,10 +121,13 @@ def preparar_dados_categoria_emprego(df_categoria, index_col, sort_order=None):
 
     # Aplica ordenação categórica se uma ordem for especificada
     if sort_order:
-        df_categoria[index_col] = pd.Categorical(
-            df_categoria[index_col], categories=sort_order, ordered=True
-        )
-        df_categoria = df_categoria.dropna(subset=[index_col])
+        df_categoria = df_categoria.assign(
+            **{
+                index_col: pd.Categorical(
+                    df_categoria[index_col], categories=sort_order, ordered=True
+                )
+            }
+        ).dropna(subset=[index_col])
 
     ult_ano = int(df_categoria["ano"].max())
     ult_mes = int(df_categoria[df_categoria["ano"] == ult_ano]["mes"].max())
@@ -171,12 +146,19 @@ def preparar_dados_categoria_emprego(df_categoria, index_col, sort_order=None):
     return df_mes, df_acum, df_anual
 
 
+@st.fragment
+@profiling.medir_secao
 def display_emprego_categoria_expander(
-    df_sexo, df_faixa_etaria, df_raca_cor, df_grau_instrucao, ult_mes
+    df_sexo,
+    df_faixa_etaria,
+    df_raca_cor,
+    df_grau_instrucao,
+    ult_mes,
+    municipio_interesse,
 ):
     """Exibe o expander com análise de saldo de emprego por categoria (versão otimizada)."""
     with st.expander(
-        f"Saldo de Emprego por Categoria em {municipio_de_interesse}",
+        f"Saldo de Emprego por Categoria em {municipio_interesse}",
         expanded=False,
     ):
         tab_sexo, tab_raca_cor, tab_faixa_etaria, tab_grau_instrucao = st.tabs(
@@ -212,7 +194,7 @@ def display_emprego_categoria_expander(
                     data_label_format=",.0f",
                     hover_label_format=",.0f",
                 )
-                st.plotly_chart(fig, width="stretch")
+                exibir_grafico(fig, width="stretch")
             elif view_mode == "Acumulado no Ano":
                 titulo_centralizado(
                     f"Saldo de Emprego de Janeiro a {MESES_DIC[ult_mes]} por {titulo}",
@@ -226,7 +208,7 @@ def display_emprego_categoria_expander(
                     data_label_format=",.0f",
                     hover_label_format=",.0f",
                 )
-                st.plotly_chart(fig, width="stretch")
+                exibir_grafico(fig, width="stretch")
             elif view_mode == "Anual":
                 titulo_centralizado(f"Saldo de Anual por {titulo}", 5)
                 fig = criar_grafico_barras(
@@ -237,7 +219,7 @@ def display_emprego_categoria_expander(
                     data_label_format=",.0f",
                     hover_label_format=",.0f",
                 )
-                st.plotly_chart(fig, width="stretch")
+                exibir_grafico(fig, width="stretch")
 
         with tab_sexo:
             render_categoria_tab(
@@ -259,7 +241,7 @@ def display_emprego_categoria_expander(
             )
 
 
-@st.cache_data
+@cache_memoria
 def preparar_dados_graficos_cnae(df_cnae, index_col):
     """
     Prepara os DataFrames para as visualizações de Mês, Acumulado e Ano para dados de CNAE.
@@ -283,6 +265,8 @@ def preparar_dados_graficos_cnae(df_cnae, index_col):
     return df_mes, df_acum, df_anual
 
 
+@st.fragment
+@profiling.medir_secao
 def display_emprego_municipios_expander(
     df,
     categoria,
@@ -328,7 +312,7 @@ def display_emprego_municipios_expander(
                 hover_label_format=",.0f",
                 color_map=CORES_MUNICIPIOS,
             )
-            st.plotly_chart(fig_hist, width="stretch")
+            exibir_grafico(fig_hist, width="stretch")
 
         with tab_acum:
             titulo_centralizado(
@@ -344,7 +328,7 @@ def display_emprego_municipios_expander(
                 hover_label_format=",.0f",
                 color_map=CORES_MUNICIPIOS,
             )
-            st.plotly_chart(fig_acum, width="stretch")
+            exibir_grafico(fig_acum, width="stretch")
 
         with tab_anual:
             titulo_centralizado("Saldo Emprego Anual", 5)
@@ -359,13 +343,15 @@ def display_emprego_municipios_expander(
                 hover_label_format=",.0f",
                 color_map=CORES_MUNICIPIOS,
             )
-            st.plotly_chart(fig_anual, width="stretch")
+            exibir_grafico(fig_anual, width="stretch")
 
 
-def display_emprego_cnae_expander(df_cnae_foco):
+@st.fragment
+@profiling.medir_secao
+def display_emprego_cnae_expander(df_cnae_foco, municipio_interesse):
     """Exibe o expander com análise de saldo de emprego por Setor e CNAE"""
     with st.expander(
-        f"Saldo de Emprego por Setor Econômico em {municipio_de_interesse}",
+        f"Saldo de Emprego por Setor Econômico em {municipio_interesse}",
         expanded=False,
     ):
         tab_setor, tab_grupo, tab_subclasse = st.tabs(
@@ -414,7 +400,7 @@ def display_emprego_cnae_expander(df_cnae_foco):
                     data_label_format=",.0f",
                     hover_label_format=",.0f",
                 )
-                st.plotly_chart(fig, width="stretch")
+                exibir_grafico(fig, width="stretch")
             else:
                 df_selecionado = df_selecionado.style.format(
                     lambda x: f"{x:,.0f}".replace(",", ".")
@@ -433,7 +419,7 @@ def display_emprego_cnae_expander(df_cnae_foco):
             )
 
 
-@st.cache_data
+@cache_memoria
 def preparar_dados_renda_grafico(df, coluna_agregacao, coluna_valor):
     """Prepara (pivota) os dados de renda para um gráfico anual."""
     if df is None or df.empty:
@@ -445,6 +431,7 @@ def preparar_dados_renda_grafico(df, coluna_agregacao, coluna_valor):
         values=coluna_valor,
         aggfunc="mean",
         fill_value=0,
+        observed=True,
     ).sort_index()
     return df_pivot
 
@@ -476,9 +463,10 @@ def render_vinculos_tab(
         data_label_format=",.0f",
         hover_label_format=",.0f",
     )
-    st.plotly_chart(fig, width="stretch")
+    exibir_grafico(fig, width="stretch")
 
 
+@profiling.medir_secao
 def display_vinculos(
     df_mun,
     df_vinculos_faixa_etaria,
@@ -514,29 +502,29 @@ def display_vinculos(
             1: {
                 "df": df_vinculos_sexo,
                 "col": "sexo",
-                "titulo": f"Vínculos Ativos por Sexo em {municipio_de_interesse}",
+                "titulo": f"Vínculos Ativos por Sexo em {municipio_interesse}",
                 "color_map": {"Masculino": "#4C82F7", "Feminino": "#FF6BE1"},
             },
             2: {
                 "df": df_vinculos_raca_cor,
                 "col": "raca_cor",
-                "titulo": f"Vínculos Ativos por Raça/Cor em {municipio_de_interesse}",
+                "titulo": f"Vínculos Ativos por Raça/Cor em {municipio_interesse}",
             },
             3: {
                 "df": df_vinculos_faixa_etaria,
                 "col": "faixa_etaria",
-                "titulo": f"Vínculos Ativos por Faixa Etária em {municipio_de_interesse}",
+                "titulo": f"Vínculos Ativos por Faixa Etária em {municipio_interesse}",
             },
             4: {
                 "df": df_vinculos_grau_instrucao,
                 "col": "grau_instrucao",
-                "titulo": f"Vínculos Ativos por Grau de Instrução em {municipio_de_interesse}",
+                "titulo": f"Vínculos Ativos por Grau de Instrução em {municipio_interesse}",
                 "reorder_cols": ordem_instrucao,
             },
             5: {
                 "df": df_vinculos_cnae,
                 "col": "grupo_ibge",
-                "titulo": f"Vínculos Ativos por Setor em {municipio_de_interesse}",
+                "titulo": f"Vínculos Ativos por Setor em {municipio_interesse}",
             },
         }
 
@@ -556,7 +544,7 @@ def display_vinculos(
         # Abas de tabelas (CNAE Grupo e Subclasse)
         with tabs[6]:  # tab_cnae_grupo
             titulo_centralizado(
-                f"Vínculos Ativos por CNAE - Grupo em {municipio_de_interesse}", 5
+                f"Vínculos Ativos por CNAE - Grupo em {municipio_interesse}", 5
             )
             ult_ano_cnae = df_vinculos_cnae["ano"].max()
             df_pivot = df_vinculos_cnae.pivot_table(
@@ -565,6 +553,7 @@ def display_vinculos(
                 values="vinculos_ativos",
                 aggfunc="sum",
                 fill_value=0,
+                observed=True,
             ).sort_values(by=ult_ano_cnae, ascending=False)
             df_pivot.index.name = "CNAE-Grupo"
             st.dataframe(
@@ -576,7 +565,7 @@ def display_vinculos(
 
         with tabs[7]:  # tab_cnae_subclasse
             titulo_centralizado(
-                f"Vínculos Ativos por CNAE - Subclasse em {municipio_de_interesse}", 5
+                f"Vínculos Ativos por CNAE - Subclasse em {municipio_interesse}", 5
             )
             ult_ano_cnae = df_vinculos_cnae["ano"].max()
             df_pivot = df_vinculos_cnae.pivot_table(
@@ -585,6 +574,7 @@ def display_vinculos(
                 values="vinculos_ativos",
                 aggfunc="sum",
                 fill_value=0,
+                observed=True,
             ).sort_values(by=ult_ano_cnae, ascending=False)
             df_pivot.index.name = "CNAE-Subclasse"
             st.dataframe(
@@ -619,7 +609,7 @@ def render_renda_grafico_tab(
         data_label_format=data_format,
         hover_label_format=hover_format,
     )
-    st.plotly_chart(fig, width="stretch")
+    exibir_grafico(fig, width="stretch")
 
 
 def render_renda_tabela_tab(df, coluna_index, titulo_secao, municipio_interesse):
@@ -650,6 +640,7 @@ def render_renda_tabela_tab(df, coluna_index, titulo_secao, municipio_interesse)
         values=coluna_valor,
         aggfunc="mean",
         fill_value=0,
+        observed=True,
     ).sort_values(by=ult_ano, ascending=False)
 
     df_pivot.index.name = titulo_secao.split(" por ")[-1]
@@ -660,6 +651,8 @@ def render_renda_tabela_tab(df, coluna_index, titulo_secao, municipio_interesse)
     )
 
 
+@st.fragment
+@profiling.medir_secao
 def display_renda(
     df_renda_mun,
     df_renda_sexo,
@@ -820,10 +813,11 @@ def show_page_emprego(
             df_raca_cor=df_caged_raca_cor,
             df_grau_instrucao=df_caged_grau_instrucao,
             ult_mes=ult_mes,
+            municipio_interesse=municipio_de_interesse,
         )
 
         if not df_caged_cnae.empty:
-            display_emprego_cnae_expander(df_caged_cnae)
+            display_emprego_cnae_expander(df_caged_cnae, municipio_de_interesse)
     st.markdown("###### Dados disponibilizados pela RAIS - Atualização Anual")
     display_vinculos(
         df_mun=df_vinculos,
@@ -1,7 +1,10 @@
 import streamlit as st
 import pandas as pd
 
+from src import profiling
+from src.memory_cache import cache_memoria
 from src.utils import (
+    exibir_grafico,
     MESES_DIC,
     titulo_centralizado,
     calcular_yoy,
@@ -11,7 +14,6 @@ from src.utils import (
 )
 
 from src.config import (
-    municipio_de_interesse,
     CORES_MUNICIPIOS,
     ordem_tamanho_estabelecimentos,
 )
@@ -21,6 +23,7 @@ from src.config import (
 # ==============================================================================
 
 
+@profiling.medir_secao
 def display_cnpj_kpi_cards(df_cnpj, df_mei, municipio_de_interesse):
     """Exibe os cards de KPI de Empresas Ativas para um município específico."""
     titulo_centralizado(f"Número de Empresas Ativas em {municipio_de_interesse}", 3)
@@ -67,7 +70,7 @@ def display_cnpj_kpi_cards(df_cnpj, df_mei, municipio_de_interesse):
     )
 
 
-@st.cache_data
+@cache_memoria
 def preparar_dados_grafico_empresas_ativas(df, df_cnae, df_cnae_saldo):
     df_graf_total = pd.DataFrame()
     df_graf_setor = pd.DataFrame()
@@ -86,6 +89,7 @@ def preparar_dados_grafico_empresas_ativas(df, df_cnae, df_cnae_saldo):
             values="empresas_ativas",
             aggfunc="sum",
             fill_value=0,
+            observed=True,
         )
         .sort_index()
     )
@@ -102,6 +106,7 @@ def preparar_dados_grafico_empresas_ativas(df, df_cnae, df_cnae_saldo):
             values="empresas_ativas",
             aggfunc="sum",
             fill_value=0,
+            observed=True,
         )
         .sort_index()
     )
@@ -122,6 +127,7 @@ def preparar_dados_grafico_empresas_ativas(df, df_cnae, df_cnae_saldo):
             values="empresas_ativas",
             aggfunc="sum",
             fill_value=0,
+            observed=True,
         )
         .sort_values(by=date_sort, ascending=False)
     )
@@ -146,6 +152,7 @@ def preparar_dados_grafico_empresas_ativas(df, df_cnae, df_cnae_saldo):
             values="saldo_empresas",
             aggfunc="sum",
             fill_value=0,
+            observed=True,
         )
         .sort_values(by=date_sort, ascending=False)
     )
@@ -161,8 +168,10 @@ def preparar_dados_grafico_empresas_ativas(df, df_cnae, df_cnae_saldo):
     return df_graf_total, df_graf_setor, df_tab_cnae, df_tab_cnae_saldo
 
 
+@st.fragment
+@profiling.medir_secao
 def display_empresas_ativas_expander(
-    df, df_cnae, df_cnae_saldo, titulo_expander, key_prefix
+    df, df_cnae, df_cnae_saldo, titulo_expander, key_prefix, municipio_interesse
 ):
     with st.expander(f"{titulo_expander}", expanded=False):
         df_graf_total, df_graf_cnae, df_tab_cnae, df_tab_cnae_saldo = (
@@ -212,11 +221,11 @@ def display_empresas_ativas_expander(
                 hover_label_format=",.0f",
                 color_map=CORES_MUNICIPIOS,
             )
-            st.plotly_chart(fig_total, width="stretch")
+            exibir_grafico(fig_total, width="stretch")
 
         with tab_setor:
             titulo_centralizado(
-                f"{titulo_expander} por Setor em {municipio_de_interesse} - {ANO_SELECIONADO}",
+                f"{titulo_expander} por Setor em {municipio_interesse} - {ANO_SELECIONADO}",
                 5,
             )
             fig_setor = criar_grafico_barras(
@@ -229,7 +238,7 @@ def display_empresas_ativas_expander(
                 hover_label_format=",.0f",
                 color_map=CORES_MUNICIPIOS,
             )
-            st.plotly_chart(fig_setor, width="stretch")
+            exibir_grafico(fig_setor, width="stretch")
 
         with tab_cnae:
             view_mode = st.radio(
@@ -248,7 +257,7 @@ def display_empresas_ativas_expander(
                 df_tab_cnae_filtrada = df_tab_cnae[colunas_do_ano]
 
                 titulo_centralizado(
-                    f"Estoque de {titulo_expander} por CNAE em {municipio_de_interesse} - {ANO_SELECIONADO}",
+                    f"Estoque de {titulo_expander} por CNAE em {municipio_interesse} - {ANO_SELECIONADO}",
                     5,
                 )
 
@@ -266,7 +275,7 @@ def display_empresas_ativas_expander(
                 df_tab_cnae_saldo_filtrada = df_tab_cnae_saldo[colunas_do_ano]
 
                 titulo_centralizado(
-                    f"Saldo de {titulo_expander} por CNAE em {municipio_de_interesse} - {ANO_SELECIONADO}",
+                    f"Saldo de {titulo_expander} por CNAE em {municipio_interesse} - {ANO_SELECIONADO}",
                     5,
                 )
 
@@ -301,7 +310,7 @@ def render_estabelecimentos_grafico_tab(
         data_label_format=",.0f",
         hover_label_format=",.0f",
     )
-    st.plotly_chart(fig, width="stretch")
+    exibir_grafico(fig, width="stretch")
 
 
 def render_estabelecimentos_tabela_tab(df, index_col, titulo, municipio_interesse):
@@ -313,7 +322,9 @@ def render_estabelecimentos_tabela_tab(df, index_col, titulo, municipio_interess
     ult_ano = df["ano"].max()
 
     df_agrupado = (
-        df.groupby(["ano", index_col])["qntd_estabelecimentos"].sum().reset_index()
+        df.groupby(["ano", index_col], observed=True)["qntd_estabelecimentos"]
+        .sum()
+        .reset_index()
     )
 
     df_pivot = df_agrupado.pivot_table(
@@ -322,6 +333,7 @@ def render_estabelecimentos_tabela_tab(df, index_col, titulo, municipio_interess
         values="qntd_estabelecimentos",
         aggfunc="sum",
         fill_value=0,
+        observed=True,
     ).sort_values(by=ult_ano, ascending=False)
 
     df_pivot.index.name = titulo.split(" por ")[-1]  # Ex: "CNAE - Grupo"
@@ -332,6 +344,7 @@ def render_estabelecimentos_tabela_tab(df, index_col, titulo, municipio_interess
     )
 
 
+@profiling.medir_secao
 def display_estabelecimentos(
     df_estabelecimentos_mun,
     df_estabelecimentos_cnae,
@@ -413,6 +426,7 @@ def show_page_empresas_ativas(
         df_cnae_saldo=df_cnpj_cnae_saldo,
         titulo_expander="CNPJ Ativos",
         key_prefix="cnpj_ativos",
+        municipio_interesse=municipio_de_interesse,
     )
     display_empresas_ativas_expander(
         df=df_mei,
@@ -420,6 +434,7 @@ def show_page_empresas_ativas(
         df_cnae_saldo=df_mei_cnae_saldo,
         titulo_expander="MEI Ativos",
         key_prefix="mei_ativos",
+        municipio_interesse=municipio_de_interesse,
     )
     st.markdown("###### Dados disponibilizados pela RAIS - Atualização Anual")
     display_estabelecimentos(
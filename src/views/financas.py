@@ -2,6 +2,8 @@ import numpy as np
 import pandas as pd
 import streamlit as st
 
+from src import profiling
+from src.memory_cache import cache_memoria
 from src.config import (
     CORES_MUNICIPIOS,
 )
@@ -9,13 +11,18 @@ from src.config import (
 # ==============================================================================
 # IMPORTAÇÕES DE FUNÇÕES E DADOS
 # ==============================================================================
-from src.utils import criar_grafico_barras, titulo_centralizado, BIMESTRE_MAP
+from src.utils import (
+    criar_grafico_barras,
+    titulo_centralizado,
+    BIMESTRE_MAP,
+    exibir_grafico,
+)
 
 
 # ==============================================================================
 # FUNÇÕES DA PÁGINA DE FINANÇAS
 # ==============================================================================
-@st.cache_data
+@cache_memoria
 def preparar_dados_siconfi(df, cod_conta):
     """Prepara os dados brutos do SICONFI para um município e conta específicos."""
     return (
@@ -23,9 +30,9 @@ def preparar_dados_siconfi(df, cod_conta):
         .sort_values(by=["municipio", "coluna", "bimestre", "ano"])
         .assign(
             valor_milhoes=lambda x: x["valor"] / 1000000,
-            valor_ano_anterior=lambda x: x.groupby(["municipio", "coluna", "bimestre"])[
-                "valor"
-            ].shift(1),
+            valor_ano_anterior=lambda x: x.groupby(
+                ["municipio", "coluna", "bimestre"], observed=True
+            )["valor"].shift(1),
         )
         .pipe(
             lambda x: x.assign(
@@ -39,7 +46,7 @@ def preparar_dados_siconfi(df, cod_conta):
     )
 
 
-@st.cache_data
+@cache_memoria
 def _pivot_siconfi_data(df_preparado, coluna_valor, coluna_filtro):
     """
     Função auxiliar para pivotar os dados do SICONFI e formatar o índice.
@@ -53,6 +60,7 @@ def _pivot_siconfi_data(df_preparado, coluna_valor, coluna_filtro):
         values=coluna_valor,
         aggfunc="sum",
         fill_value=0,
+        observed=True,
     )
 
     if df_pivot.empty:
@@ -67,6 +75,8 @@ def _pivot_siconfi_data(df_preparado, coluna_valor, coluna_filtro):
     return df_pivot
 
 
+@st.fragment
+@profiling.medir_secao
 def display_siconfi_consolidado(df, expanded=False):
     """
     Exibe um expander consolidado para todos os indicadores do SICONFI
@@ -207,10 +217,10 @@ def display_siconfi_consolidado(df, expanded=False):
             color_map=CORES_MUNICIPIOS,
         )
 
-        st.plotly_chart(fig_siconfi, use_container_width=True)
+        exibir_grafico(fig_siconfi, use_container_width=True)
 
 
-@st.cache_data
+@cache_memoria
 def preparar_dados_grafico_indicador_financeiros(
     df_indicadores_financeiros, coluna_selecionada
 ):
@@ -220,11 +230,14 @@ def preparar_dados_grafico_indicador_financeiros(
         values=coluna_selecionada,
         aggfunc="sum",
         fill_value=0,
+        observed=True,
     ).sort_index()
 
     return df_graf
 
 
+@st.fragment
+@profiling.medir_secao
 def display_indicadores_financeiros(
     df_filtrado,
     titulo_expander,
@@ -233,7 +246,7 @@ def display_indicadores_financeiros(
     label_y,
     data_label_format,
     hover_label_format,
-    pdf_data,
+    caminho_pdf,
 ):
     with st.expander(f"{titulo_expander}", expanded=False):
         indicador_selecionado = st.selectbox(
@@ -280,22 +293,22 @@ def display_indicadores_financeiros(
                 annotation_position="bottom right",
                 annotation_font_color="yellow",
             )
-        st.plotly_chart(fig, use_container_width=False)
+        exibir_grafico(fig, use_container_width=False)
         titulo_centralizado(
             "Download do relatório metodológico que detalha a construção dos indicadores fiscais dos municípios",
             6,
             cor="yellow",
         )
-        if pdf_data:
+        if caminho_pdf:
             st.write("")
-            pdf_data.seek(0)
-            st.download_button(
-                label="📥 Baixar PDF",
-                data=pdf_data,
-                file_name="Indicadores Fiscais Municípios.pdf",
-                mime="application/pdf",
-                use_container_width=True,
-            )
+            with open(caminho_pdf, "rb") as arquivo_pdf:
+                st.download_button(
+                    label="📥 Baixar PDF",
+                    data=arquivo_pdf,
+                    file_name="Indicadores Fiscais Municípios.pdf",
+                    mime="application/pdf",
+                    use_container_width=True,
+                )
 
 
 def show_page_financas(df_financas, df_indicadores_financeiros, pdf_indicadores):
@@ -346,7 +359,7 @@ def show_page_financas(df_financas, df_indicadores_financeiros, pdf_indicadores)
         label_y="Percentual (%)",
         hover_label_format=",.2f",
         data_label_format=",.1f",
-        pdf_data=pdf_indicadores,
+        caminho_pdf=pdf_indicadores,
     )
     display_siconfi_consolidado(
         df=df_financas,
@@ -2,15 +2,15 @@
 
 import streamlit as st
 from src.utils import MESES_DIC, BIMESTRE_DIC, titulo_centralizado
-from src.config import municipio_de_interesse
+from src.navegacao import ir_para_pagina
 
 
 # ==============================================================================
 # FUNÇÕES DA PÁGINA HOME
 # ==============================================================================
 def go_to_page(page_name):
-    """Atualiza o estado da sessão para mudar a página selecionada."""
-    st.session_state.selected_page = page_name
+    """Pede a troca para a página `page_name` (ver src/navegacao.py)."""
+    ir_para_pagina(page_name)
 
 
 def show_page_home(
@@ -29,6 +29,7 @@ def show_page_home(
     df_saude_mensal,
     df_populacao_densidade,
     df_populacao_sexo_idade,
+    municipio_interesse,
 ):
     """
     Renderiza a página inicial do dashboard com instruções, informações e datas de atualização.
@@ -39,7 +40,7 @@ def show_page_home(
     titulo_centralizado("Bem-vindo(a) ao painel de visualização de dados!", 2)
     st.markdown(
         f"""
-        ##### Este dashboard foi desenvolvido para apresentar diversos indicadores socioeconômicos de **{municipio_de_interesse}**, permitindo a comparação direta com municípios vizinhos e de perfil semelhante.
+        ##### Este dashboard foi desenvolvido para apresentar diversos indicadores socioeconômicos de **{municipio_interesse}**, permitindo a comparação direta com municípios vizinhos e de perfil semelhante.
         """
     )
     st.markdown("---")
@@ -1,16 +1,18 @@
 # %%
 import pandas as pd
 import streamlit as st
-import plotly.express as px
+from src import profiling
+from src.memory_cache import cache_memoria
 from src.config import CORES_MUNICIPIOS
 from src.utils import (
+    exibir_grafico,
     criar_grafico_linhas,
     criar_grafico_barras,
     titulo_centralizado,
 )
 
 
-@st.cache_data
+@cache_memoria
 def preparar_dados_graficos_pib(df_filtrado, coluna_agregacao, coluna_selecionada):
     """Prepara os dados para o gráfico de PIB, garantindo que todos os municípios e anos estejam presentes."""
     if df_filtrado.empty:
@@ -44,6 +46,7 @@ def preparar_dados_graficos_pib(df_filtrado, coluna_agregacao, coluna_selecionad
         values=coluna_selecionada,
         aggfunc="sum",
         fill_value=0,
+        observed=True,
     ).sort_index()
 
     df_graf.index = df_graf.index.astype(str)
@@ -51,6 +54,8 @@ def preparar_dados_graficos_pib(df_filtrado, coluna_agregacao, coluna_selecionad
     return df_graf
 
 
+@st.fragment
+@profiling.medir_secao
 def display_pib_total_expander(
     df_filtrado, titulo_expander, dicionario_indicadores, key_prefix
 ):
@@ -126,9 +131,11 @@ def display_pib_total_expander(
                 color_map=CORES_MUNICIPIOS,
             )
 
-        st.plotly_chart(fig, use_container_width=True)
+        exibir_grafico(fig, use_container_width=True)
 
 
+@st.fragment
+@profiling.medir_secao
 def display_pib_vab_expander(df_filtrado, titulo_expander, vab_map, key_prefix):
     """
     Função modificada para incluir o gráfico de barras empilhadas (Estrutura VAB)
@@ -183,6 +190,9 @@ def display_pib_vab_expander(df_filtrado, titulo_expander, vab_map, key_prefix):
 
             df_melted["Setor"] = df_melted["Setor"].map(vab_cols_map)
 
+            # Importado só aqui: o Plotly Express é pesado (ver utils.criar_grafico_barras)
+            import plotly.express as px
+
             fig = px.bar(
                 df_melted,
                 y="municipio",
@@ -206,7 +216,7 @@ def display_pib_vab_expander(df_filtrado, titulo_expander, vab_map, key_prefix):
                     orientation="h", yanchor="bottom", y=1.02, xanchor="center", x=0.5
                 ),
             )
-            st.plotly_chart(fig, use_container_width=True)
+            exibir_grafico(fig, use_container_width=True)
 
         # --- LÓGICA 2: GRÁFICOS DE SÉRIE TEMPORAL ---
         else:
@@ -269,7 +279,7 @@ def display_pib_vab_expander(df_filtrado, titulo_expander, vab_map, key_prefix):
                     color_map=CORES_MUNICIPIOS,
                 )
 
-            st.plotly_chart(fig, use_container_width=True)
+            exibir_grafico(fig, use_container_width=True)
 
 
 def show_page_pib(df_pib):
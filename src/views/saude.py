@@ -1,8 +1,10 @@
 import pandas as pd
 import streamlit as st
 
+from src import profiling
 from src.config import CORES_MUNICIPIOS
 from src.utils import (
+    exibir_grafico,
     MESES_DIC,
     criar_grafico_barras,
     checar_ult_ano_completo,
@@ -40,6 +42,7 @@ def preparar_dados_graficos_saude_mensal(
                 values=coluna_selecionada,
                 aggfunc="sum",
                 fill_value=0,
+                observed=True,
             )
             .sort_index()
         )
@@ -55,6 +58,7 @@ def preparar_dados_graficos_saude_mensal(
             values=coluna_selecionada,
             aggfunc=agg_func,
             fill_value=0,
+            observed=True,
         ).sort_index()
 
         # Anual
@@ -66,6 +70,7 @@ def preparar_dados_graficos_saude_mensal(
             values=coluna_selecionada,
             aggfunc=agg_func,
             fill_value=0,
+            observed=True,
         ).sort_index(ascending=False)
 
     return df_hist, df_acum, df_anual, ult_ano, ult_mes
@@ -78,11 +83,14 @@ def preparar_dados_graficos_saude_anual(df_filtrado, coluna_selecionada):
         values=coluna_selecionada,
         aggfunc="sum",
         fill_value=0,
+        observed=True,
     ).sort_index(ascending=False)
 
     return df_anual
 
 
+@st.fragment
+@profiling.medir_secao
 def display_saude_expander(
     df_filtrado, titulo_expander, dicionario_indicadores, key_prefix
 ):
@@ -148,7 +156,7 @@ def display_saude_expander(
                     hover_label_format=hover_format,
                     color_map=CORES_MUNICIPIOS,
                 )
-                st.plotly_chart(fig, width="stretch")
+                exibir_grafico(fig, width="stretch")
 
         if ult_mes:
             with tab_acum:
@@ -172,7 +180,7 @@ def display_saude_expander(
                     hover_label_format=hover_format,
                     color_map=CORES_MUNICIPIOS,
                 )
-                st.plotly_chart(fig, width="stretch")
+                exibir_grafico(fig, width="stretch")
 
         with tab_anual:
             titulo_centralizado(f"{indicador_selecionado} - Análise Anual", 5)
@@ -186,9 +194,11 @@ def display_saude_expander(
                 hover_label_format=hover_format,
                 color_map=CORES_MUNICIPIOS,
             )
-            st.plotly_chart(fig, width="stretch")
+            exibir_grafico(fig, width="stretch")
 
 
+@st.fragment
+@profiling.medir_secao
 def display_saude_anual_expander(
     df_filtrado, titulo_expander, dicionario_indicadores, key_prefix
 ):
@@ -227,7 +237,7 @@ def display_saude_anual_expander(
             hover_label_format=hover_format,
             color_map=CORES_MUNICIPIOS,
         )
-        st.plotly_chart(fig, width="stretch")
+        exibir_grafico(fig, width="stretch")
 
 
 # ==============================================================================
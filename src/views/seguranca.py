@@ -5,11 +5,15 @@ import pandas as pd
 # IMPORTAÇÕES DE FUNÇÕES E DADOS
 # ==============================================================================
 
+from src import profiling
+from src.memory_cache import cache_memoria
 from src.utils import (
+    exibir_grafico,
     MESES_DIC,
     checar_ult_ano_completo,
     criar_grafico_barras,
     titulo_centralizado,
+    pivotar_soma,
 )
 
 from src.config import (
@@ -21,7 +25,7 @@ from src.config import (
 # ==============================================================================
 
 
-@st.cache_data
+@cache_memoria
 def preparar_dados_graficos_seguranca(df_filtrado, coluna_selecionada, is_taxa=False):
     """
     Prepara os DataFrames pivotados para as abas da página de segurança.
@@ -38,49 +42,22 @@ def preparar_dados_graficos_seguranca(df_filtrado, coluna_selecionada, is_taxa=F
         ult_mes = df_filtrado[df_filtrado["ano"] == ult_ano]["mes"].max()
 
         # Histórico Mensal
-        df_hist = (
-            df_filtrado.assign(
-                date=lambda x: pd.to_datetime(
-                    x["ano"].astype(str)
-                    + "-"
-                    + x["mes"].astype(str).str.zfill(2)
-                    + "-01"
-                )
-            )
-            .pivot_table(
-                index="date",
-                columns="municipio",
-                values=coluna_valor,
-                aggfunc="sum",
-                fill_value=0,
-            )
-            .sort_index()
-        )
+        df_hist = pivotar_soma(df_filtrado, coluna_valor, indice="date")
 
         # Acumulado no Ano
-        df_acum_temp = df_filtrado[df_filtrado["mes"] <= ult_mes]
-        df_acum = df_acum_temp.pivot_table(
-            index="ano",
-            columns="municipio",
-            values=coluna_valor,
-            aggfunc="sum",
-            fill_value=0,
-        ).sort_index()
+        df_acum = pivotar_soma(df_filtrado, coluna_valor, ate_mes=ult_mes)
 
         # Anual
         ano_completo = checar_ult_ano_completo(df_filtrado)
-        df_anual_temp = df_filtrado[df_filtrado["ano"] <= ano_completo]
-        df_anual = df_anual_temp.pivot_table(
-            index="ano",
-            columns="municipio",
-            values=coluna_valor,
-            aggfunc="sum",
-            fill_value=0,
+        df_anual = pivotar_soma(
+            df_filtrado, coluna_valor, ate_ano=ano_completo
         ).sort_index(ascending=False)
 
     return df_hist, df_acum, df_anual, ult_ano, ult_mes
 
 
+@st.fragment
+@profiling.medir_secao
 def display_secao_seguranca(
     df_seguranca,
     df_seguranca_taxa,
@@ -161,7 +138,7 @@ def display_secao_seguranca(
                     color_map=CORES_MUNICIPIOS,
                     hover_label_format=hover_label_format,
                 )
-                st.plotly_chart(fig, use_container_width=True)
+                exibir_grafico(fig, use_container_width=True)
 
         if ult_mes:
             with tab_acum:
@@ -186,7 +163,7 @@ def display_secao_seguranca(
                     color_map=CORES_MUNICIPIOS,
                     hover_label_format=hover_label_format,
                 )
-                st.plotly_chart(fig, use_container_width=True)
+                exibir_grafico(fig, use_container_width=True)
 
         with tab_anual:
             titulo_centralizado(f"Total Anual - {indicador_selecionado}", 5)
@@ -200,7 +177,7 @@ def display_secao_seguranca(
                 color_map=CORES_MUNICIPIOS,
                 hover_label_format=hover_label_format,
             )
-            st.plotly_chart(fig, use_container_width=True)
+            exibir_grafico(fig, use_container_width=True)
 
 
 def show_page_seguranca(df_seguranca, df_seguranca_taxa):
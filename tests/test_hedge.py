@@ -0,0 +1,61 @@
+import httpx
+import pytest
+from postgrest.exceptions import APIError, generate_default_error_message
+
+from src import hedge
+
+
+def _resposta(status, corpo=b""):
+    requisicao = httpx.Request("GET", "https://exemplo.supabase.co/rest/v1/dados")
+    return httpx.Response(status, content=corpo, request=requisicao)
+
+
+def _erro_csv(status):
+    """Erro do caminho CSV, que chama raise_for_status na resposta do httpx."""
+    try:
+        _resposta(status).raise_for_status()
+    except httpx.HTTPStatusError as e:
+        return e
+
+
+def _erro_json(status):
+    """Erro do caminho JSON: o postgrest levanta APIError para respostas sem JSON."""
+    return APIError(generate_default_error_message(_resposta(status, b"<html>")))
+
+
+@pytest.fixture(autouse=True)
+def sem_espera(monkeypatch):
+    monkeypatch.setattr(hedge, "BACKOFF_BASE", 0.0)
+    monkeypatch.setattr(hedge, "HEDGE_ATIVO", True)
+
+
+def _falha_e_depois_responde(erro):
+    chamadas = []
+
+    def funcao():
+        chamadas.append(1)
+        if len(chamadas) == 1:
+            raise erro
+        return "ok"
+
+    return funcao, chamadas
+
+
+@pytest.mark.parametrize("criar_erro", [_erro_csv, _erro_json], ids=["csv", "json"])
+def test_503_e_repetido(criar_erro):
+    funcao, chamadas = _falha_e_depois_responde(criar_erro(503))
+    assert hedge.executar_com_hedge("dados_teste", 0, funcao) == "ok"
+    assert len(chamadas) == 2
+
+
+@pytest.mark.parametrize("criar_erro", [_erro_csv, _erro_json], ids=["csv", "json"])
+def test_404_nao_e_repetido(criar_erro):
+    funcao, chamadas = _falha_e_depois_responde(criar_erro(404))
+    with pytest.raises((httpx.HTTPStatusError, APIError)):
+        hedge.executar_com_hedge("dados_teste", 0, funcao)
+    assert len(chamadas) == 1
+
+
+def test_codigos_do_postgrest():
+    assert hedge.erro_transitorio(APIError({"code": "PGRST002", "message": "x"}))
+    assert not hedge.erro_transitorio(APIError({"code": "42703", "message": "x"}))
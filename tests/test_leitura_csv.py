@@ -0,0 +1,41 @@
+import pandas as pd
+
+from src import data_loader
+
+
+def _janelas(*corpos):
+    return [data_loader._csv_para_arrow(corpo) for corpo in corpos]
+
+
+def test_codigo_com_zeros_a_esquerda_continua_texto():
+    janelas = _janelas(
+        b"municipio,ano,cod_ibge,valor\nCanoas,2024,0123,10\n",
+        b"municipio,ano,cod_ibge,valor\nEsteio,2024,4567,20\n",
+    )
+    df = data_loader._juntar_janelas_csv(janelas)
+    assert df["cod_ibge"].tolist() == ["0123", "4567"]
+    assert df["valor"].dtype == "int64"
+
+
+def test_coluna_inteira_e_decimal_entre_janelas_vira_decimal():
+    janelas = _janelas(
+        b"municipio,ano,valor\nCanoas,2024,10\nCanoas,2023,3\n",
+        b"municipio,ano,valor\nEsteio,2024,2.5\n",
+    )
+    df = data_loader._juntar_janelas_csv(janelas)
+    assert df["valor"].dtype == "float64"
+    assert df["valor"].tolist() == [10.0, 3.0, 2.5]
+
+
+def test_csv_igual_ao_json():
+    registros = [
+        {"municipio": "Canoas", "ano": 2024, "cod": "007", "obs": "", "valor": 1},
+        {"municipio": "Esteio", "ano": 2024, "cod": "010", "obs": "x", "valor": 2.5},
+    ]
+    csv = pd.DataFrame(registros).to_csv(index=False).encode()
+    df_csv = data_loader._juntar_janelas_csv(_janelas(csv))
+    df_json = pd.DataFrame(registros)
+    pd.testing.assert_frame_equal(
+        df_csv.astype({"municipio": object}), df_json, check_dtype=False
+    )
+    assert df_csv["valor"].dtype == df_json["valor"].dtype
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import sql_engine, utils
+
+pytestmark = pytest.mark.skipif(
+    not sql_engine.DUCKDB_DISPONIVEL, reason="duckdb não instalado"
+)
+
+
+def _comex(tipo_municipio="category"):
+    gerador = np.random.default_rng(0)
+    n = 500
+    return pd.DataFrame(
+        {
+            "ano": gerador.integers(2021, 2025, n).astype("int16"),
+            "mes": gerador.integers(1, 13, n).astype("int8"),
+            "municipio": pd.Series(
+                gerador.choice(["São Leopoldo", "Canoas", "Esteio"], n)
+            ).astype(tipo_municipio),
+            "cod_pais": gerador.integers(100, 105, n).astype("int32"),
+            "total_exp_mensal": gerador.integers(0, 50_000_000, n).astype("int64"),
+        }
+    )
+
+
+def _pivotar(df, monkeypatch, motor_sql, **kwargs):
+    monkeypatch.setattr(sql_engine, "MOTOR_SQL_ATIVO", motor_sql)
+    return utils.pivotar_soma(df, "total_exp_mensal", **kwargs)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"escala": 1_000_000},
+        {"indice": "date", "escala": 1_000_000},
+        {"ate_mes": 6, "escala": 1_000},
+        {"escala": 1},
+        {"colunas": "cod_pais", "escala": 1_000_000},
+    ],
+)
+def test_somar_pivotado_igual_ao_pandas(monkeypatch, kwargs):
+    df = _comex()
+    sql = _pivotar(df, monkeypatch, True, **kwargs)
+    pandas = _pivotar(df, monkeypatch, False, **kwargs)
+    pd.testing.assert_frame_equal(sql, pandas, check_names=False)
+
+
+def test_somar_pivotado_com_escala_nao_trunca(monkeypatch):
+    df = _comex(tipo_municipio="object")
+    sql = _pivotar(df, monkeypatch, True, escala=1_000_000)
+    assert not pd.api.types.is_integer_dtype(sql.dtypes.iloc[0])
+    assert (sql % 1 != 0).any().any()
@@ -1,6 +1,8 @@
 # %%
 import os
 import time
+import hashlib
+from datetime import datetime, timezone
 import pandas as pd
 from dotenv import load_dotenv
 from sqlalchemy import create_engine, text
@@ -694,6 +696,41 @@ ORDER BY
 # ===================================================================
 
 
+# Manifesto de versões lido pelo app (src/data_loader.py) para invalidar o cache
+# apenas das tabelas que mudaram. Estrutura esperada no Supabase:
+#   CREATE TABLE dados_versions (
+#       tabela text PRIMARY KEY,
+#       versao text NOT NULL,
+#       linhas integer,
+#       atualizado_em timestamptz
+#   );
+TABELA_VERSOES = "dados_versions"
+
+
+def compute_table_checksum(df):
+    """
+    Calcula um checksum do conteúdo do DataFrame, independente do índice.
+    Dados idênticos geram a mesma versão, então o app não recarrega a tabela.
+    """
+    hashes = pd.util.hash_pandas_object(df, index=False)
+    conteudo = ",".join(df.columns).encode("utf-8") + hashes.values.tobytes()
+    return hashlib.sha256(conteudo).hexdigest()[:16]
+
+
+def publish_table_version(supabase_client, target_table_name, versao, linhas):
+    """Registra a versão da tabela recém-carregada no manifesto dados_versions."""
+    registro = {
+        "tabela": target_table_name,
+        "versao": versao,
+        "linhas": linhas,
+        "atualizado_em": datetime.now(timezone.utc).isoformat(),
+    }
+    supabase_client.table(TABELA_VERSOES).upsert(
+        registro, on_conflict="tabela"
+    ).execute()
+    print(f"-> Versão '{versao}' publicada em '{TABELA_VERSOES}'.")
+
+
 def process_and_upload(
     query_string,
     target_table_name,
@@ -704,7 +741,8 @@ def process_and_upload(
 ):
     """
     Executa uma query parametrizada no banco local, corrige os tipos
-    de dados e insere em lotes numa tabela do Supabase.
+    de dados e insere em lotes numa tabela do Supabase. Ao final de uma carga
+    sem erros, publica a versão (checksum) da tabela em dados_versions.
     """
     print(f"\n--- Processando tabela: {target_table_name} ---")
 
@@ -734,6 +772,7 @@ def process_and_upload(
                     df[col] = df[col].astype("Int64")
 
         df.replace([np.inf, -np.inf], None, inplace=True)
+        versao = compute_table_checksum(df)
         df = df.astype(object).where(pd.notna(df), None)
 
         # Apagar dados existentes na tabela de destino
@@ -744,6 +783,7 @@ def process_and_upload(
         # Inserir dados em lotes
         print(f"4/4: Inserindo dados em lotes de {batch_size} registros...")
         total_batches = (len(df) // batch_size) + (1 if len(df) % batch_size > 0 else 0)
+        lotes_com_erro = 0
 
         for i, start in enumerate(range(0, len(df), batch_size)):
             end = start + batch_size
@@ -758,9 +798,17 @@ def process_and_upload(
 
             if hasattr(response, "error") and response.error:
                 print(f"   -> ERRO no lote {i + 1}/{total_batches}: {response.error}")
+                lotes_com_erro += 1
             else:
                 print(f"   -> Lote {i + 1}/{total_batches} inserido com sucesso.")
 
+        if lotes_com_erro:
+            print(
+                f"(!) {lotes_com_erro} lote(s) com erro: versão da tabela não publicada."
+            )
+        else:
+            publish_table_version(supabase_client, target_table_name, versao, len(df))
+
         end_time = time.time()
         print(
             f"✅ Tabela '{target_table_name}' concluída com sucesso em {end_time - start_time:.2f} segundos."